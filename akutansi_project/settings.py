@@ -48,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'keuangan.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -79,6 +80,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'akutansi_project.wsgi.application'
 
+# Varian async view baca-saja (keuangan.views_async), opt-in dengan ASYNC_VIEWS=1 di bawah ASGI.
+# Tidak aktif secara default: dengan ORM sync di balik sync_to_async, benchmark_async.py
+# mengukurnya lebih lambat daripada view sync.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -91,6 +97,25 @@ DATABASES = {
 }
 
 
+# Cache laporan: locmem per proses secara default; set REDIS_URL supaya cache
+# (dan counter hit/miss) dipakai bersama oleh semua worker
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "akutansi-laporan",
+        }
+    }
+
+# Detik sebelum hasil laporan tercache kedaluwarsa (versi buku besar tetap jadi sumber invalidasi)
+REPORT_CACHE_TIMEOUT = int(os.environ.get("REPORT_CACHE_TIMEOUT", 3600))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,3 +170,51 @@ LOGOUT_REDIRECT_URL = '/login/'
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Antrian ekspor: file hasil disimpan di EXPORT_ROOT (di luar MEDIA_ROOT, hanya diunduh lewat
+# export_download) dan dihapus setelah TTL
+EXPORT_ROOT = Path(os.environ.get("EXPORT_ROOT", BASE_DIR / "private" / "exports"))
+EXPORT_FILE_TTL_HOURS = int(os.environ.get("EXPORT_FILE_TTL_HOURS", 24))
+EXPORT_JOB_TIMEOUT_MINUTES = int(os.environ.get("EXPORT_JOB_TIMEOUT_MINUTES", 60))
+
+# Artefak PDF/Excel laporan per versi buku besar di MEDIA_ROOT/laporan; yang paling lama
+# tidak diunduh dihapus bila total ukurannya melewati batas ini
+REPORT_ARTIFACT_MAX_MB = int(os.environ.get("REPORT_ARTIFACT_MAX_MB", 200))
+
+
+# Instrumentasi request (keuangan.instrumentation): header Server-Timing, log request
+# lambat dan budget jumlah query per nama URL (termasuk query sesi & autentikasi).
+# Pakai keuangan.instrumentation.assert_query_budget di test untuk menegakkannya.
+# Budget laporan diukur pada kasus terburuk dengan cache dingin: periode sudah ditutup
+# (SaldoPenutupan) lebih dari sebulan sebelum start_date/end_date yang jatuh di tengah
+# bulan, sehingga setiap batas tanggal butuh snapshot + SaldoAkun + sisa mutasi jurnal
+# (4 query per saldo_kumulatif). Halaman buku besar setelah cursor ?after=/?before= bisa
+# menambah 6 query untuk saldo awal blok lanjutan; kunjungan pertama ke profil membuat
+# UserProfile.
+SERVER_TIMING = DEBUG or os.environ.get("SERVER_TIMING") == "1"
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 1000))
+QUERY_BUDGETS = {
+    'dashboard': 10,
+    'input_transaksi': 7,
+    'jurnal_umum': 14,
+    'jurnal_umum_pdf': 4,
+    'jurnal_umum_excel': 4,
+    'buku_besar': 22,
+    'buku_besar_pdf': 9,
+    'buku_besar_excel': 9,
+    'neraca_saldo': 13,
+    'neraca_saldo_pdf': 13,
+    'neraca_saldo_excel': 13,
+    'laporan_keuangan': 13,
+    'laporan_keuangan_pdf': 13,
+    'laporan_keuangan_excel': 13,
+    'api_neraca_saldo': 13,
+    'api_laba_rugi': 13,
+    'api_neraca': 13,
+    'daftar_akun': 4,
+    'daftar_akun_pdf': 3,
+    'daftar_akun_excel': 3,
+    'detail_akun': 5,
+    'edit_akun': 5,
+    'transaksi_api_list': 4,
+    'profile': 4,
+}
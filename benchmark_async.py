@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""Load test view baca-saja: uvicorn (ASGI, view async) vs gunicorn (WSGI, worker sync).
+
+Generates a throwaway SQLite ledger, starts each server in turn on the same
+database with the same number of worker processes, logs in a benchmark user via
+a session cookie and hammers the dashboard, transaksi API and JSON report
+endpoints with concurrent keep-alive clients. Reports requests/second and
+latency percentiles per endpoint. Requires uvicorn and/or gunicorn installed;
+a server that is not installed is skipped.
+
+    python benchmark_async.py --workers 2 --concurrency 32 --duration 10
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import importlib.util
+import http.client
+import subprocess
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--accounts', type=int, default=100)
+parser.add_argument('--lines', type=int, default=100000, help='jumlah baris jurnal (2 baris per transaksi)')
+parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'benchmark_async.sqlite3'))
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--workers', type=int, default=2, help='proses worker per server')
+parser.add_argument('--concurrency', type=int, default=32, help='koneksi klien bersamaan')
+parser.add_argument('--duration', type=float, default=10.0, help='detik per endpoint')
+parser.add_argument('--port', type=int, default=8765)
+parser.add_argument('--server', choices=['uvicorn', 'gunicorn'], action='append',
+                    help='server yang diuji (default keduanya)')
+args = parser.parse_args()
+
+# Jangan pernah menyentuh db.sqlite3 milik project
+os.environ['DATABASE_URL'] = f"sqlite:///{args.db}"
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'akutansi_project.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import call_command
+from django.db import transaction
+from keuangan.models import Akun, Transaksi, Jurnal
+from keuangan.saldo import rebuild_saldo
+
+TIPE = ['Aktiva Lancar', 'Aktiva Tetap', 'Kewajiban Lancar', 'Modal', 'Pendapatan', 'Beban']
+BATCH = 5000
+ENDPOINTS = [
+    '/',
+    '/transaksi/api/list/',
+    '/api/laporan/neraca-saldo/',
+    '/api/laporan/laba-rugi/',
+    '/api/laporan/neraca/',
+]
+SERVERS = {
+    # uvicorn dijalankan dengan ASYNC_VIEWS=1 (view async), gunicorn dengan view sync
+    'uvicorn': ['-m', 'uvicorn', 'akutansi_project.asgi:application', '--workers', '{workers}',
+                '--host', '127.0.0.1', '--port', '{port}', '--log-level', 'warning', '--no-access-log'],
+    'gunicorn': ['-m', 'gunicorn', 'akutansi_project.wsgi:application', '--workers', '{workers}',
+                 '--bind', '127.0.0.1:{port}', '--log-level', 'warning'],
+}
+
+
+def seed_ledger(user):
+    rng = random.Random(args.seed)
+    akun_list = Akun.objects.bulk_create([
+        Akun(user=user, kode=f"{i:05d}", nama=f"Akun {i}", tipe=TIPE[i % len(TIPE)])
+        for i in range(args.accounts)
+    ])
+    start = date(2020, 1, 1)
+    pairs = args.lines // 2
+    for offset in range(0, pairs, BATCH):
+        n = min(BATCH, pairs - offset)
+        with transaction.atomic():
+            transaksi = Transaksi.objects.bulk_create([
+                Transaksi(user=user, tanggal=start + timedelta(days=rng.randrange(5 * 365)), deskripsi=f"Transaksi {offset + i}")
+                for i in range(n)
+            ])
+            jurnal = []
+            for t in transaksi:
+                debet, kredit = rng.sample(akun_list, 2)
+                jumlah = Decimal(rng.randrange(100, 10000000)) / 100
+                jurnal.append(Jurnal(transaksi=t, akun=debet, user=user, tanggal=t.tanggal, debit=jumlah, kredit=0))
+                jurnal.append(Jurnal(transaksi=t, akun=kredit, user=user, tanggal=t.tanggal, debit=0, kredit=jumlah))
+            Jurnal.objects.bulk_create(jurnal)
+        print(f"  {min(offset + n, pairs) * 2:>10} / {pairs * 2} baris jurnal", end='\r')
+    print()
+    # bulk_create tidak memicu signal, jadi SaldoAkun diisi ulang sekali di akhir
+    rebuild_saldo(user)
+
+
+def session_cookie(user):
+    # Sesi login dibuat langsung di database, sama seperti django.contrib.auth.login()
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    return f"{settings.SESSION_COOKIE_NAME}={session.session_key}"
+
+
+def wait_for_server(proc, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server berhenti dengan kode {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', args.port, timeout=1)
+            conn.request('GET', '/login/')
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Server tidak merespons")
+
+
+def load(path, cookie):
+    """Jalankan ``args.concurrency`` klien selama ``args.duration`` detik; kembalikan (latensi, error)."""
+    latencies = []
+    errors = []
+    stop = time.monotonic() + args.duration
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', args.port, timeout=30)
+        mine = []
+        gagal = 0
+        while time.monotonic() < stop:
+            t0 = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Cookie': cookie})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    gagal += 1
+                elif response.getheader('Connection', '').lower() == 'close':
+                    # Worker sync gunicorn menutup koneksi setiap respons
+                    conn.close()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                gagal += 1
+                continue
+            mine.append(time.perf_counter() - t0)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+            errors.append(gagal)
+
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), sum(errors)
+
+
+def run_server(nama, cookie):
+    command = [sys.executable] + [part.format(workers=args.workers, port=args.port) for part in SERVERS[nama]]
+    proc = subprocess.Popen(command, env=dict(os.environ, ASYNC_VIEWS='1' if nama == 'uvicorn' else '0'))
+    results = {}
+    try:
+        wait_for_server(proc)
+        for path in ENDPOINTS:
+            latencies, errors = load(path, cookie)
+            results[path] = (latencies, errors)
+            n = len(latencies)
+            p50 = latencies[n // 2] * 1000 if n else 0
+            p95 = latencies[int(n * 0.95)] * 1000 if n else 0
+            print(f"{nama:<9} {path:<30} {n / args.duration:>9.1f} req/s {p50:>8.1f} ms {p95:>8.1f} ms {errors:>6}")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return results
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    user, _ = User.objects.get_or_create(username='benchmark')
+    existing = Jurnal.objects.filter(user=user).count()
+    if Akun.objects.filter(user=user).count() != args.accounts or existing != args.lines // 2 * 2:
+        print(f"Membuat ledger: {args.accounts} akun, {args.lines} baris jurnal -> {args.db}")
+        Transaksi.objects.filter(user=user).delete()
+        Akun.objects.filter(user=user).delete()
+        seed_ledger(user)
+    cookie = session_cookie(user)
+
+    servers = args.server or list(SERVERS)
+    print(f"{args.workers} worker, {args.concurrency} klien, {args.duration:.0f} s per endpoint")
+    print(f"{'Server':<9} {'Endpoint':<30} {'Throughput':>15} {'p50':>11} {'p95':>11} {'Gagal':>6}")
+    hasil = {}
+    for nama in servers:
+        if importlib.util.find_spec(nama) is None:
+            print(f"{nama:<9} tidak terpasang, dilewati")
+            continue
+        hasil[nama] = run_server(nama, cookie)
+
+    if len(hasil) == 2:
+        print("Rasio req/s uvicorn / gunicorn:")
+        for path in ENDPOINTS:
+            async_n = len(hasil['uvicorn'][path][0])
+            sync_n = len(hasil['gunicorn'][path][0])
+            print(f"  {path:<30} {async_n / sync_n if sync_n else float('inf'):>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""Benchmark ekspor Excel buku besar: styling per sel (lama) vs. keuangan.excel_utils.
+
+Generates a throwaway SQLite ledger (default 100k journal lines), reads the buku
+besar once, then writes the same rows with both implementations and reports
+rows/second. Requires openpyxl.
+
+    python benchmark_excel.py --lines 100000
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--accounts', type=int, default=50)
+parser.add_argument('--lines', type=int, default=100000, help='jumlah baris jurnal (2 baris per transaksi)')
+parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'benchmark_excel.sqlite3'))
+parser.add_argument('--seed', type=int, default=42)
+args = parser.parse_args()
+
+# Jangan pernah menyentuh db.sqlite3 milik project
+os.environ['DATABASE_URL'] = f"sqlite:///{args.db}"
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'akutansi_project.settings')
+
+import django
+django.setup()
+
+import openpyxl
+from openpyxl import Workbook
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.utils import get_column_letter
+from django.core.management import call_command
+from django.db import transaction
+from django.contrib.auth.models import User
+from keuangan.models import Akun, Transaksi, Jurnal
+from keuangan.excel_utils import ExcelExport
+from keuangan.reports import iter_buku_besar
+from keuangan.saldo import rebuild_saldo
+
+TIPE = ['Aktiva Lancar', 'Aktiva Tetap', 'Kewajiban Lancar', 'Modal', 'Pendapatan', 'Beban']
+BATCH = 5000
+HEADERS = ["No", "Tanggal", "Kode Akun", "Nama Akun", "Keterangan", "Debet", "Kredit", "Saldo"]
+
+
+def seed_ledger(user):
+    rng = random.Random(args.seed)
+    akun_list = Akun.objects.bulk_create([
+        Akun(user=user, kode=f"{i:05d}", nama=f"Akun {i}", tipe=TIPE[i % len(TIPE)])
+        for i in range(args.accounts)
+    ])
+    start = date(2020, 1, 1)
+    pairs = args.lines // 2
+    for offset in range(0, pairs, BATCH):
+        n = min(BATCH, pairs - offset)
+        with transaction.atomic():
+            transaksi = Transaksi.objects.bulk_create([
+                Transaksi(user=user, tanggal=start + timedelta(days=rng.randrange(5 * 365)), deskripsi=f"Transaksi {offset + i}")
+                for i in range(n)
+            ])
+            jurnal = []
+            for t in transaksi:
+                debet, kredit = rng.sample(akun_list, 2)
+                jumlah = Decimal(rng.randrange(100, 10000000)) / 100
+                jurnal.append(Jurnal(transaksi=t, akun=debet, user=user, tanggal=t.tanggal, debit=jumlah, kredit=0))
+                jurnal.append(Jurnal(transaksi=t, akun=kredit, user=user, tanggal=t.tanggal, debit=0, kredit=jumlah))
+            Jurnal.objects.bulk_create(jurnal)
+        print(f"  {min(offset + n, pairs) * 2:>10} / {pairs * 2} baris jurnal", end='\r')
+    print()
+    # bulk_create tidak memicu signal, jadi SaldoAkun diisi ulang sekali di akhir
+    rebuild_saldo(user)
+
+
+def legacy_excel(rows, output):
+    """Implementasi lama: workbook biasa, font/fill/border/alignment diset per sel."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Buku Besar"
+    ws.append(HEADERS)
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill("solid", fgColor="2563eb")
+    center = Alignment(horizontal="center", vertical="center")
+    right = Alignment(horizontal="right", vertical="center")
+    thin = Side(style="thin", color="D9D9D9")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for col_idx in range(1, len(HEADERS) + 1):
+        cell = ws.cell(row=1, column=col_idx)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = center
+        cell.border = border
+        ws.column_dimensions[get_column_letter(col_idx)].width = 18 if col_idx != 1 else 6
+
+    idx = 0
+    for idx, row in enumerate(rows, 1):
+        ws.append([idx, *row])
+        for col_num in range(1, len(HEADERS) + 1):
+            cell = ws.cell(row=idx + 1, column=col_num)
+            cell.border = border
+            cell.alignment = right if col_num in [6, 7, 8] else center
+    wb.save(output)
+
+
+def toolkit_excel(rows, output):
+    """Implementasi baru: named style sekali per workbook, style per kolom, write-only."""
+    export = ExcelExport()
+    ws = export.sheet("Buku Besar", [
+        ("No", 6, 'center'),
+        ("Tanggal", 12, 'center'),
+        ("Kode Akun", 12, 'center'),
+        ("Nama Akun", 24, 'left'),
+        ("Keterangan", 32, 'left'),
+        ("Debet", 16, 'uang'),
+        ("Kredit", 16, 'uang'),
+        ("Saldo", 18, 'uang'),
+    ])
+    ws.rows((idx, *row) for idx, row in enumerate(rows, 1))
+    export.save(output)
+
+
+def measure(label, fn, rows):
+    with tempfile.TemporaryFile(suffix='.xlsx') as output:
+        t0 = time.perf_counter()
+        fn(rows, output)
+        elapsed = time.perf_counter() - t0
+        size = output.tell()
+    print(f"{label:<28} {elapsed:>10.3f} s {len(rows) / elapsed:>12.0f} baris/s {size / 1e6:>8.1f} MB")
+    return elapsed
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    user, _ = User.objects.get_or_create(username='benchmark')
+    existing = Jurnal.objects.filter(user=user).count()
+    if Akun.objects.filter(user=user).count() != args.accounts or existing != args.lines // 2 * 2:
+        print(f"Membuat ledger: {args.accounts} akun, {args.lines} baris jurnal -> {args.db}")
+        Transaksi.objects.filter(user=user).delete()
+        Akun.objects.filter(user=user).delete()
+        seed_ledger(user)
+
+    # Baca buku besar sekali supaya yang diukur hanya penulisan workbook
+    rows = [
+        (j.tanggal.strftime('%d-%m-%Y'), j.akun.kode, j.akun.nama, j.transaksi.deskripsi,
+         j.debit, j.kredit, j.saldo_berjalan)
+        for j in iter_buku_besar(user, None, None, None)
+    ]
+    print(f"openpyxl {openpyxl.__version__}, lxml: {'ya' if openpyxl.LXML else 'tidak'}, {len(rows)} baris")
+    print(f"{'Implementasi':<28} {'Waktu':>12} {'Throughput':>19} {'Ukuran':>11}")
+    lama = measure('styling per sel (lama)', legacy_excel, rows)
+    baru = measure('excel_utils (baru)', toolkit_excel, rows)
+    print(f"Percepatan: {lama / baru:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""Benchmark export PDF laporan kecil: setup style per PDF vs. PdfContext bersama.
+
+Generates a throwaway SQLite ledger (default 30 accounts, 2k journal lines),
+computes the reports once, then renders the same PDFs repeatedly with the
+shared keuangan.pdf_utils.pdf_context() cleared before every PDF (the old
+behaviour: styles, table styles and header rebuilt per request) and kept warm,
+reporting the best-of-rounds PDFs/second.
+
+    python benchmark_pdf.py --accounts 30 --repeat 100 --rounds 5
+"""
+import gc
+import os
+import time
+import timeit
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--accounts', type=int, default=30)
+parser.add_argument('--lines', type=int, default=2000, help='jumlah baris jurnal (2 baris per transaksi)')
+parser.add_argument('--repeat', type=int, default=100, help='jumlah PDF per putaran')
+parser.add_argument('--rounds', type=int, default=7, help='putaran per implementasi, diambil yang tercepat')
+parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'benchmark_pdf.sqlite3'))
+parser.add_argument('--seed', type=int, default=42)
+args = parser.parse_args()
+
+# Jangan pernah menyentuh db.sqlite3 milik project
+os.environ['DATABASE_URL'] = f"sqlite:///{args.db}"
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'akutansi_project.settings')
+
+import django
+django.setup()
+
+from django.core.management import call_command
+from django.db import transaction
+from django.contrib.auth.models import User
+from reportlab.lib import rl_accel
+from keuangan.models import Akun, Transaksi, Jurnal
+from keuangan.pdf_utils import (
+    PdfContext, export_daftar_akun_pdf, export_laporan_keuangan_pdf, export_neraca_saldo_pdf, pdf_context,
+)
+from keuangan.reports import laporan_keuangan, neraca_saldo
+from keuangan.saldo import rebuild_saldo
+
+TIPE = ['Aktiva Lancar', 'Aktiva Tetap', 'Kewajiban Lancar', 'Modal', 'Pendapatan', 'Beban']
+BATCH = 5000
+
+
+def seed_ledger(user):
+    rng = random.Random(args.seed)
+    akun_list = Akun.objects.bulk_create([
+        Akun(user=user, kode=f"{i:05d}", nama=f"Akun {i}", tipe=TIPE[i % len(TIPE)])
+        for i in range(args.accounts)
+    ])
+    start = date(2020, 1, 1)
+    pairs = args.lines // 2
+    for offset in range(0, pairs, BATCH):
+        n = min(BATCH, pairs - offset)
+        with transaction.atomic():
+            transaksi = Transaksi.objects.bulk_create([
+                Transaksi(user=user, tanggal=start + timedelta(days=rng.randrange(5 * 365)), deskripsi=f"Transaksi {offset + i}")
+                for i in range(n)
+            ])
+            jurnal = []
+            for t in transaksi:
+                debet, kredit = rng.sample(akun_list, 2)
+                jumlah = Decimal(rng.randrange(100, 10000000)) / 100
+                jurnal.append(Jurnal(transaksi=t, akun=debet, user=user, tanggal=t.tanggal, debit=jumlah, kredit=0))
+                jurnal.append(Jurnal(transaksi=t, akun=kredit, user=user, tanggal=t.tanggal, debit=0, kredit=jumlah))
+            Jurnal.objects.bulk_create(jurnal)
+    # bulk_create tidak memicu signal, jadi SaldoAkun diisi ulang sekali di akhir
+    rebuild_saldo(user)
+
+
+def run(export, cold):
+    gc.collect()
+    # Waktu CPU proses: lebih stabil daripada wall clock pada mesin yang sibuk
+    t0 = time.process_time()
+    for _ in range(args.repeat):
+        if cold:
+            pdf_context.cache_clear()
+        export()
+    return (time.process_time() - t0) / args.repeat
+
+
+def measure(nama, export):
+    export()
+    # Putaran lama/baru diselang-seling supaya gangguan mesin mengenai keduanya
+    lama = baru = float('inf')
+    for _ in range(args.rounds):
+        lama = min(lama, run(export, cold=True))
+        baru = min(baru, run(export, cold=False))
+    for label, per_pdf in ((f"{nama}: setup per PDF (lama)", lama), (f"{nama}: PdfContext (baru)", baru)):
+        print(f"{label:<40} {per_pdf * 1000:>8.2f} ms {1 / per_pdf:>10.1f} PDF/s")
+    print(f"{'':<40} percepatan {lama / baru:.2f}x")
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    user, _ = User.objects.get_or_create(username='benchmark')
+    existing = Jurnal.objects.filter(user=user).count()
+    if Akun.objects.filter(user=user).count() != args.accounts or existing != args.lines // 2 * 2:
+        print(f"Membuat ledger: {args.accounts} akun, {args.lines} baris jurnal -> {args.db}")
+        Transaksi.objects.filter(user=user).delete()
+        Akun.objects.filter(user=user).delete()
+        seed_ledger(user)
+
+    # Laporan dihitung sekali supaya yang diukur hanya render PDF
+    saldo = neraca_saldo(user)['saldo']
+    laporan = laporan_keuangan(user)
+    akun_list = list(Akun.objects.filter(user=user).order_by('kode'))
+    exports = [
+        ('neraca saldo', lambda: export_neraca_saldo_pdf(saldo)),
+        ('laporan keuangan', lambda: export_laporan_keuangan_pdf(laporan)),
+        ('daftar akun', lambda: export_daftar_akun_pdf(akun_list)),
+    ]
+
+    accel = 'ya' if rl_accel._py_fp_str is not rl_accel.fp_str else 'tidak'
+    print(f"{args.accounts} akun, {args.rounds} x {args.repeat} PDF, akselerator C ReportLab (rl_accel): {accel}")
+    print(f"{'Laporan / implementasi':<40} {'Per PDF':>11} {'Throughput':>15}")
+    setup = min(timeit.repeat(PdfContext, number=args.repeat, repeat=args.rounds)) / args.repeat
+    print(f"{'membangun PdfContext saja':<40} {setup * 1000:>8.2f} ms")
+    for nama, export in exports:
+        measure(nama, export)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Benchmark keuangan.reports.account_totals: per-account aggregates vs. one grouped query.
+
+Generates a throwaway SQLite ledger (default 1k accounts, 1M journal lines) and
+reports query count and wall time of both implementations.
+
+    python benchmark_saldo.py --accounts 1000 --lines 1000000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--accounts', type=int, default=1000)
+parser.add_argument('--lines', type=int, default=1000000, help='jumlah baris jurnal (2 baris per transaksi)')
+parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'benchmark_saldo.sqlite3'))
+parser.add_argument('--seed', type=int, default=42)
+args = parser.parse_args()
+
+# Jangan pernah menyentuh db.sqlite3 milik project
+os.environ['DATABASE_URL'] = f"sqlite:///{args.db}"
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'akutansi_project.settings')
+
+import django
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Sum, Value, DecimalField
+from django.db.models.functions import Coalesce
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from keuangan.models import Akun, Transaksi, Jurnal
+from keuangan.reports import account_totals
+from keuangan.saldo import rebuild_saldo
+
+TIPE = ['Aktiva Lancar', 'Aktiva Tetap', 'Kewajiban Lancar', 'Modal', 'Pendapatan', 'Beban']
+BATCH = 5000
+
+
+def seed_ledger(user):
+    rng = random.Random(args.seed)
+    akun_list = Akun.objects.bulk_create([
+        Akun(user=user, kode=f"{i:05d}", nama=f"Akun {i}", tipe=TIPE[i % len(TIPE)])
+        for i in range(args.accounts)
+    ])
+    start = date(2020, 1, 1)
+    pairs = args.lines // 2
+    for offset in range(0, pairs, BATCH):
+        n = min(BATCH, pairs - offset)
+        with transaction.atomic():
+            transaksi = Transaksi.objects.bulk_create([
+                Transaksi(user=user, tanggal=start + timedelta(days=rng.randrange(5 * 365)), deskripsi=f"Transaksi {offset + i}")
+                for i in range(n)
+            ])
+            jurnal = []
+            for t in transaksi:
+                debet, kredit = rng.sample(akun_list, 2)
+                jumlah = Decimal(rng.randrange(100, 10000000)) / 100
+                jurnal.append(Jurnal(transaksi=t, akun=debet, user=user, tanggal=t.tanggal, debit=jumlah, kredit=0))
+                jurnal.append(Jurnal(transaksi=t, akun=kredit, user=user, tanggal=t.tanggal, debit=0, kredit=jumlah))
+            Jurnal.objects.bulk_create(jurnal)
+        print(f"  {min(offset + n, pairs) * 2:>10} / {pairs * 2} baris jurnal", end='\r')
+    print()
+    # bulk_create tidak memicu signal, jadi SaldoAkun diisi ulang sekali di akhir
+    rebuild_saldo(user)
+
+
+def legacy_totals(user):
+    """Implementasi lama: dua aggregate per akun."""
+    rows = []
+    for akun in Akun.objects.filter(user=user):
+        debit_sum = Jurnal.objects.filter(akun=akun).aggregate(total_debit=Coalesce(Sum('debit'), Value(0, output_field=DecimalField())))['total_debit']
+        kredit_sum = Jurnal.objects.filter(akun=akun).aggregate(total_kredit=Coalesce(Sum('kredit'), Value(0, output_field=DecimalField())))['total_kredit']
+        rows.append((akun.id, debit_sum, kredit_sum))
+    return rows
+
+
+def measure(label, fn):
+    with CaptureQueriesContext(connection) as ctx:
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+    print(f"{label:<28} {len(ctx.captured_queries):>8} query {elapsed:>10.3f} s")
+    return result
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    user, _ = User.objects.get_or_create(username='benchmark')
+    existing = Jurnal.objects.filter(user=user).count()
+    if Akun.objects.filter(user=user).count() != args.accounts or existing != args.lines // 2 * 2:
+        print(f"Membuat ledger: {args.accounts} akun, {args.lines} baris jurnal -> {args.db}")
+        Transaksi.objects.filter(user=user).delete()
+        Akun.objects.filter(user=user).delete()
+        seed_ledger(user)
+
+    print(f"{'Implementasi':<28} {'Query':>14} {'Waktu':>12}")
+    legacy = measure('per-akun aggregate (lama)', lambda: legacy_totals(user))
+    grouped = measure('grouped query (baru)', lambda: account_totals(user))
+
+    # SUM di SQLite memakai floating point, jadi bandingkan per sen
+    sen = Decimal('0.01')
+    legacy_map = {akun_id: (d.quantize(sen), k.quantize(sen)) for akun_id, d, k in legacy}
+    mismatch = [e['akun'].id for e in grouped['saldo'] if legacy_map[e['akun'].id] != (e['debit'].quantize(sen), e['kredit'].quantize(sen))]
+    if mismatch:
+        print(f"PERBEDAAN pada {len(mismatch)} akun: {mismatch[:10]}")
+        sys.exit(1)
+    print("Hasil kedua implementasi identik.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+"""Benchmark semua URL keuangan (HTML, PDF, Excel, API) pada beberapa ukuran buku besar.
+
+Generates one synthetic ledger per size with keuangan.generator (same data as
+`manage.py generate_ledger`) in a throwaway SQLite database, then requests every
+GET-able URL in keuangan/urls.py through the Django test client: once cold
+(report cache and stored artifacts cleared) and --repeat times warm. Writes a
+JSON report (for regression tracking / diffing between commits) and a markdown
+table next to it.
+
+    python benchmark_urls.py --sizes 1000,10000,100000 --repeat 3
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument('--sizes', default='1000,10000,100000', help='jumlah entri (transaksi) per ukuran, dipisah koma')
+parser.add_argument('--repeat', type=int, default=3, help='jumlah request hangat per URL (diambil median)')
+parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'benchmark_urls.sqlite3'))
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--output', default=os.path.join(tempfile.gettempdir(), 'benchmark_urls'),
+                    help='prefix file laporan (.json dan .md)')
+parser.add_argument('--url', action='append', help='hanya nama URL ini (boleh berulang)')
+args = parser.parse_args()
+
+# Jangan pernah menyentuh db.sqlite3 milik project
+os.environ['DATABASE_URL'] = f"sqlite:///{args.db}"
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'akutansi_project.settings')
+
+import django
+django.setup()
+
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.contrib.auth.models import User
+from django.urls import reverse
+from keuangan.artifacts import artifact_root
+from keuangan.generator import generate_ledger
+from keuangan.instrumentation import QueryStats, query_budget
+from keuangan.models import Akun, Transaksi
+from keuangan.urls import urlpatterns
+
+# URL yang tidak bisa diukur dengan GET tanpa mengubah data atau butuh objek lain
+DILEWATI = {
+    'logout': 'mengakhiri sesi',
+    'transaksi_api_create': 'POST',
+    'transaksi_api_import': 'POST',
+    'transaksi_api_update': 'POST',
+    'transaksi_api_delete': 'POST',
+    'export_submit': 'membuat ExportJob',
+    'export_status': 'butuh ExportJob',
+    'export_download': 'butuh ExportJob',
+    'report_cache_stats': 'khusus staff',
+}
+JENIS = [
+    ('text/html', 'HTML'),
+    ('application/pdf', 'PDF'),
+    ('spreadsheetml', 'Excel'),
+    ('application/json', 'API'),
+    ('text/csv', 'CSV'),
+]
+
+
+def jenis_respons(response):
+    content_type = response.get('Content-Type', '')
+    return next((label for key, label in JENIS if key in content_type), content_type or '-')
+
+
+def fetch(client, path):
+    """Satu request lengkap (termasuk isi respons streaming); kembalikan (respons, detik, ukuran, query)."""
+    stats = QueryStats()
+    t0 = time.perf_counter()
+    with connection.execute_wrapper(stats):
+        response = client.get(path)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+    return response, time.perf_counter() - t0, size, stats.count
+
+
+def ledger_user(entri):
+    user, _ = User.objects.get_or_create(username=f"bench{entri}")
+    if Transaksi.objects.filter(user=user).count() != entri:
+        print(f"Membuat ledger: {entri} entri untuk {user.username} -> {args.db}")
+        Transaksi.objects.filter(user=user).delete()
+        Akun.objects.filter(user=user).delete()
+        generate_ledger(user, entri, seed=args.seed,
+                        progress=lambda n: print(f"  {n:>10} / {entri} entri", end='\r'))
+        print()
+    return user
+
+
+def run_size(entri):
+    user = ledger_user(entri)
+    client = Client()
+    client.force_login(user)
+    akun_id = Akun.objects.filter(user=user).order_by('kode').values_list('id', flat=True).first()
+
+    hasil = []
+    for pattern in urlpatterns:
+        nama = pattern.name
+        if nama in DILEWATI or (args.url and nama not in args.url):
+            continue
+        kwargs = {'id': akun_id} if 'id' in pattern.pattern.converters else {}
+        path = reverse(nama, kwargs=kwargs)
+
+        # Dingin: tanpa laporan tercache maupun artefak PDF/Excel tersimpan
+        cache.clear()
+        shutil.rmtree(artifact_root(), ignore_errors=True)
+        response, cold, size, queries = fetch(client, path)
+        warm = [fetch(client, path)[1] for _ in range(args.repeat)]
+        row = {
+            'entri': entri,
+            'url': nama,
+            'path': path,
+            'jenis': jenis_respons(response),
+            'status': response.status_code,
+            'cold_ms': round(cold * 1000, 2),
+            'warm_ms': round(statistics.median(warm) * 1000, 2) if warm else None,
+            'bytes': size,
+            'queries': queries,
+            'budget': query_budget(nama),
+        }
+        hasil.append(row)
+        print(f"{entri:>9} {nama:<26} {row['jenis']:<6} {row['status']:>4} {row['cold_ms']:>10.1f} ms "
+              f"{row['warm_ms'] or 0:>10.1f} ms {queries:>5} q")
+    return hasil
+
+
+def tulis_markdown(laporan, path):
+    sizes = laporan['meta']['sizes']
+    per_url = {}
+    for row in laporan['hasil']:
+        per_url.setdefault((row['url'], row['jenis']), {})[row['entri']] = row
+
+    lines = [
+        f"# Benchmark URL keuangan ({laporan['meta']['waktu']})",
+        '',
+        f"Django {laporan['meta']['django']}, Python {laporan['meta']['python']}, SQLite {laporan['meta']['sqlite']}, "
+        f"seed {laporan['meta']['seed']}, median {laporan['meta']['repeat']} request hangat.",
+        '',
+        '| URL | Jenis | ' + ' | '.join(f"{n} entri dingin / hangat (ms)" for n in sizes) + ' | Query |',
+        '|---|---|' + '---:|' * len(sizes) + '---:|',
+    ]
+    for (nama, jenis), rows in per_url.items():
+        sel = []
+        for n in sizes:
+            row = rows.get(n)
+            if row is None:
+                sel.append('-')
+            elif row['status'] >= 400:
+                sel.append(f"HTTP {row['status']}")
+            else:
+                sel.append(f"{row['cold_ms']:.1f} / {row['warm_ms']:.1f}")
+        queries = max(row['queries'] for row in rows.values())
+        budget = next(iter(rows.values()))['budget']
+        lines.append(f"| `{nama}` | {jenis} | " + ' | '.join(sel) + f" | {queries}{f' / {budget}' if budget else ''} |")
+    lines += ['', 'Dilewati: ' + ', '.join(f"`{nama}` ({alasan})" for nama, alasan in DILEWATI.items()), '']
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    settings.ALLOWED_HOSTS.append('testserver')
+    # Artefak laporan ditulis ke direktori sementara, bukan media/ milik project
+    settings.MEDIA_ROOT = tempfile.mkdtemp(prefix='benchmark_urls_media_')
+    # Budget query dicatat di laporan; peringatan per request hanya mengganggu output
+    logging.getLogger('keuangan.performance').setLevel(logging.ERROR)
+
+    sizes = [int(n) for n in args.sizes.split(',')]
+    print(f"{'Entri':>9} {'URL':<26} {'Jenis':<6} {'HTTP':>4} {'Dingin':>13} {'Hangat':>13} {'Query':>7}")
+    hasil = []
+    try:
+        for entri in sizes:
+            hasil += run_size(entri)
+    finally:
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    laporan = {
+        'meta': {
+            'waktu': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'sqlite': connection.Database.sqlite_version,
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'hasil': hasil,
+        'dilewati': DILEWATI,
+    }
+    with open(f"{args.output}.json", 'w', encoding='utf-8') as f:
+        json.dump(laporan, f, indent=2)
+    tulis_markdown(laporan, f"{args.output}.md")
+    print(f"Laporan: {args.output}.json, {args.output}.md")
+
+    gagal = [row for row in hasil if row['status'] >= 400]
+    if gagal:
+        print("Respons gagal: " + ', '.join(f"{row['url']} ({row['entri']}: HTTP {row['status']})" for row in gagal))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
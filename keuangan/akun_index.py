@@ -0,0 +1,66 @@
+from django.core.cache import cache
+
+from .models import Akun, LedgerVersion
+
+AKUN_INDEX_TIMEOUT = 3600
+KEY_PREFIX = 'akun_index'
+
+
+class AkunIndex:
+    """Indeks akun milik satu user: id, kode, nama dan teks '<kode> - <nama>'.
+
+    Dibangun dengan satu query lalu disimpan di cache, jadi resolusi akun di API
+    hanya perlu query versi selama daftar akun user tidak berubah.
+    """
+
+    def __init__(self, akun_list):
+        self.by_id = {}
+        self.by_kode = {}
+        self.by_nama = {}
+        self.by_display = {}
+        for akun in akun_list:
+            self.by_id[akun.id] = akun
+            self.by_kode[akun.kode.lower()] = akun
+            self.by_nama.setdefault(akun.nama.lower(), akun)
+            self.by_display[str(akun).lower()] = akun
+
+    def resolve(self, val, kode_dulu=False):
+        """Akun untuk ``val`` (instance, id, kode, nama, atau '<kode> - <nama>'), atau None.
+
+        Secara default id didahulukan (nilai dari <select> di form). Data impor
+        merujuk akun lewat kode, jadi ``kode_dulu`` mencegah kode numerik seperti
+        '1001' tertukar dengan id akun lain.
+        """
+        if isinstance(val, Akun):
+            return self.by_id.get(val.id)
+        if val is None or val == '':
+            return None
+        text = str(val).strip().lower()
+        try:
+            by_id = self.by_id.get(int(text))
+        except ValueError:
+            by_id = None
+        if by_id is not None and not kode_dulu:
+            return by_id
+        akun = self.by_kode.get(text) or self.by_display.get(text) or self.by_nama.get(text)
+        if akun is None and ' - ' in text:
+            akun = self.by_kode.get(text.split(' - ')[0].strip())
+        return akun or by_id
+
+
+def akun_version(user_id):
+    """Versi daftar akun user dari database (naik lewat ``bump_ledger_version(akun=True)``)."""
+    # Versi di database, bukan di cache: cache default per proses, sehingga counter
+    # di sana hanya usang di worker yang menangani perubahan akun
+    return LedgerVersion.objects.filter(user_id=user_id).values_list('versi_akun', flat=True).first() or 0
+
+
+def akun_index(user):
+    """Indeks akun user dari cache, dikunci versi daftar akun; dibangun ulang dengan satu query jika belum ada."""
+    key = f"{KEY_PREFIX}:{user.pk}:v{akun_version(user.pk)}"
+    index = cache.get(key)
+    if index is None:
+        index = AkunIndex(Akun.objects.filter(user=user))
+        cache.set(key, index, timeout=AKUN_INDEX_TIMEOUT)
+    return index
+
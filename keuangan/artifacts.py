@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.crypto import salted_hmac
+
+from .report_cache import ledger_version
+
+# Direktori artefak laporan, relatif terhadap MEDIA_ROOT
+ARTIFACT_DIR = 'laporan'
+
+
+def artifact_root():
+    return Path(settings.MEDIA_ROOT) / ARTIFACT_DIR
+
+
+def artifact_max_bytes():
+    return getattr(settings, 'REPORT_ARTIFACT_MAX_MB', 200) * 1024 * 1024
+
+
+def _prefix(report, params):
+    raw = json.dumps(params or {}, sort_keys=True, default=str)
+    # HMAC dengan SECRET_KEY: MEDIA_ROOT ikut disajikan saat DEBUG, nama file tidak boleh bisa ditebak
+    return f"{report}-{salted_hmac('keuangan.artifacts', raw).hexdigest()[:32]}"
+
+
+def artifact_path(user_id, report, params, versi, ext):
+    """Lokasi file artefak untuk (user, laporan, parameter, versi buku besar)."""
+    return artifact_root() / str(user_id) / f"{_prefix(report, params)}-v{versi}.{ext}"
+
+
+def _hapus_versi_lama(path, prefix):
+    # Artefak parameter yang sama dari versi buku besar sebelumnya tidak akan dipakai lagi
+    for old in path.parent.glob(f"{prefix}-v*{path.suffix}"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def open_artifact(user, report, params, ext, render):
+    """Buka artefak laporan (file biner) untuk versi buku besar user saat ini.
+
+    Jika belum ada, ``render(output)`` dipanggil untuk menulis isi file; hasilnya
+    disimpan di MEDIA_ROOT dan dipakai ulang oleh unduhan berikutnya sampai versi
+    buku besar berubah. Setiap pemakaian memperbarui mtime file sebagai penanda
+    LRU untuk ``evict_artifacts``.
+    """
+    versi = ledger_version(user.pk)
+    path = artifact_path(user.pk, report, params, versi, ext)
+    try:
+        output = open(path, 'rb')
+    except FileNotFoundError:
+        pass
+    else:
+        # Lewat path, bukan file descriptor: os.utime(fd) tidak didukung di Windows
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Baru saja dihapus evict_artifacts; file yang sudah terbuka tetap bisa dibaca
+            pass
+        return output
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Tulis ke file sementara di direktori yang sama lalu rename atomik, supaya
+    # request lain tidak pernah membaca artefak setengah jadi
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    output = os.fdopen(fd, 'w+b')
+    try:
+        render(output)
+        output.flush()
+        os.replace(tmp_name, path)
+    except BaseException:
+        output.close()
+        os.unlink(tmp_name)
+        raise
+    _hapus_versi_lama(path, _prefix(report, params))
+    evict_artifacts()
+    # Handle tetap valid walau file dihapus eviction request lain sebelum dibaca
+    output.seek(0)
+    return output
+
+
+def artifact_response(user, report, params, filename, render):
+    """FileResponse unduhan dari artefak laporan (lihat ``open_artifact``)."""
+    ext = filename.rsplit('.', 1)[-1]
+    output = open_artifact(user, report, params, ext, render)
+    return FileResponse(output, as_attachment=True, filename=filename)
+
+
+def evict_artifacts(max_bytes=None):
+    """Hapus artefak yang paling lama tidak dipakai sampai total ukurannya <= ``max_bytes``.
+
+    Mengembalikan jumlah file yang dihapus. File ``.tmp`` (artefak yang sedang
+    dibuat) tidak ikut dihitung maupun dihapus.
+    """
+    if max_bytes is None:
+        max_bytes = artifact_max_bytes()
+    files = []
+    total = 0
+    for path in artifact_root().glob('*/*'):
+        if path.suffix == '.tmp':
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    dihapus = 0
+    for _, size, path in sorted(files, key=lambda f: f[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        dihapus += 1
+    return dihapus
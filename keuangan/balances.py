@@ -0,0 +1,23 @@
+from decimal import Decimal
+
+from .models import Akun
+from .saldo import saldo_periode
+
+
+def akun_with_balances(user, start_date=None, end_date=None, akun_qs=None):
+    """Return the user's accounts with ``total_debit`` / ``total_kredit`` attached.
+
+    Totals come from the nearest SaldoPenutupan snapshot plus the SaldoAkun
+    month buckets after it; only the (at most two) partially covered months at
+    the edges of the period are summed from Jurnal. The number of queries is
+    constant and their cost does not grow with the age of the books.
+    ``start_date`` and ``end_date`` are inclusive bounds on the journal date.
+    """
+    if akun_qs is None:
+        akun_qs = Akun.objects.filter(user=user)
+
+    totals = saldo_periode(user, start_date, end_date)
+    akun_list = list(akun_qs)
+    for akun in akun_list:
+        akun.total_debit, akun.total_kredit = totals.get(akun.id, (Decimal('0'), Decimal('0')))
+    return akun_list
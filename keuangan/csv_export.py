@@ -0,0 +1,61 @@
+import csv
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+# Jumlah baris yang diambil per round-trip database saat iterasi queryset
+CSV_CHUNK_SIZE = 2000
+# Jumlah baris CSV yang digabung menjadi satu potongan respons
+CSV_ROWS_PER_WRITE = 500
+
+
+class Echo:
+    """Objek mirip file yang langsung mengembalikan nilai yang ditulis csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def wants_csv(request):
+    return request.GET.get('format') == 'csv'
+
+
+async def aiter_potongan(potongan):
+    """Iterator async di atas generator sync ``potongan``, satu potongan per ``sync_to_async``.
+
+    Di ASGI, StreamingHttpResponse dengan iterator sync ditampung seluruhnya di
+    memori; generator (dan query ORM di dalamnya) tetap berjalan di thread sync
+    yang sama, sekali pindah thread per potongan CSV_ROWS_PER_WRITE baris.
+    """
+    ambil = sync_to_async(lambda: next(potongan, None))
+    try:
+        while (chunk := await ambil()) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(potongan.close)()
+
+
+def streaming_csv_response(filename, header, rows, asynchronous=False):
+    """StreamingHttpResponse CSV dari iterable ``rows`` tanpa menampung seluruh file.
+
+    ``rows`` sebaiknya generator di atas ``QuerySet.iterator(chunk_size=...)``
+    supaya unduhan langsung mulai dan memori tetap konstan. View async memakai
+    ``asynchronous=True`` supaya respons di-stream lewat iterator async.
+    """
+    writer = csv.writer(Echo())
+
+    def generate():
+        yield writer.writerow(header)
+        batch = []
+        for row in rows:
+            batch.append(writer.writerow(row))
+            if len(batch) >= CSV_ROWS_PER_WRITE:
+                yield ''.join(batch)
+                batch = []
+        if batch:
+            yield ''.join(batch)
+
+    content = aiter_potongan(generate()) if asynchronous else generate()
+    response = StreamingHttpResponse(content, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
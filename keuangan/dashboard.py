@@ -0,0 +1,88 @@
+import asyncio
+from datetime import date
+
+from django.db.models import Count, Prefetch, Q, Sum, Value, DecimalField
+from django.db.models.functions import Coalesce
+
+from .entries import ringkas_baris
+from .models import Akun, Jurnal, SaldoAkun, Transaksi
+
+RECENT_TRANSACTIONS = 5
+
+
+def _saldo_totals():
+    return {
+        'total_debet': Coalesce(Sum('debit'), Value(0), output_field=DecimalField()),
+        'total_kredit': Coalesce(Sum('kredit'), Value(0), output_field=DecimalField()),
+    }
+
+
+def _transaksi_counts(today):
+    return {
+        'total_transaksi': Count('transaksi', distinct=True),
+        'transaksi_hari_ini': Count('transaksi', distinct=True, filter=Q(tanggal=today)),
+    }
+
+
+def _latest_transaksi(user):
+    return (
+        Transaksi.objects.filter(user=user)
+        .order_by('-tanggal', '-id')
+        .prefetch_related(Prefetch('jurnal_set', queryset=Jurnal.objects.select_related('akun').order_by('id')))
+        [:RECENT_TRANSACTIONS]
+    )
+
+
+def _dashboard_context(totals, counts, total_akun, latest):
+    recent_transactions = []
+    for transaksi in latest:
+        recent_transactions.append({
+            'tanggal': transaksi.tanggal,
+            'deskripsi': transaksi.deskripsi,
+            **ringkas_baris(list(transaksi.jurnal_set.all())),
+        })
+
+    total_debet = totals['total_debet']
+    total_kredit = totals['total_kredit']
+    return {
+        'total_transaksi': counts['total_transaksi'],
+        'total_debet': total_debet,
+        'total_kredit': total_kredit,
+        'total_akun': total_akun,
+        'transaksi_hari_ini': counts['transaksi_hari_ini'],
+        'recent_transactions': recent_transactions,
+        'selisih': total_debet - total_kredit,
+        'is_balanced': total_debet == total_kredit,
+    }
+
+
+def get_dashboard_data(user, today=None):
+    """Counter dan transaksi terbaru untuk dashboard.
+
+    Jumlah query tetap (lima) berapa pun banyaknya data: total debet/kredit
+    dari SaldoAkun, jumlah transaksi dari indeks Jurnal (user, tanggal,
+    transaksi), jumlah akun, lalu transaksi terbaru beserta baris jurnalnya
+    lewat satu prefetch.
+    """
+    today = today or date.today()
+    totals = SaldoAkun.objects.filter(user=user).aggregate(**_saldo_totals())
+    counts = Jurnal.objects.filter(user=user).aggregate(**_transaksi_counts(today))
+    total_akun = Akun.objects.filter(user=user).count()
+    latest = list(_latest_transaksi(user))
+    return _dashboard_context(totals, counts, total_akun, latest)
+
+
+async def aget_dashboard_data(user, today=None):
+    """Versi async ``get_dashboard_data``: keempat query independen dijalankan lewat ``asyncio.gather``."""
+    today = today or date.today()
+    totals, counts, total_akun, latest = await asyncio.gather(
+        SaldoAkun.objects.filter(user=user).aaggregate(**_saldo_totals()),
+        Jurnal.objects.filter(user=user).aaggregate(**_transaksi_counts(today)),
+        Akun.objects.filter(user=user).acount(),
+        _alist(_latest_transaksi(user)),
+    )
+    return _dashboard_context(totals, counts, total_akun, latest)
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
@@ -0,0 +1,120 @@
+from decimal import Decimal, InvalidOperation
+
+from .models import Jurnal, Transaksi
+
+SEN = Decimal('0.01')
+# Batas kolom Jurnal.debit/kredit (max_digits=12, decimal_places=2)
+MAX_JUMLAH = Decimal('9999999999.99')
+# Batas jumlah baris jurnal dalam satu transaksi
+MAX_BARIS = 100
+
+
+def parse_jumlah(value):
+    """Nominal debit/kredit sebagai Decimal >= 0 dengan maksimal 2 desimal (kosong = 0)."""
+    if value is None or value == '':
+        return Decimal('0')
+    try:
+        jumlah = Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        raise ValueError("Jumlah bukan angka")
+    if not jumlah.is_finite() or jumlah < 0:
+        raise ValueError("Jumlah tidak boleh negatif")
+    if jumlah > MAX_JUMLAH or jumlah != jumlah.quantize(SEN):
+        raise ValueError("Jumlah melebihi batas atau lebih dari 2 angka desimal")
+    return jumlah
+
+
+def lines_from_payload(payload):
+    """Baris jurnal mentah dari payload API/impor.
+
+    Payload boleh berisi ``lines`` (list ``{akun, debit, kredit}``) untuk entri
+    majemuk, atau format lama ``akun_debet``/``akun_kredit``/``jumlah`` yang
+    diubah menjadi dua baris.
+    """
+    lines = payload.get('lines')
+    if lines is not None:
+        if not isinstance(lines, list):
+            raise ValueError("lines harus berupa list")
+        return lines
+    jumlah = parse_jumlah(payload.get('jumlah'))
+    if jumlah <= 0:
+        raise ValueError("Jumlah harus lebih dari 0")
+    return [
+        {'akun': payload.get('akun_debet'), 'debit': jumlah, 'kredit': 0},
+        {'akun': payload.get('akun_kredit'), 'debit': 0, 'kredit': jumlah},
+    ]
+
+
+def validate_lines(raw_lines, resolve_akun):
+    """Validasi baris jurnal beserta keseimbangannya dalam satu kali lintasan.
+
+    ``resolve_akun(val)`` mengembalikan Akun milik user atau None (biasanya
+    ``akun_index(user).resolve``). Mengembalikan
+    list ``(akun, debit, kredit)``; raise ValueError dengan pesan untuk pengguna.
+    """
+    if len(raw_lines) > MAX_BARIS:
+        raise ValueError(f"Transaksi maksimal terdiri dari {MAX_BARIS} baris jurnal")
+    result = []
+    akun_ids = set()
+    total_debit = total_kredit = Decimal('0')
+    for nomor, line in enumerate(raw_lines, start=1):
+        if not isinstance(line, dict):
+            raise ValueError(f"Baris {nomor}: harus berupa objek")
+        try:
+            debit = parse_jumlah(line.get('debit'))
+            kredit = parse_jumlah(line.get('kredit'))
+        except ValueError as e:
+            raise ValueError(f"Baris {nomor}: {e}")
+        if (debit > 0) == (kredit > 0):
+            raise ValueError(f"Baris {nomor}: isi salah satu dari debit atau kredit")
+        akun = resolve_akun(line.get('akun'))
+        if akun is None:
+            raise ValueError(f"Baris {nomor}: akun tidak ditemukan atau tidak dimiliki oleh pengguna")
+        akun_ids.add(akun.id)
+        total_debit += debit
+        total_kredit += kredit
+        result.append((akun, debit, kredit))
+
+    if len(result) < 2:
+        raise ValueError("Transaksi minimal terdiri dari 2 baris jurnal")
+    if len(akun_ids) < 2:
+        raise ValueError("Akun debet dan kredit tidak boleh sama")
+    if total_debit != total_kredit:
+        raise ValueError(f"Total debit ({total_debit}) tidak sama dengan total kredit ({total_kredit})")
+    return result
+
+
+def simpan_entri(user, tanggal, deskripsi, lines, transaksi=None):
+    """Simpan transaksi baru, atau ganti isi ``transaksi``, dengan baris yang sudah divalidasi.
+
+    Harus dipanggil di dalam transaction.atomic. Baris ditulis lewat
+    ``Jurnal.objects.create`` supaya signal SaldoAkun tetap berjalan.
+    """
+    if transaksi is None:
+        transaksi = Transaksi.objects.create(tanggal=tanggal, deskripsi=deskripsi, user=user)
+    else:
+        Jurnal.objects.filter(transaksi=transaksi).delete()
+        transaksi.tanggal = tanggal
+        transaksi.deskripsi = deskripsi
+        transaksi.save()
+    for akun, debit, kredit in lines:
+        Jurnal.objects.create(transaksi=transaksi, akun=akun, debit=debit, kredit=kredit)
+    return transaksi
+
+
+def ringkas_baris(lines):
+    """Ringkasan satu transaksi dari baris jurnalnya (sudah urut id, akun sudah di-select).
+
+    ``akun_debet``/``akun_kredit`` adalah akun pertama di tiap sisi (untuk
+    tampilan ringkas), ``debet_lain``/``kredit_lain`` jumlah akun lain di sisi
+    itu, dan ``jumlah`` total sisi debit.
+    """
+    debet = [j for j in lines if j.debit > 0]
+    kredit = [j for j in lines if j.kredit > 0]
+    return {
+        'akun_debet': debet[0].akun if debet else None,
+        'akun_kredit': kredit[0].akun if kredit else None,
+        'debet_lain': max(len(debet) - 1, 0),
+        'kredit_lain': max(len(kredit) - 1, 0),
+        'jumlah': sum((j.debit for j in debet), Decimal('0')),
+    }
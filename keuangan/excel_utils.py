@@ -0,0 +1,142 @@
+"""Toolkit ekspor Excel bersama.
+
+openpyxl bukan dependensi wajib, jadi modul ini di-import di dalam view ekspor
+(bukan di level modul view).
+"""
+import tempfile
+from copy import copy
+
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+ANGKA = '#,##0'
+UANG = '#,##0.00'
+ZEBRA = 'F8FAFC'
+
+
+def _named_styles():
+    """Style bernama yang tersedia di setiap workbook ekspor.
+
+    Style isi tabel juga punya varian ``<nama>_zebra`` (baris berselang) dan
+    varian tebal ``total_<nama>`` untuk baris total.
+    """
+    thin = Side(style="thin", color="D9D9D9")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    center = Alignment(horizontal="center", vertical="center")
+    left = Alignment(horizontal="left", vertical="center")
+    right = Alignment(horizontal="right", vertical="center")
+
+    styles = [
+        NamedStyle(name='judul', font=Font(size=14, bold=True), alignment=Alignment(horizontal="center")),
+        NamedStyle(name='subjudul', alignment=Alignment(horizontal="center")),
+        NamedStyle(name='header', font=Font(bold=True, color="FFFFFF"),
+                   fill=PatternFill("solid", fgColor="2563eb"), alignment=center, border=border),
+    ]
+    # nama -> (alignment, number_format)
+    isi = {
+        'center': (center, 'General'),
+        'left': (left, 'General'),
+        'right': (right, 'General'),
+        'angka': (right, ANGKA),
+        'uang': (right, UANG),
+        'persen': (right, '0.00%'),
+        'rasio': (right, '0.00'),
+    }
+    for nama, (alignment, number_format) in isi.items():
+        styles.append(NamedStyle(name=nama, alignment=alignment, border=border, number_format=number_format))
+        styles.append(NamedStyle(name=f'{nama}_zebra', alignment=alignment, border=border, number_format=number_format,
+                                 fill=PatternFill("solid", fgColor=ZEBRA)))
+        styles.append(NamedStyle(name=f'total_{nama}', font=Font(bold=True), alignment=alignment, border=border,
+                                 number_format=number_format))
+    return styles
+
+
+class ExcelSheet:
+    """Satu sheet write-only dengan style per kolom.
+
+    ``columns`` adalah list ``(judul_kolom, lebar, style)``; ``style`` adalah
+    nama style isi (``center``, ``left``, ``angka``, ``uang``, ...) yang juga
+    membawa number format kolom tersebut.
+    """
+
+    def __init__(self, ws, columns, judul=None, subjudul=None):
+        self.ws = ws
+        self.styles = [style for _, _, style in columns]
+        self._template = {}
+        last_col = get_column_letter(len(columns))
+
+        # Lebar kolom, merge dan freeze pane harus diset sebelum baris pertama ditulis
+        for i, (_, width, _) in enumerate(columns, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+        header_row = 1 + (judul is not None) + (subjudul is not None)
+        for row in range(1, header_row):
+            ws.merged_cells.add(f"A{row}:{last_col}{row}")
+        ws.freeze_panes = f"A{header_row + 1}"
+
+        if judul is not None:
+            self.row([judul], 'judul')
+        if subjudul is not None:
+            self.row([subjudul], 'subjudul')
+        self.row([title for title, _, _ in columns], 'header')
+
+    def _cell(self, value, style):
+        # Salin StyleArray dari sel contoh: tidak ada lookup nama style per sel
+        template = self._template.get(style)
+        if template is None:
+            template = WriteOnlyCell(self.ws)
+            template.style = style
+            self._template[style] = template
+        cell = WriteOnlyCell(self.ws, value=value)
+        cell._style = copy(template._style)
+        return cell
+
+    def row(self, values, styles=None):
+        """Tulis satu baris; ``styles`` berupa satu nama untuk semua sel atau list per kolom."""
+        if styles is None:
+            styles = self.styles
+        elif isinstance(styles, str):
+            styles = [styles] * len(values)
+        self.ws.append([self._cell(value, style) for value, style in zip(values, styles)])
+
+    def rows(self, iterable, zebra=False):
+        """Tulis banyak baris dengan style kolom; ``zebra`` memberi warna berselang."""
+        styles = self.styles
+        zebra_styles = [f'{style}_zebra' for style in styles]
+        append = self.ws.append
+        cell = self._cell
+        for i, values in enumerate(iterable):
+            row_styles = zebra_styles if zebra and i % 2 else styles
+            append([cell(value, style) for value, style in zip(values, row_styles)])
+
+    def total(self, values):
+        """Baris total: style kolom dalam versi tebal."""
+        self.row(values, [f'total_{style}' for style in self.styles])
+
+    def blank(self):
+        self.ws.append([])
+
+
+class ExcelExport:
+    """Workbook write-only: style bernama didaftarkan sekali, baris langsung ke file sementara."""
+
+    def __init__(self):
+        self.wb = Workbook(write_only=True)
+        for style in _named_styles():
+            self.wb.add_named_style(style)
+
+    def sheet(self, title, columns, judul=None, subjudul=None):
+        return ExcelSheet(self.wb.create_sheet(title), columns, judul, subjudul)
+
+    def save(self, output):
+        self.wb.save(output)
+
+    def response(self, filename):
+        # File sementara dihapus otomatis saat FileResponse menutupnya
+        output = tempfile.TemporaryFile(suffix='.xlsx')
+        self.wb.save(output)
+        output.seek(0)
+        return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
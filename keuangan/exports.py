@@ -0,0 +1,143 @@
+import hashlib
+import json
+import re
+import tempfile
+import traceback
+import uuid
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.core.files import File
+from django.test import RequestFactory
+from django.utils import timezone
+
+from .models import ExportJob
+from .report_cache import ledger_version
+
+# Nama ekspor -> view yang menghasilkan file (dijalankan ulang oleh worker)
+EXPORT_VIEWS = {
+    'jurnal_umum_pdf': 'keuangan.views.jurnal_umum_pdf',
+    'jurnal_umum_excel': 'keuangan.views.jurnal_umum_excel',
+    'buku_besar_pdf': 'keuangan.views_laporan.buku_besar_pdf',
+    'buku_besar_excel': 'keuangan.views_laporan.buku_besar_excel',
+    'neraca_saldo_pdf': 'keuangan.views_laporan.neraca_saldo_pdf',
+    'neraca_saldo_excel': 'keuangan.views_laporan.neraca_saldo_excel',
+    'laporan_keuangan_pdf': 'keuangan.views_laporan.laporan_keuangan_pdf',
+    'laporan_keuangan_excel': 'keuangan.views_laporan.laporan_keuangan_excel',
+    'daftar_akun_pdf': 'keuangan.views.daftar_akun_pdf',
+    'daftar_akun_excel': 'keuangan.views.daftar_akun_excel',
+}
+
+
+def export_ttl():
+    return timedelta(hours=getattr(settings, 'EXPORT_FILE_TTL_HOURS', 24))
+
+
+def _kunci(jenis, params):
+    raw = json.dumps([jenis, params], sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _resolve_view(jenis):
+    module_name, _, attr = EXPORT_VIEWS[jenis].rpartition('.')
+    return getattr(import_module(module_name), attr)
+
+
+def submit_export(user, jenis, params):
+    """Masukkan ekspor ke antrian, atau kembalikan job identik yang masih berlaku.
+
+    Job dianggap identik jika user, jenis, parameter dan versi buku besarnya sama,
+    dan job tersebut masih antri/diproses atau sudah selesai dan belum kedaluwarsa.
+    Mengembalikan ``(job, dibuat_baru)``.
+    """
+    if jenis not in EXPORT_VIEWS:
+        raise ValueError(f"Jenis ekspor tidak dikenal: {jenis}")
+    params = {key: value for key, value in sorted(params.items()) if value not in (None, '')}
+    kunci = _kunci(jenis, params)
+    versi = ledger_version(user.pk)
+    now = timezone.now()
+
+    for job in ExportJob.objects.filter(user=user, kunci=kunci, versi=versi).order_by('-dibuat'):
+        if job.status in (ExportJob.STATUS_ANTRI, ExportJob.STATUS_PROSES):
+            return job, False
+        if job.status == ExportJob.STATUS_SELESAI and job.kedaluwarsa and job.kedaluwarsa > now:
+            return job, False
+
+    job = ExportJob.objects.create(user=user, jenis=jenis, params=params, kunci=kunci, versi=versi)
+    return job, True
+
+
+def claim_next_job():
+    """Ambil satu job antri tertua dan tandai sedang diproses.
+
+    Klaim memakai UPDATE bersyarat pada status, jadi aman dijalankan beberapa
+    worker sekaligus tanpa SELECT ... FOR UPDATE SKIP LOCKED (tidak ada di SQLite).
+    """
+    for job_id in ExportJob.objects.filter(status=ExportJob.STATUS_ANTRI).order_by('dibuat').values_list('id', flat=True)[:10]:
+        claimed = ExportJob.objects.filter(id=job_id, status=ExportJob.STATUS_ANTRI).update(
+            status=ExportJob.STATUS_PROSES, mulai=timezone.now()
+        )
+        if claimed:
+            return ExportJob.objects.select_related('user').get(id=job_id)
+    return None
+
+
+def _filename(response, default):
+    match = re.search(r'filename="?([^";]+)"?', response.get('Content-Disposition', ''))
+    return match.group(1) if match else default
+
+
+def run_export(job):
+    """Jalankan view ekspor untuk job ini dan simpan hasilnya di EXPORT_ROOT."""
+    request = RequestFactory().get('/', job.params)
+    request.user = job.user
+    try:
+        response = _resolve_view(job.jenis)(request)
+        if response.status_code != 200:
+            raise RuntimeError(f"View ekspor mengembalikan status {response.status_code}")
+        nama_file = _filename(response, job.jenis)
+        # Tulis bertahap ke file sementara supaya ekspor besar tidak ditampung di memori
+        with tempfile.TemporaryFile() as tmp:
+            chunks = response.streaming_content if response.streaming else [response.content]
+            for chunk in chunks:
+                tmp.write(chunk)
+            response.close()
+            tmp.seek(0)
+            # Nama acak: id job berurutan dan nama file tetap mudah ditebak
+            job.file.save(f"{uuid.uuid4().hex}-{nama_file}", File(tmp), save=False)
+        job.nama_file = nama_file
+        job.status = ExportJob.STATUS_SELESAI
+        job.error = ''
+    except Exception:
+        job.status = ExportJob.STATUS_GAGAL
+        job.error = traceback.format_exc()
+    job.selesai = timezone.now()
+    job.kedaluwarsa = job.selesai + export_ttl()
+    job.save()
+    return job
+
+
+def fail_stale_jobs(now=None):
+    """Tandai gagal job yang terlalu lama berstatus diproses (worker mati di tengah jalan)."""
+    now = now or timezone.now()
+    batas = now - timedelta(minutes=getattr(settings, 'EXPORT_JOB_TIMEOUT_MINUTES', 60))
+    return ExportJob.objects.filter(status=ExportJob.STATUS_PROSES, mulai__lt=batas).update(
+        status=ExportJob.STATUS_GAGAL,
+        error='Worker berhenti sebelum ekspor selesai',
+        selesai=now,
+        kedaluwarsa=now + export_ttl(),
+    )
+
+
+def cleanup_expired(now=None):
+    """Hapus job yang sudah kedaluwarsa beserta filenya; mengembalikan jumlah job."""
+    now = now or timezone.now()
+    expired = ExportJob.objects.filter(kedaluwarsa__lt=now)
+    jumlah = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        jumlah += 1
+    return jumlah
@@ -1,6 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
+from .entries import MAX_BARIS, validate_lines
 from .models import Transaksi, Akun, UserProfile
 
 class CustomUserCreationForm(UserCreationForm):
@@ -58,34 +59,7 @@ class CustomUserCreationForm(UserCreationForm):
             user.save()
         return user
 
-class TransaksiForm(forms.ModelForm):    
-    akun_debet = forms.ModelChoiceField(
-        queryset=Akun.objects.all(),
-        empty_label="Pilih Akun Debet",
-        widget=forms.Select(attrs={
-            'class': 'form-select',
-        })
-    )
-    
-    akun_kredit = forms.ModelChoiceField(
-        queryset=Akun.objects.all(),
-        empty_label="Pilih Akun Kredit",
-        widget=forms.Select(attrs={
-            'class': 'form-select',
-        })
-    )
-    
-    jumlah = forms.DecimalField(
-        max_digits=12,
-        decimal_places=2,
-        widget=forms.NumberInput(attrs={
-            'class': 'form-control',
-            'step': '0.01',
-            'min': '0',
-            'placeholder': '0.00'
-        })
-    )
-
+class TransaksiForm(forms.ModelForm):
     class Meta:
         model = Transaksi
         fields = ['tanggal', 'deskripsi']
@@ -101,15 +75,88 @@ class TransaksiForm(forms.ModelForm):
             }),
         }
 
-    def __init__(self, *args, **kwargs):
-        user = kwargs.pop('user', None)
+
+class BarisJurnalForm(forms.Form):
+    akun = forms.ModelChoiceField(
+        queryset=Akun.objects.none(),
+        empty_label="Pilih Akun",
+        widget=forms.Select(attrs={
+            'class': 'form-select baris-akun',
+        })
+    )
+
+    debit = forms.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        min_value=0,
+        required=False,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control baris-debit',
+            'step': '0.01',
+            'min': '0',
+            'placeholder': '0.00'
+        })
+    )
+
+    kredit = forms.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        min_value=0,
+        required=False,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control baris-kredit',
+            'step': '0.01',
+            'min': '0',
+            'placeholder': '0.00'
+        })
+    )
+
+    def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
         if user is not None:
-            self.fields['akun_debet'].queryset = Akun.objects.filter(user=user).order_by('kode')
-            self.fields['akun_kredit'].queryset = Akun.objects.filter(user=user).order_by('kode')
-        else:
-            self.fields['akun_debet'].queryset = Akun.objects.none()
-            self.fields['akun_kredit'].queryset = Akun.objects.none()
+            self.fields['akun'].queryset = Akun.objects.filter(user=user).order_by('kode')
+
+
+class BaseBarisJurnalFormSet(forms.BaseFormSet):
+    def clean(self):
+        """Periksa keseimbangan debit = kredit atas semua baris yang diisi."""
+        self.entri = []
+        if any(self.errors):
+            return
+        lines = [
+            form.cleaned_data for form in self.forms
+            if form.cleaned_data and not self._should_delete_form(form)
+        ]
+        try:
+            # Akun sudah dibatasi milik user oleh queryset field
+            self.entri = validate_lines(lines, lambda akun: akun)
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+
+
+def data_baris_dari_pasangan(data, prefix='baris'):
+    """Ubah POST format lama (akun_debet, akun_kredit, jumlah) menjadi data formset dua baris."""
+    data = data.copy()
+    data.update({
+        f'{prefix}-TOTAL_FORMS': '2',
+        f'{prefix}-INITIAL_FORMS': '0',
+        f'{prefix}-0-akun': data.get('akun_debet', ''),
+        f'{prefix}-0-debit': data.get('jumlah', ''),
+        f'{prefix}-1-akun': data.get('akun_kredit', ''),
+        f'{prefix}-1-kredit': data.get('jumlah', ''),
+    })
+    return data
+
+
+BarisJurnalFormSet = forms.formset_factory(
+    BarisJurnalForm,
+    formset=BaseBarisJurnalFormSet,
+    extra=0,
+    min_num=2,
+    validate_min=True,
+    max_num=MAX_BARIS,
+    validate_max=True,
+)
 
 class AkunForm(forms.ModelForm):
     TIPE_CHOICES = [
@@ -0,0 +1,171 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from .models import Akun, Jurnal, SaldoAkun, SaldoPenutupan, Transaksi
+from .report_cache import bump_ledger_version
+from .saldo import sinkronkan_setelah_bulk
+
+GENERATE_BATCH_SIZE = 5000
+
+# Bagan akun contoh perusahaan dagang/jasa kecil: (kode, nama, tipe)
+BAGAN_AKUN = [
+    ('1101', 'Kas', 'Aktiva Lancar'),
+    ('1102', 'Bank', 'Aktiva Lancar'),
+    ('1103', 'Piutang Usaha', 'Aktiva Lancar'),
+    ('1104', 'Persediaan Barang', 'Aktiva Lancar'),
+    ('1105', 'Perlengkapan', 'Aktiva Lancar'),
+    ('1106', 'Sewa Dibayar di Muka', 'Aktiva Lancar'),
+    ('1201', 'Peralatan', 'Aktiva Tetap'),
+    ('1202', 'Kendaraan', 'Aktiva Tetap'),
+    ('1203', 'Gedung', 'Aktiva Tetap'),
+    ('2101', 'Utang Usaha', 'Kewajiban Lancar'),
+    ('2102', 'Utang Gaji', 'Kewajiban Lancar'),
+    ('2103', 'PPN Keluaran', 'Kewajiban Lancar'),
+    ('2201', 'Utang Bank', 'Kewajiban Jangka Panjang'),
+    ('3101', 'Modal Pemilik', 'Modal'),
+    ('3102', 'Prive', 'Modal'),
+    ('4101', 'Penjualan', 'Pendapatan'),
+    ('4102', 'Pendapatan Jasa', 'Pendapatan'),
+    ('4103', 'Pendapatan Bunga', 'Pendapatan'),
+    ('5101', 'Harga Pokok Penjualan', 'Beban'),
+    ('5102', 'Beban Gaji', 'Beban'),
+    ('5103', 'Beban Sewa', 'Beban'),
+    ('5104', 'Beban Listrik dan Air', 'Beban'),
+    ('5105', 'Beban Transportasi', 'Beban'),
+    ('5106', 'Beban Perlengkapan', 'Beban'),
+    ('5107', 'Beban Bunga', 'Beban'),
+]
+
+# Pola transaksi: (deskripsi, bobot, rentang jumlah dalam rupiah, baris (kode, sisi, porsi)).
+# Porsi baris debet dan kredit masing-masing berjumlah 1, jadi setiap entri seimbang.
+POLA_TRANSAKSI = [
+    ('Penjualan tunai', 20, (50_000, 5_000_000),
+     [('1101', 'D', 1), ('4101', 'K', Decimal('0.9')), ('2103', 'K', Decimal('0.1'))]),
+    ('Penjualan kredit', 12, (500_000, 20_000_000), [('1103', 'D', 1), ('4101', 'K', 1)]),
+    ('Pelunasan piutang', 10, (500_000, 20_000_000), [('1102', 'D', 1), ('1103', 'K', 1)]),
+    ('Pendapatan jasa', 8, (100_000, 10_000_000), [('1102', 'D', 1), ('4102', 'K', 1)]),
+    ('Pembelian persediaan', 12, (1_000_000, 30_000_000), [('1104', 'D', 1), ('2101', 'K', 1)]),
+    ('Pembayaran utang usaha', 8, (1_000_000, 30_000_000), [('2101', 'D', 1), ('1102', 'K', 1)]),
+    ('Harga pokok penjualan', 10, (30_000, 3_000_000), [('5101', 'D', 1), ('1104', 'K', 1)]),
+    ('Pembayaran gaji', 4, (5_000_000, 50_000_000), [('5102', 'D', 1), ('1102', 'K', 1)]),
+    ('Pembayaran sewa', 2, (2_000_000, 15_000_000), [('5103', 'D', 1), ('1101', 'K', 1)]),
+    ('Pembayaran listrik dan air', 3, (200_000, 3_000_000), [('5104', 'D', 1), ('1101', 'K', 1)]),
+    ('Biaya transportasi', 4, (20_000, 1_000_000), [('5105', 'D', 1), ('1101', 'K', 1)]),
+    ('Pembelian perlengkapan', 3, (50_000, 2_000_000), [('1105', 'D', 1), ('1101', 'K', 1)]),
+    ('Pemakaian perlengkapan', 2, (50_000, 1_000_000), [('5106', 'D', 1), ('1105', 'K', 1)]),
+    ('Setoran kas ke bank', 4, (1_000_000, 20_000_000), [('1102', 'D', 1), ('1101', 'K', 1)]),
+    ('Pembelian peralatan', 1, (2_000_000, 50_000_000), [('1201', 'D', 1), ('1102', 'K', 1)]),
+    ('Angsuran utang bank', 1, (5_000_000, 25_000_000),
+     [('2201', 'D', Decimal('0.8')), ('5107', 'D', Decimal('0.2')), ('1102', 'K', 1)]),
+    ('Pendapatan bunga bank', 1, (10_000, 500_000), [('1102', 'D', 1), ('4103', 'K', 1)]),
+    ('Prive pemilik', 1, (1_000_000, 10_000_000), [('3102', 'D', 1), ('1101', 'K', 1)]),
+]
+
+# Saldo awal di hari pertama supaya neraca tidak didominasi saldo negatif
+SALDO_AWAL = [('1101', 'D', Decimal('0.1')), ('1102', 'D', Decimal('0.5')), ('1203', 'D', Decimal('0.4')),
+              ('3101', 'K', Decimal('0.8')), ('2201', 'K', Decimal('0.2'))]
+
+
+def buat_bagan_akun(user):
+    """Buat bagan akun contoh untuk ``user`` (akun dengan kode yang sudah ada dilewati).
+
+    Mengembalikan dict kode -> id akun.
+    """
+    ada = set(Akun.objects.filter(user=user).values_list('kode', flat=True))
+    Akun.objects.bulk_create([
+        Akun(user=user, kode=kode, nama=nama, tipe=tipe)
+        for kode, nama, tipe in BAGAN_AKUN if kode not in ada
+    ])
+    # bulk_create tidak memicu signal: indeks akun tercache harus dibangun ulang
+    bump_ledger_version(user.pk, akun=True)
+    return dict(Akun.objects.filter(user=user, kode__in=[kode for kode, _, _ in BAGAN_AKUN]).values_list('kode', 'id'))
+
+
+def hapus_ledger(user):
+    """Hapus semua akun, transaksi, jurnal dan saldo ``user`` dengan DELETE massal.
+
+    Berbeda dengan ``QuerySet.delete()``, tidak ada cascade di Python maupun
+    signal per baris (satu ``DELETE`` per tabel), jadi jumlah query tetap
+    berapa pun banyaknya data. Mengembalikan jumlah transaksi yang dihapus.
+    """
+    qn = connection.ops.quote_name
+    terhapus = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Anak dulu supaya constraint FK tetap terpenuhi
+        for model in (Jurnal, SaldoPenutupan, SaldoAkun, Transaksi, Akun):
+            cursor.execute(
+                f"DELETE FROM {qn(model._meta.db_table)} WHERE {qn(model._meta.get_field('user').column)} = %s",
+                [user.pk],
+            )
+            terhapus[model] = cursor.rowcount
+        sinkronkan_setelah_bulk(user)
+        # Signal akun tidak terpicu: indeks akun tercache juga harus dibangun ulang
+        bump_ledger_version(user.pk, akun=True)
+    return terhapus[Transaksi]
+
+
+def _baris(akun, pola, jumlah):
+    # Sisi terakhir menerima sisa pembulatan supaya debet == kredit persis
+    sisa = {'D': jumlah, 'K': jumlah}
+    terakhir = {sisi: i for i, (_, sisi, _) in enumerate(pola)}
+    lines = []
+    for i, (kode, sisi, porsi) in enumerate(pola):
+        nilai = sisa[sisi] if terakhir[sisi] == i else (jumlah * porsi).quantize(Decimal('1'))
+        sisa[sisi] -= nilai
+        lines.append((akun[kode], nilai, 0) if sisi == 'D' else (akun[kode], 0, nilai))
+    return lines
+
+
+def iter_entri(akun, jumlah, seed, mulai, hari):
+    """Hasilkan ``jumlah`` entri (tanggal, deskripsi, baris) yang seimbang dan urut tanggal.
+
+    Deterministik untuk ``seed`` yang sama; baris berupa (akun_id, debit, kredit).
+    """
+    rng = random.Random(seed)
+    bobot = [pola[1] for pola in POLA_TRANSAKSI]
+    modal = Decimal(rng.randrange(500, 5000)) * 1_000_000
+    yield mulai, 'Saldo awal', _baris(akun, SALDO_AWAL, modal)
+    for i in range(1, jumlah):
+        deskripsi, _, (rendah, tinggi), pola = rng.choices(POLA_TRANSAKSI, bobot)[0]
+        # Kelipatan 100 rupiah, seperti nominal transaksi sungguhan
+        nilai = Decimal(rng.randrange(rendah // 100, tinggi // 100 + 1) * 100)
+        tanggal = mulai + timedelta(days=i * hari // jumlah)
+        yield tanggal, f"{deskripsi} #{i}", _baris(akun, pola, nilai)
+
+
+def generate_ledger(user, jumlah, seed=0, mulai=date(2020, 1, 1), tahun=3, batch_size=GENERATE_BATCH_SIZE, progress=None):
+    """Tulis bagan akun dan ``jumlah`` entri jurnal seimbang sintetis untuk ``user``.
+
+    Entri ditulis per ``batch_size`` dengan bulk_create dalam satu transaksi
+    database, lalu SaldoAkun, snapshot tutup buku dan versi buku besar
+    diselaraskan. ``progress(dibuat)`` dipanggil setelah setiap batch.
+    Mengembalikan jumlah baris jurnal yang ditulis.
+    """
+    hari = 365 * tahun
+    baris = 0
+    with transaction.atomic():
+        akun = buat_bagan_akun(user)
+        entri = iter_entri(akun, jumlah, seed, mulai, hari)
+        for offset in range(0, jumlah, batch_size):
+            batch = [next(entri) for _ in range(min(batch_size, jumlah - offset))]
+            transaksi_list = Transaksi.objects.bulk_create([
+                Transaksi(user_id=user.pk, tanggal=tanggal, deskripsi=deskripsi)
+                for tanggal, deskripsi, _ in batch
+            ])
+            # bulk_create tidak memanggil Jurnal.save(), jadi user dan tanggal diisi di sini;
+            # kolom *_id diisi langsung karena descriptor relasi mendominasi waktu pembuatan objek
+            jurnal = [
+                Jurnal(transaksi_id=transaksi.pk, akun_id=akun_id, user_id=user.pk, tanggal=tanggal, debit=debit, kredit=kredit)
+                for transaksi, (tanggal, _, lines) in zip(transaksi_list, batch)
+                for akun_id, debit, kredit in lines
+            ]
+            Jurnal.objects.bulk_create(jurnal)
+            baris += len(jurnal)
+            if progress:
+                progress(offset + len(batch))
+        if jumlah:
+            sinkronkan_setelah_bulk(user, mulai)
+    return baris
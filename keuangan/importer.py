@@ -0,0 +1,137 @@
+import csv
+import json
+
+from django.db import transaction
+
+from .akun_index import akun_index
+from .entries import lines_from_payload, validate_lines
+from .models import Jurnal, Transaksi
+from .saldo import sinkronkan_setelah_bulk
+from .utils import parse_date_flexible
+
+IMPORT_BATCH_SIZE = 2000
+# Error yang dikembalikan dibatasi; jumlah totalnya tetap dilaporkan
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ('jsonl', 'csv')
+
+
+def detect_format(nama=None, content_type=None):
+    """Tebak format dari ekstensi file atau content type; default JSON Lines."""
+    nama = (nama or '').lower()
+    content_type = (content_type or '').lower()
+    if nama.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    return 'jsonl'
+
+
+def iter_records(lines, fmt):
+    """Hasilkan ``(nomor_baris, record, error)`` dari baris teks JSON Lines atau CSV."""
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            # Nomor baris fisik (header = baris 1)
+            yield reader.line_num, {k.strip().lower(): v for k, v in record.items() if k}, None
+        return
+    for nomor, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield nomor, None, f"JSON tidak valid: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield nomor, None, "Setiap baris harus berupa objek JSON"
+            continue
+        yield nomor, record, None
+
+
+def validate_record(record, index):
+    """Kembalikan ``(tanggal, deskripsi, baris)`` atau raise ValueError.
+
+    ``baris`` adalah list ``(akun, debit, kredit)``; record JSON Lines boleh
+    berisi ``lines`` untuk entri majemuk selain pasangan debet/kredit.
+    """
+    tanggal = parse_date_flexible(record.get('tanggal'))
+    if not tanggal:
+        raise ValueError("Tanggal kosong atau tidak valid")
+    deskripsi = str(record.get('deskripsi') or '').strip()
+    if not deskripsi:
+        raise ValueError("Deskripsi wajib diisi")
+    if len(deskripsi) > 255:
+        raise ValueError("Deskripsi maksimal 255 karakter")
+    return tanggal, deskripsi, validate_lines(
+        lines_from_payload(record), lambda val: index.resolve(val, kode_dulu=True)
+    )
+
+
+def _write_batch(user, batch):
+    transaksi_list = Transaksi.objects.bulk_create([
+        Transaksi(user=user, tanggal=tanggal, deskripsi=deskripsi)
+        for tanggal, deskripsi, _ in batch
+    ])
+    # bulk_create tidak memanggil Jurnal.save(), jadi user dan tanggal diisi di sini
+    Jurnal.objects.bulk_create([
+        Jurnal(transaksi=transaksi, akun=akun, user=user, tanggal=tanggal, debit=debit, kredit=kredit)
+        for transaksi, (tanggal, _, lines) in zip(transaksi_list, batch)
+        for akun, debit, kredit in lines
+    ])
+
+
+class _Rollback(Exception):
+    pass
+
+
+def import_transaksi(user, lines, fmt='jsonl', dry_run=False, skip_errors=False, batch_size=IMPORT_BATCH_SIZE):
+    """Impor transaksi (pasangan debet/kredit atau entri majemuk) secara massal.
+
+    ``lines`` adalah iterable baris teks (file terbuka, body request, dsb.) dan
+    dibaca bertahap. Baris valid ditulis per ``batch_size`` dengan bulk_create di
+    dalam satu transaksi database. Jika ada baris yang tidak valid, seluruh impor
+    dibatalkan kecuali ``skip_errors``; ``dry_run`` hanya memvalidasi.
+    Mengembalikan dict ``dibuat``, ``jumlah_error`` dan ``errors`` (per baris).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+    index = akun_index(user)
+    errors = []
+    jumlah_error = 0
+    dibuat = 0
+    mulai = None
+    batch = []
+
+    def flush():
+        nonlocal batch, dibuat
+        if batch and not dry_run:
+            _write_batch(user, batch)
+        dibuat += len(batch)
+        batch = []
+
+    try:
+        with transaction.atomic():
+            for nomor, record, error in iter_records(lines, fmt):
+                if error is None:
+                    try:
+                        row = validate_record(record, index)
+                    except ValueError as e:
+                        error = str(e)
+                if error is not None:
+                    jumlah_error += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({'baris': nomor, 'error': error})
+                    continue
+                mulai = row[0] if mulai is None else min(mulai, row[0])
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush()
+            flush()
+
+            if dry_run or (jumlah_error and not skip_errors):
+                raise _Rollback
+            if dibuat:
+                sinkronkan_setelah_bulk(user, mulai)
+    except _Rollback:
+        if not dry_run:
+            dibuat = 0
+
+    return {'dibuat': dibuat, 'jumlah_error': jumlah_error, 'errors': errors, 'dry_run': dry_run}
@@ -0,0 +1,111 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+
+logger = logging.getLogger('keuangan.performance')
+
+
+class QueryStats:
+    """``execute_wrapper`` yang mencatat jumlah query, SQL-nya dan total waktu DB."""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.sql = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.count += 1
+            self.sql.append(sql)
+
+
+def query_budget(url_name):
+    """Batas jumlah query untuk nama URL dari ``settings.QUERY_BUDGETS`` (None jika tidak diatur)."""
+    return getattr(settings, 'QUERY_BUDGETS', {}).get(url_name)
+
+
+class QueryInstrumentationMiddleware:
+    """Catat jumlah query, waktu DB dan waktu total setiap request.
+
+    Hasilnya dikirim sebagai header ``Server-Timing`` (bila ``SERVER_TIMING``
+    aktif), request yang lebih lama dari ``SLOW_REQUEST_MS`` dan request yang
+    melewati ``QUERY_BUDGETS`` untuk nama URL-nya dicatat ke logger
+    ``keuangan.performance``. Query dari respons streaming yang dijalankan
+    setelah view selesai tidak ikut terhitung.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = QueryStats()
+        start = time.perf_counter()
+        with connection.execute_wrapper(stats):
+            response = self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        start = time.perf_counter()
+        # Koneksi bersifat context-local, jadi wrapper ini juga dipakai query ORM async
+        with connection.execute_wrapper(stats):
+            response = await self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, stats, elapsed):
+        db_ms = stats.db_time * 1000
+        total_ms = elapsed * 1000
+        if getattr(settings, 'SERVER_TIMING', False):
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f};desc="{stats.count} query", total;dur={total_ms:.1f}'
+            )
+
+        match = request.resolver_match
+        url_name = match.url_name if match else None
+        budget = query_budget(url_name)
+        if budget is not None and stats.count > budget:
+            logger.warning(
+                "%s %s (%s): %d query melewati budget %d",
+                request.method, request.path, url_name, stats.count, budget,
+            )
+        if total_ms >= getattr(settings, 'SLOW_REQUEST_MS', 1000):
+            logger.warning(
+                "Request lambat %s %s (%s): %.0f ms, %d query, %.0f ms DB",
+                request.method, request.path, url_name, total_ms, stats.count, db_ms,
+            )
+
+
+def assert_query_budget(client, url_name, *args, method='get', data=None, **kwargs):
+    """Panggil URL ``url_name`` lewat test client dan gagal jika jumlah query melewati budgetnya.
+
+    Mengembalikan respons agar pemanggil bisa memeriksa isinya. Query sesi dan
+    autentikasi ikut dihitung, sama seperti pada middleware.
+    """
+    budget = query_budget(url_name)
+    if budget is None:
+        raise AssertionError(f"QUERY_BUDGETS tidak punya budget untuk '{url_name}'")
+    stats = QueryStats()
+    with connection.execute_wrapper(stats):
+        response = getattr(client, method)(reverse(url_name, args=args, kwargs=kwargs), data)
+    if stats.count > budget:
+        daftar = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(stats.sql, 1))
+        raise AssertionError(f"'{url_name}' menjalankan {stats.count} query, budget {budget}:\n{daftar}")
+    return response
@@ -0,0 +1,55 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from keuangan.models import Jurnal, Transaksi, SaldoAkun
+
+
+def query_plans():
+    """Bentuk query utama aplikasi beserta indeks yang boleh dipakai."""
+    return [
+        ('transaksi per user & rentang tanggal',
+         Transaksi.objects.filter(user_id=1, tanggal__gte=date(2024, 1, 1)).order_by('tanggal', 'id'),
+         ('transaksi_user_tgl_id_idx',)),
+        ('jurnal per user & rentang tanggal',
+         Jurnal.objects.filter(user_id=1, tanggal__gte=date(2024, 1, 1)).order_by('tanggal', 'transaksi_id'),
+         ('jurnal_user_tgl_trx_idx',)),
+        ('jurnal per akun urut transaksi',
+         Jurnal.objects.filter(akun_id=1).order_by('transaksi_id'),
+         ('jurnal_akun_trx_idx',)),
+        ('saldo bulanan per user',
+         SaldoAkun.objects.filter(user_id=1, periode__gte=date(2024, 1, 1)),
+         ('saldoakun_user_periode_idx',)),
+    ]
+
+
+def periksa_indeks():
+    """EXPLAIN setiap query di ``query_plans()``; hasilkan (label, indeks dipakai atau None, indeks utama, plan)."""
+    if connection.vendor not in ('sqlite', 'postgresql'):
+        raise CommandError(f"Backend '{connection.vendor}' tidak didukung oleh cek_indeks")
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Tabel kecil membuat planner memilih seq scan; paksa agar indeks terlihat di plan
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for label, qs, index_names in query_plans():
+            plan = qs.explain()
+            dipakai = next((name for name in index_names if name in plan), None)
+            yield label, dipakai, index_names[0], plan
+
+
+class Command(BaseCommand):
+    help = "Jalankan EXPLAIN pada query utama dan pastikan indeks komposit dipakai (SQLite & PostgreSQL)."
+
+    def handle(self, *args, **options):
+        gagal = []
+        for label, dipakai, indeks, plan in periksa_indeks():
+            status = self.style.SUCCESS('OK  ') if dipakai else self.style.ERROR('GAGAL')
+            self.stdout.write(f"{status} {label}: {dipakai or indeks}")
+            if not dipakai:
+                self.stdout.write(f"      {plan}")
+                gagal.append(indeks)
+
+        if gagal:
+            raise CommandError(f"Indeks tidak dipakai: {', '.join(gagal)}")
@@ -0,0 +1,64 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from keuangan.generator import GENERATE_BATCH_SIZE, generate_ledger, hapus_ledger
+from keuangan.models import Transaksi
+
+
+class Command(BaseCommand):
+    help = ("Buat buku besar sintetis untuk uji skala: bagan akun contoh dan N entri jurnal seimbang "
+            "per user, deterministik dari --seed.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1, help='Jumlah user yang dibuat')
+        parser.add_argument('--entri', type=int, default=100000, help='Jumlah entri (transaksi) per user')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', default='ledger', help="Username: <prefix>1, <prefix>2, ...")
+        parser.add_argument('--password', help='Password user; default tanpa password (tidak bisa login)')
+        parser.add_argument('--mulai', default='2020-01-01', help='Tanggal entri pertama (YYYY-MM-DD)')
+        parser.add_argument('--tahun', type=int, default=3, help='Rentang tanggal entri dalam tahun')
+        parser.add_argument('--batch', type=int, default=GENERATE_BATCH_SIZE, help='Jumlah transaksi per bulk_create')
+        parser.add_argument('--ganti', action='store_true',
+                            help='Hapus akun & transaksi user yang sudah ada sebelum membuat data baru')
+
+    def handle(self, *args, **options):
+        mulai = parse_date(options['mulai'])
+        if mulai is None:
+            raise CommandError(f"Tanggal tidak valid: {options['mulai']}")
+        if options['users'] < 1 or options['entri'] < 0 or options['batch'] < 1:
+            raise CommandError("--users dan --batch minimal 1, --entri tidak boleh negatif")
+
+        for nomor in range(1, options['users'] + 1):
+            username = f"{options['prefix']}{nomor}"
+            user, dibuat = User.objects.get_or_create(username=username)
+            if dibuat:
+                if options['password']:
+                    user.set_password(options['password'])
+                else:
+                    user.set_unusable_password()
+                user.save()
+            elif Transaksi.objects.filter(user=user).exists():
+                if not options['ganti']:
+                    raise CommandError(f"User '{username}' sudah punya transaksi; pakai --ganti untuk menimpanya")
+                hapus_ledger(user)
+
+            def progress(n):
+                self.stdout.write(f"  {username}: {n} / {options['entri']} entri", ending='\r')
+                self.stdout.flush()
+
+            awal = time.perf_counter()
+            # Seed per user supaya setiap user punya data berbeda tetapi tetap bisa diulang
+            baris = generate_ledger(
+                user, options['entri'], seed=f"{options['seed']}:{nomor}", mulai=mulai,
+                tahun=options['tahun'], batch_size=options['batch'], progress=progress,
+            )
+            durasi = time.perf_counter() - awal
+            # Baris progress diakhiri '\r'; ringkasan ditulis di baris baru
+            if options['entri']:
+                self.stdout.write('')
+            self.stdout.write(self.style.SUCCESS(
+                f"{username}: {options['entri']} entri, {baris} baris jurnal ({durasi:.1f} s, {baris / max(durasi, 1e-9):.0f} baris/s)"
+            ))
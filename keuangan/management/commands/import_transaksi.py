@@ -0,0 +1,50 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from keuangan.importer import FORMATS, IMPORT_BATCH_SIZE, detect_format, import_transaksi
+
+
+class Command(BaseCommand):
+    help = "Impor massal transaksi (pasangan debet/kredit, atau entri majemuk lewat 'lines' di JSON Lines) dari file JSON Lines atau CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Path file .jsonl atau .csv (kolom: tanggal, deskripsi, akun_debet, akun_kredit, jumlah)')
+        parser.add_argument('--user', required=True, help='Username pemilik transaksi')
+        parser.add_argument('--format', choices=FORMATS, help='Default: ditebak dari ekstensi file')
+        parser.add_argument('--batch', type=int, default=IMPORT_BATCH_SIZE, help='Jumlah transaksi per bulk_create')
+        parser.add_argument('--dry-run', action='store_true', help='Validasi saja, tidak menulis apa pun')
+        parser.add_argument('--lewati-error', action='store_true', help='Tetap impor baris valid walau ada baris yang salah')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' tidak ditemukan")
+
+        fmt = options['format'] or detect_format(options['file'])
+        mulai = time.perf_counter()
+        try:
+            with open(options['file'], encoding='utf-8-sig', newline='') as f:
+                result = import_transaksi(
+                    user, f, fmt,
+                    dry_run=options['dry_run'],
+                    skip_errors=options['lewati_error'],
+                    batch_size=options['batch'],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+        durasi = time.perf_counter() - mulai
+
+        for error in result['errors']:
+            self.stderr.write(f"baris {error['baris']}: {error['error']}")
+        if result['jumlah_error'] > len(result['errors']):
+            self.stderr.write(f"... dan {result['jumlah_error'] - len(result['errors'])} error lainnya")
+
+        if options['dry_run']:
+            self.stdout.write(f"Dry run: {result['dibuat']} baris valid, {result['jumlah_error']} error ({durasi:.1f} s)")
+        elif result['dibuat']:
+            self.stdout.write(self.style.SUCCESS(f"{result['dibuat']} transaksi diimpor, {result['jumlah_error']} baris dilewati ({durasi:.1f} s)"))
+        if result['jumlah_error'] and not options['lewati_error']:
+            raise CommandError(f"{result['jumlah_error']} baris tidak valid; tidak ada yang diimpor")
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from keuangan.exports import claim_next_job, cleanup_expired, fail_stale_jobs, run_export
+from keuangan.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = "Worker antrian ekspor PDF/Excel: kerjakan job antri, lalu bersihkan file yang kedaluwarsa."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sekali', action='store_true', help='Kerjakan semua job yang antri lalu berhenti')
+        parser.add_argument('--interval', type=float, default=2.0, help='Detik menunggu saat antrian kosong')
+        parser.add_argument('--bersihkan-setiap', type=int, default=300, help='Detik antar pembersihan file kedaluwarsa')
+
+    def handle(self, *args, **options):
+        terakhir_bersih = 0.0
+        while True:
+            if time.monotonic() - terakhir_bersih >= options['bersihkan_setiap']:
+                gagal = fail_stale_jobs()
+                dihapus = cleanup_expired()
+                if gagal or dihapus:
+                    self.stdout.write(f"{gagal} job macet ditandai gagal, {dihapus} job kedaluwarsa dihapus")
+                terakhir_bersih = time.monotonic()
+
+            job = claim_next_job()
+            if job is None:
+                if options['sekali']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            mulai = time.monotonic()
+            job = run_export(job)
+            durasi = time.monotonic() - mulai
+            if job.status == ExportJob.STATUS_SELESAI:
+                self.stdout.write(self.style.SUCCESS(f"#{job.id} {job.jenis} ({job.user.username}) selesai dalam {durasi:.1f} s"))
+            else:
+                self.stdout.write(self.style.ERROR(f"#{job.id} {job.jenis} ({job.user.username}) gagal: {job.error.strip().splitlines()[-1]}"))
@@ -0,0 +1,33 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from keuangan.saldo import rebuild_saldo
+
+
+class Command(BaseCommand):
+    help = "Verifikasi tabel SaldoAkun terhadap Jurnal dan perbaiki bucket yang tidak sesuai."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username; default semua user')
+        parser.add_argument('--check', action='store_true', help='Hanya verifikasi, jangan ubah data (exit 1 jika ada selisih)')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' tidak ditemukan")
+
+        result = rebuild_saldo(user=user, dry_run=options['check'])
+        changed = sum(result.values())
+        summary = f"dibuat: {result['created']}, diperbarui: {result['updated']}, dihapus: {result['deleted']}"
+
+        if options['check']:
+            if changed:
+                raise CommandError(f"SaldoAkun tidak sesuai dengan Jurnal ({summary})")
+            self.stdout.write(self.style.SUCCESS("SaldoAkun sesuai dengan Jurnal."))
+        elif changed:
+            self.stdout.write(self.style.WARNING(f"SaldoAkun diperbaiki ({summary})"))
+        else:
+            self.stdout.write(self.style.SUCCESS("SaldoAkun sudah sesuai, tidak ada perubahan."))
@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from keuangan.models import Transaksi, SaldoPenutupan
+from keuangan.saldo import akhir_bulan, tutup_periode
+
+
+def akhir_periode_list(mulai, sampai, periode):
+    """Semua tanggal akhir bulan/tahun dari periode ``mulai`` s/d ``sampai``."""
+    if periode == 'tahunan':
+        return [date(tahun, 12, 31) for tahun in range(mulai.year, sampai.year + 1) if date(tahun, 12, 31) <= sampai]
+    hasil = []
+    akhir = akhir_bulan(mulai)
+    while akhir <= sampai:
+        hasil.append(akhir)
+        akhir = akhir_bulan(akhir + timedelta(days=1))
+    return hasil
+
+
+class Command(BaseCommand):
+    help = "Tutup buku: tulis snapshot saldo kumulatif per akun pada setiap akhir bulan/tahun."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username; default semua user')
+        parser.add_argument('--periode', choices=['bulanan', 'tahunan'], default='bulanan')
+        parser.add_argument('--sampai', help='Tanggal terakhir yang ditutup (YYYY-MM-DD); default akhir periode lalu')
+        parser.add_argument('--ulang', action='store_true', help='Tulis ulang snapshot yang sudah ada')
+
+    def handle(self, *args, **options):
+        periode = options['periode']
+        if options['sampai']:
+            sampai = parse_date(options['sampai'])
+            if sampai is None:
+                raise CommandError("Format --sampai harus YYYY-MM-DD")
+        elif periode == 'tahunan':
+            sampai = date(date.today().year - 1, 12, 31)
+        else:
+            sampai = date.today().replace(day=1) - timedelta(days=1)
+
+        users = User.objects.all()
+        if options['user']:
+            users = users.filter(username=options['user'])
+            if not users.exists():
+                raise CommandError(f"User '{options['user']}' tidak ditemukan")
+
+        for user in users:
+            pertama = Transaksi.objects.filter(user=user).order_by('tanggal').values_list('tanggal', flat=True).first()
+            if pertama is None:
+                continue
+            sudah = set(SaldoPenutupan.objects.filter(user=user).values_list('tanggal', flat=True).distinct())
+            ditulis = 0
+            # Urut maju: setiap snapshot dibangun dari snapshot sebelumnya + mutasi sesudahnya
+            for tanggal in akhir_periode_list(pertama, sampai, periode):
+                if tanggal in sudah and not options['ulang']:
+                    continue
+                tutup_periode(user, tanggal)
+                ditulis += 1
+            self.stdout.write(f"{user.username}: {ditulis} periode ditutup s/d {sampai}")
+        self.stdout.write(self.style.SUCCESS("Tutup buku selesai."))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+
+
+def isi_saldo_akun(apps, schema_editor):
+    Jurnal = apps.get_model('keuangan', 'Jurnal')
+    SaldoAkun = apps.get_model('keuangan', 'SaldoAkun')
+    rows = (
+        Jurnal.objects.annotate(periode=TruncMonth('transaksi__tanggal'))
+        .values('akun_id', 'akun__user_id', 'periode')
+        .annotate(total_debit=Sum('debit'), total_kredit=Sum('kredit'))
+        .order_by()
+    )
+    SaldoAkun.objects.bulk_create([
+        SaldoAkun(
+            user_id=r['akun__user_id'],
+            akun_id=r['akun_id'],
+            periode=r['periode'],
+            debit=r['total_debit'] or 0,
+            kredit=r['total_kredit'] or 0,
+        )
+        for r in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0005_userprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoAkun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('periode', models.DateField()),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('kredit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('akun', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='keuangan.akun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('akun', 'periode')},
+            },
+        ),
+        migrations.RunPython(isi_saldo_akun, migrations.RunPython.noop),
+    ]
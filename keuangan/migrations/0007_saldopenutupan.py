@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0006_saldoakun'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoPenutupan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tanggal', models.DateField()),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('kredit', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('dibuat', models.DateTimeField(auto_now_add=True)),
+                ('akun', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='keuangan.akun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('akun', 'tanggal')},
+            },
+        ),
+    ]
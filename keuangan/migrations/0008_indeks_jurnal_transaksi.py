@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0007_saldopenutupan'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jurnal',
+            index=models.Index(fields=['akun', 'transaksi'], name='jurnal_akun_trx_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jurnal',
+            index=models.Index(condition=models.Q(('debit__gt', 0)), fields=['transaksi', 'akun'], name='jurnal_trx_debit_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jurnal',
+            index=models.Index(condition=models.Q(('kredit__gt', 0)), fields=['transaksi', 'akun'], name='jurnal_trx_kredit_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saldoakun',
+            index=models.Index(fields=['user', 'periode'], name='saldoakun_user_periode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='saldopenutupan',
+            index=models.Index(fields=['user', 'tanggal'], name='saldopenutupan_user_tgl_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaksi',
+            index=models.Index(fields=['user', 'tanggal', 'id'], name='transaksi_user_tgl_id_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Skema, isi data dan constraint dipisah ke tiga migrasi: di PostgreSQL FK baru
+    # bersifat deferred, sehingga UPDATE lalu ALTER kolom dalam satu transaksi gagal
+    # dengan "pending trigger events"
+
+    dependencies = [
+        ('keuangan', '0008_indeks_jurnal_transaksi'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jurnal',
+            name='user',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='jurnal',
+            name='tanggal',
+            field=models.DateField(editable=False, null=True),
+        ),
+    ]
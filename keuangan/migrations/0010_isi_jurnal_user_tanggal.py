@@ -0,0 +1,23 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def isi_user_tanggal(apps, schema_editor):
+    Akun = apps.get_model('keuangan', 'Akun')
+    Transaksi = apps.get_model('keuangan', 'Transaksi')
+    Jurnal = apps.get_model('keuangan', 'Jurnal')
+    Jurnal.objects.update(
+        user_id=Subquery(Akun.objects.filter(pk=OuterRef('akun_id')).values('user_id')[:1]),
+        tanggal=Subquery(Transaksi.objects.filter(pk=OuterRef('transaksi_id')).values('tanggal')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0009_jurnal_user_tanggal'),
+    ]
+
+    operations = [
+        migrations.RunPython(isi_user_tanggal, migrations.RunPython.noop),
+    ]
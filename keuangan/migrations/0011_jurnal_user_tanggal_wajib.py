@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0010_isi_jurnal_user_tanggal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jurnal',
+            name='user',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='jurnal',
+            name='tanggal',
+            field=models.DateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='jurnal',
+            index=models.Index(fields=['user', 'tanggal', 'transaksi'], name='jurnal_user_tgl_trx_idx'),
+        ),
+    ]
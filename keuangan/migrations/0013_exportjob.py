@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 18:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0012_ledgerversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jenis', models.CharField(max_length=50)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('kunci', models.CharField(max_length=64)),
+                ('versi', models.PositiveBigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('antri', 'Antri'), ('proses', 'Diproses'), ('selesai', 'Selesai'), ('gagal', 'Gagal')], default='antri', max_length=10)),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/')),
+                ('nama_file', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('dibuat', models.DateTimeField(auto_now_add=True)),
+                ('mulai', models.DateTimeField(blank=True, null=True)),
+                ('selesai', models.DateTimeField(blank=True, null=True)),
+                ('kedaluwarsa', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'dibuat'], name='exportjob_status_dibuat_idx'), models.Index(fields=['user', 'kunci', 'versi'], name='exportjob_user_kunci_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0013_exportjob'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jurnal',
+            name='jurnal_trx_debit_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jurnal',
+            name='jurnal_trx_kredit_idx',
+        ),
+    ]
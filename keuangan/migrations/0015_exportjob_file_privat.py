@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:03
+
+import keuangan.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0014_hapus_indeks_sisi_jurnal'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, storage=keuangan.models.export_storage, upload_to='%Y/%m/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keuangan', '0015_exportjob_file_privat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ledgerversion',
+            name='versi_akun',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -35,14 +37,134 @@ class Transaksi(models.Model):
     deskripsi = models.CharField(max_length=255)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            # Daftar/filter transaksi per user berdasarkan rentang tanggal, urut (tanggal, id)
+            models.Index(fields=['user', 'tanggal', 'id'], name='transaksi_user_tgl_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.tanggal} - {self.deskripsi}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            # Jaga salinan tanggal di Jurnal tetap sama dengan transaksinya
+            self.jurnal_set.exclude(tanggal=self.tanggal).update(tanggal=self.tanggal)
+
 class Jurnal(models.Model):
     transaksi = models.ForeignKey(Transaksi, on_delete=models.CASCADE)
     akun = models.ForeignKey(Akun, on_delete=models.CASCADE)
     debit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     kredit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Denormalisasi dari akun.user dan transaksi.tanggal (diisi otomatis di save())
+    # supaya filter laporan tidak perlu join tiga tabel
+    user = models.ForeignKey(User, on_delete=models.CASCADE, editable=False)
+    tanggal = models.DateField(editable=False)
+
+    class Meta:
+        indexes = [
+            # Filter utama laporan: jurnal milik user dalam rentang tanggal, urut per transaksi
+            models.Index(fields=['user', 'tanggal', 'transaksi'], name='jurnal_user_tgl_trx_idx'),
+            # Buku besar / saldo per akun, diurutkan per transaksi
+            models.Index(fields=['akun', 'transaksi'], name='jurnal_akun_trx_idx'),
+        ]
 
     def __str__(self):
         return f"{self.transaksi} | {self.akun} | D: {self.debit} K: {self.kredit}"
+
+    def save(self, *args, **kwargs):
+        self.user_id = self.akun.user_id
+        self.tanggal = self.transaksi.tanggal
+        super().save(*args, **kwargs)
+
+class SaldoAkun(models.Model):
+    """Saldo debit/kredit per akun per bulan, diperbarui setiap kali Jurnal berubah."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    akun = models.ForeignKey(Akun, on_delete=models.CASCADE)
+    periode = models.DateField()  # tanggal 1 pada bulan bersangkutan
+    debit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    kredit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('akun', 'periode')
+        indexes = [
+            models.Index(fields=['user', 'periode'], name='saldoakun_user_periode_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.akun} | {self.periode:%m/%Y} | D: {self.debit} K: {self.kredit}"
+
+class SaldoPenutupan(models.Model):
+    """Snapshot saldo kumulatif per akun pada akhir periode (tutup buku)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    akun = models.ForeignKey(Akun, on_delete=models.CASCADE)
+    tanggal = models.DateField()  # akhir periode, inklusif
+    debit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    kredit = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    dibuat = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('akun', 'tanggal')
+        indexes = [
+            models.Index(fields=['user', 'tanggal'], name='saldopenutupan_user_tgl_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.akun} | s/d {self.tanggal} | D: {self.debit} K: {self.kredit}"
+
+class LedgerVersion(models.Model):
+    """Nomor versi buku besar per user; naik setiap kali Akun/Transaksi/Jurnal user berubah."""
+    # Tanpa constraint DB: signal post_delete saat user dihapus (cascade) bisa
+    # menaikkan versi setelah baris ini ikut terkumpul untuk dihapus
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, db_constraint=False)
+    versi = models.PositiveBigIntegerField(default=0)
+    # Naik hanya saat Akun user berubah; kunci cache indeks akun (keuangan.akun_index)
+    versi_akun = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user.username} | v{self.versi}"
+
+def export_storage():
+    # Di luar MEDIA_ROOT (disajikan tanpa login saat DEBUG); file hanya bisa diunduh
+    # lewat view export_download yang memeriksa pemilik job
+    return FileSystemStorage(location=settings.EXPORT_ROOT)
+
+
+class ExportJob(models.Model):
+    """Antrian ekspor PDF/Excel yang dikerjakan worker `proses_export` di luar request."""
+    STATUS_ANTRI = 'antri'
+    STATUS_PROSES = 'proses'
+    STATUS_SELESAI = 'selesai'
+    STATUS_GAGAL = 'gagal'
+    STATUS_CHOICES = [
+        (STATUS_ANTRI, 'Antri'),
+        (STATUS_PROSES, 'Diproses'),
+        (STATUS_SELESAI, 'Selesai'),
+        (STATUS_GAGAL, 'Gagal'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    jenis = models.CharField(max_length=50)  # nama ekspor, mis. jurnal_umum_pdf
+    params = models.JSONField(default=dict, blank=True)  # filter query string
+    kunci = models.CharField(max_length=64)  # hash jenis + params untuk deduplikasi
+    versi = models.PositiveBigIntegerField(default=0)  # versi buku besar saat diminta
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_ANTRI)
+    file = models.FileField(upload_to='%Y/%m/', storage=export_storage, blank=True)
+    nama_file = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    dibuat = models.DateTimeField(auto_now_add=True)
+    mulai = models.DateTimeField(null=True, blank=True)
+    selesai = models.DateTimeField(null=True, blank=True)
+    kedaluwarsa = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Worker mengambil job antri tertua
+            models.Index(fields=['status', 'dibuat'], name='exportjob_status_dibuat_idx'),
+            models.Index(fields=['user', 'kunci', 'versi'], name='exportjob_user_kunci_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} | {self.jenis} | {self.status}"
@@ -0,0 +1,86 @@
+from datetime import date
+
+from django.db.models import Q
+
+from .utils import parse_date_flexible
+
+PAGE_SIZES = (25, 50, 100, 200)
+DEFAULT_PAGE_SIZE = 50
+
+
+def page_size(request):
+    """Ukuran halaman dari ``?per_page=``, dibatasi ke salah satu PAGE_SIZES."""
+    try:
+        size = int(request.GET.get('per_page') or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+    return size if size in PAGE_SIZES else DEFAULT_PAGE_SIZE
+
+
+def encode_cursor(values):
+    return ','.join(v.isoformat() if isinstance(v, date) else str(v) for v in values)
+
+
+def decode_cursor(text, types):
+    """Pecah cursor ``a,b,c`` sesuai ``types`` (``date`` atau ``int``); None jika tidak valid."""
+    if not text:
+        return None
+    parts = text.split(',')
+    if len(parts) != len(types):
+        return None
+    values = []
+    for part, tipe in zip(parts, types):
+        if tipe is date:
+            value = parse_date_flexible(part)
+            if value is None:
+                return None
+        else:
+            try:
+                value = int(part)
+            except ValueError:
+                return None
+        values.append(value)
+    return tuple(values)
+
+
+def keyset_q(fields, values, arah='>'):
+    """Kondisi ``(fields) > (values)`` (atau ``<``) secara leksikografis sebagai Q."""
+    lookup = 'gt' if arah == '>' else 'lt'
+    q = Q()
+    for i, field in enumerate(fields):
+        sama = {f: v for f, v in zip(fields[:i], values[:i])}
+        q |= Q(**sama, **{f'{field}__{lookup}': values[i]})
+    return q
+
+
+def keyset_page(qs, fields, after=None, before=None, size=DEFAULT_PAGE_SIZE):
+    """Satu halaman ``qs`` berurutan menaik pada ``fields`` mulai setelah/sebelum cursor.
+
+    Hanya mengambil ``size + 1`` baris di sekitar cursor, jadi halaman ke-N sama
+    murahnya dengan halaman pertama. Mengembalikan ``(rows, has_prev, has_next)``.
+    """
+    if before is not None:
+        rows = list(qs.filter(keyset_q(fields, before, '<')).order_by(*[f'-{f}' for f in fields])[:size + 1])
+        has_prev = len(rows) > size
+        return rows[:size][::-1], has_prev, True
+    if after is not None:
+        qs = qs.filter(keyset_q(fields, after, '>'))
+    rows = list(qs.order_by(*fields)[:size + 1])
+    return rows[:size], after is not None, len(rows) > size
+
+
+def page_links(request, first_key, last_key, has_prev, has_next):
+    """Query string untuk navigasi halaman, mempertahankan filter lain di URL."""
+    def link(**cursor):
+        params = request.GET.copy()
+        for key in ('after', 'before', 'format'):
+            params.pop(key, None)
+        params.update(cursor)
+        return '?' + params.urlencode() if params else '?'
+
+    return {
+        'first_url': link() if has_prev else None,
+        'prev_url': link(before=encode_cursor(first_key)) if has_prev and first_key else None,
+        'next_url': link(after=encode_cursor(last_key)) if has_next and last_key else None,
+        'page_sizes': PAGE_SIZES,
+    }
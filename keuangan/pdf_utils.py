@@ -1,11 +1,13 @@
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
 from django.http import HttpResponse
+from copy import copy
 from datetime import datetime
+from functools import lru_cache
 import io
 
 def create_pdf_response(filename):
@@ -23,181 +25,322 @@ def get_company_header():
         'email': 'Email: info@akuntansi.com'
     }
 
+class PdfContext:
+    """Style, table style dan flowable kop perusahaan yang dipakai semua export PDF.
+
+    Dibangun sekali per proses lewat ``pdf_context()``. ParagraphStyle dan
+    TableStyle hanya dibaca saat render sehingga aman dipakai bersama; flowable
+    kop disalin per dokumen karena Paragraph menyimpan hasil wrap di objeknya.
+    """
+
+    def __init__(self):
+        self.styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=18,
+            textColor=colors.darkblue,
+            alignment=TA_CENTER,
+            spaceAfter=12
+        )
+        self.subtitle_style = ParagraphStyle(
+            'CustomSubtitle',
+            parent=self.styles['Normal'],
+            fontSize=12,
+            alignment=TA_CENTER,
+            spaceAfter=6
+        )
+        self.header_style = ParagraphStyle(
+            'CustomHeader',
+            parent=self.styles['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        self.footer_style = ParagraphStyle(
+            'Footer',
+            parent=self.styles['Normal'],
+            fontSize=8,
+            alignment=TA_RIGHT,
+            topPadding=20
+        )
+
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+        # Dua baris terakhir tabel per halaman (subtotal dan total berjalan)
+        self.summary_style = TableStyle([
+            ('BACKGROUND', (0, -2), (-1, -1), colors.lightgrey),
+            ('FONTNAME', (0, -2), (-1, -1), 'Helvetica-Bold'),
+        ])
+        # Angka pada baris TOTAL neraca saldo
+        self.total_style = TableStyle([
+            ('BACKGROUND', (-2, -1), (-1, -1), colors.lightgrey),
+            ('FONTNAME', (-2, -1), (-1, -1), 'Helvetica-Bold'),
+        ])
+        self.laba_rugi_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.yellow),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+        self.daftar_akun_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4F81BD')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#F7F7F7'), colors.white]),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#D9D9D9')),
+            ('LEFTPADDING', (0, 1), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 1), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ])
+
+        company = get_company_header()
+        self._company_header = [
+            Paragraph(company['name'], self.title_style),
+            Paragraph(company['address'], self.header_style),
+            Paragraph(f"{company['phone']} | {company['email']}", self.header_style),
+            Spacer(1, 0.2*inch),
+        ]
+
+    def company_header(self):
+        return [copy(flowable) for flowable in self._company_header]
+
+    def footer(self, printed_at=None):
+        printed_at = printed_at or datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        return [Spacer(1, 0.5*inch), Paragraph(f"Dicetak pada: {printed_at}", self.footer_style)]
+
+
+@lru_cache(maxsize=None)
+def pdf_context():
+    """PdfContext bersama untuk proses ini (dibuat saat export PDF pertama)."""
+    return PdfContext()
+
 def create_header_style():
     """Create header styles for PDF"""
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.darkblue,
-        alignment=TA_CENTER,
-        spaceAfter=12
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        alignment=TA_CENTER,
-        spaceAfter=6
-    )
-    
-    header_style = ParagraphStyle(
-        'CustomHeader',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_CENTER,
-        spaceAfter=20
-    )
-    
-    return title_style, subtitle_style, header_style
+    ctx = pdf_context()
+    return ctx.title_style, ctx.subtitle_style, ctx.header_style
 
 def add_company_header(story, title, subtitle=None):
     """Add company header to PDF"""
-    title_style, subtitle_style, header_style = create_header_style()
-    company = get_company_header()
-    
-    # Company info
-    story.append(Paragraph(company['name'], title_style))
-    story.append(Paragraph(company['address'], header_style))
-    story.append(Paragraph(f"{company['phone']} | {company['email']}", header_style))
-    story.append(Spacer(1, 0.2*inch))
-    
+    ctx = pdf_context()
+    story.extend(ctx.company_header())
+
     # Report title
-    story.append(Paragraph(title, title_style))
+    story.append(Paragraph(title, ctx.title_style))
     if subtitle:
-        story.append(Paragraph(subtitle, subtitle_style))
+        story.append(Paragraph(subtitle, ctx.subtitle_style))
     story.append(Spacer(1, 0.3*inch))
 
 def create_table_style():
     """Create standard table style"""
-    return TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ])
+    return pdf_context().table_style
+
+def _format_amount(value):
+    return f"{value:,.2f}" if value > 0 else "-"
+
+def _table_height(table, width, height):
+    return table.wrap(width, height)[1]
+
+def build_chunked_table_pdf(title, subtitle, headers, col_widths, rows, amount_cols=(), label_col=0):
+    """Render tabel panjang ke PDF per halaman tanpa menampung semua baris.
+
+    ``rows`` boleh berupa iterator (mis. ``QuerySet.iterator()``); hanya dua
+    potongan seukuran satu halaman yang ada di memori sekaligus. Setiap halaman
+    berisi satu ``Table`` tersendiri dengan baris judul yang diulang, subtotal
+    halaman dan total berjalan, sehingga ReportLab tidak perlu memecah tabel
+    raksasa. Halaman diisi menurut tinggi baris, jadi teks multi-baris tetap
+    muat. Kolom pada ``amount_cols`` berisi angka yang diformat dan
+    dijumlahkan; kolom lain dicetak apa adanya.
+    """
+    from reportlab.pdfgen import canvas as pdf_canvas
+    from reportlab.platypus import Frame
+    from reportlab.platypus.doctemplate import LayoutError
 
-def export_jurnal_pdf(jurnal_data):
-    """Export jurnal umum to PDF"""
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
-    story = []
-    
-    # Add header
-    add_company_header(story, "JURNAL UMUM", f"Per tanggal: {datetime.now().strftime('%d/%m/%Y')}")
-    
-    # Create table data
-    table_data = [['No', 'Tanggal', 'Deskripsi', 'Akun', 'Debet (Rp)', 'Kredit (Rp)']]
-    
-    no = 1
-    total_debet = 0
-    total_kredit = 0
-    
-    for jurnal in jurnal_data:
-        table_data.append([
+    page_width, page_height = A4
+    margin = 0.5*inch
+    c = pdf_canvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+    frame_args = (margin, margin + 0.3*inch, page_width - 2*margin, page_height - 2*margin - 0.3*inch)
+    # Frame memakai padding 6pt di setiap sisi
+    avail_width = frame_args[2] - 12
+    avail_height = frame_args[3] - 12
+
+    ctx = pdf_context()
+    base_style = ctx.table_style
+    printed_at = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+
+    def heading(first_page):
+        if first_page:
+            story = []
+            add_company_header(story, title, subtitle)
+            return story
+        return [Paragraph(f"{title} (lanjutan)", ctx.subtitle_style), Spacer(1, 0.1*inch)]
+
+    def heading_height(flowables):
+        return sum(f.wrap(avail_width, avail_height)[1] + f.getSpaceBefore() + f.getSpaceAfter() for f in flowables)
+
+    # Sel berupa teks biasa dengan font yang sama: tinggi baris = tinggi satu baris
+    # teks + (jumlah baris teks - 1) * tinggi per baris tambahan (deskripsi dari
+    # textarea bisa berisi baris baru). Cukup diukur sekali dengan baris contoh.
+    sample = ['X'] * len(headers)
+    one = Table([headers, sample], colWidths=col_widths, style=base_style)
+    two = Table([headers, sample, sample], colWidths=col_widths, style=base_style)
+    tall = Table([headers, ['X\nX'] * len(headers)], colWidths=col_widths, style=base_style)
+    row_height = _table_height(two, avail_width, avail_height) - _table_height(one, avail_width, avail_height)
+    header_height = _table_height(one, avail_width, avail_height) - row_height
+    line_height = _table_height(tall, avail_width, avail_height) - _table_height(one, avail_width, avail_height)
+
+    def free_height(first_page):
+        # Sisakan tempat untuk subtotal, total berjalan dan satu baris cadangan
+        return avail_height - heading_height(heading(first_page)) - header_height - 3 * row_height
+
+    free = {True: free_height(True), False: free_height(False)}
+    # Baris yang lebih tinggi dari satu halaman kosong dipotong supaya ekspor tidak pernah gagal
+    max_lines = 1 + int((free[True] - row_height) // line_height)
+
+    def text_lines(values):
+        return max(
+            (values[idx].count('\n') + 1 for idx in range(len(values)) if idx not in amount_cols and isinstance(values[idx], str)),
+            default=1,
+        )
+
+    def fit_row(values):
+        if text_lines(values) <= max_lines:
+            return values
+        return tuple(
+            '\n'.join(value.split('\n')[:max_lines - 1] + ['...'])
+            if idx not in amount_cols and isinstance(value, str) else value
+            for idx, value in enumerate(values)
+        )
+
+    def pages():
+        """Bagi ``rows`` per halaman menurut tinggi baris yang terkumpul."""
+        page, used, first_page = [], 0, True
+        for values in rows:
+            values = fit_row(values)
+            height = row_height + (text_lines(values) - 1) * line_height
+            if page and used + height > free[first_page]:
+                yield page
+                page, used, first_page = [], 0, False
+            page.append(values)
+            used += height
+        yield page
+
+    zero = [0] * len(amount_cols)
+    running = list(zero)
+
+    def summary_row(label, totals):
+        row = [''] * len(headers)
+        row[label_col] = label
+        for idx, value in zip(amount_cols, totals):
+            row[idx] = f"{value:,.2f}"
+        return row
+
+    def draw_page(page_no, chunk, last):
+        page_totals = list(zero)
+        data = [headers]
+        for values in chunk:
+            cells = list(values)
+            for n, idx in enumerate(amount_cols):
+                page_totals[n] += values[idx]
+                cells[idx] = _format_amount(values[idx])
+            data.append(cells)
+        for n in range(len(running)):
+            running[n] += page_totals[n]
+        data.append(summary_row('Subtotal halaman', page_totals))
+        data.append(summary_row('TOTAL' if last else 'Total s/d halaman ini', running))
+
+        table = Table(data, colWidths=col_widths)
+        table.setStyle(base_style)
+        table.setStyle(ctx.summary_style)
+
+        flowables = heading(page_no == 1) + [table]
+        Frame(*frame_args).addFromList(flowables, c)
+        if flowables:
+            # addFromList meninggalkan flowable yang tidak muat; jangan sampai baris hilang diam-diam
+            raise LayoutError(f"Tabel halaman {page_no} tidak muat dalam satu halaman")
+        c.setFont('Helvetica', 8)
+        c.drawString(margin, margin, f"Dicetak pada: {printed_at}")
+        c.drawRightString(page_width - margin, margin, f"Halaman {page_no}")
+        c.showPage()
+
+    page_iter = pages()
+    chunk = next(page_iter)
+    page_no = 1
+    # Halaman berikutnya dibaca dulu supaya halaman terakhir tahu ia terakhir
+    for next_chunk in page_iter:
+        draw_page(page_no, chunk, last=False)
+        chunk = next_chunk
+        page_no += 1
+    draw_page(page_no, chunk, last=True)
+
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+def export_jurnal_pdf(jurnal_data):
+    """Export jurnal umum to PDF (jurnal_data boleh berupa iterator queryset)"""
+    rows = (
+        (
             str(no),
             jurnal.transaksi.tanggal.strftime('%d/%m/%Y'),
             jurnal.transaksi.deskripsi,
             f"{jurnal.akun.kode} - {jurnal.akun.nama}",
-            f"{jurnal.debit:,.2f}" if jurnal.debit > 0 else "-",
-            f"{jurnal.kredit:,.2f}" if jurnal.kredit > 0 else "-"
-        ])
-        total_debet += jurnal.debit
-        total_kredit += jurnal.kredit
-        no += 1
-    
-    # Add totals
-    table_data.append(['', '', '', 'TOTAL', f"{total_debet:,.2f}", f"{total_kredit:,.2f}"])
-    
-    # Create table
-    table = Table(table_data, colWidths=[0.5*inch, 1*inch, 2*inch, 2*inch, 1.2*inch, 1.2*inch])
-    table.setStyle(create_table_style())
-    
-    # Add total row styling
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (-3, -1), (-1, -1), colors.lightgrey),
-        ('FONTNAME', (-3, -1), (-1, -1), 'Helvetica-Bold'),
-    ]))
-    
-    story.append(table)
-    
-    # Add footer
-    styles = getSampleStyleSheet()
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_RIGHT,
-        topPadding=20
+            jurnal.debit,
+            jurnal.kredit,
+        )
+        for no, jurnal in enumerate(jurnal_data, start=1)
+    )
+    return build_chunked_table_pdf(
+        "JURNAL UMUM",
+        f"Per tanggal: {datetime.now().strftime('%d/%m/%Y')}",
+        ['No', 'Tanggal', 'Deskripsi', 'Akun', 'Debet (Rp)', 'Kredit (Rp)'],
+        [0.5*inch, 1*inch, 2*inch, 2*inch, 1.2*inch, 1.2*inch],
+        rows,
+        amount_cols=(4, 5),
+        label_col=3,
     )
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(f"Dicetak pada: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", footer_style))
-    
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
 
 def export_buku_besar_pdf(buku_besar_data, akun_name="Semua Akun"):
-    """Export buku besar to PDF"""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
-    story = []
-    
-    # Add header
-    add_company_header(story, "BUKU BESAR", f"Akun: {akun_name} | Per tanggal: {datetime.now().strftime('%d/%m/%Y')}")
-    
-    # Create table data
-    table_data = [['No', 'Tanggal', 'Deskripsi', 'Debet (Rp)', 'Kredit (Rp)', 'Saldo (Rp)']]
-    
-    no = 1
-    saldo = 0
-    
-    for jurnal in buku_besar_data:
-        saldo += jurnal.debit - jurnal.kredit
-        table_data.append([
-            str(no),
-            jurnal.transaksi.tanggal.strftime('%d/%m/%Y'),
-            jurnal.transaksi.deskripsi,
-            f"{jurnal.debit:,.2f}" if jurnal.debit > 0 else "-",
-            f"{jurnal.kredit:,.2f}" if jurnal.kredit > 0 else "-",
-            f"{saldo:,.2f}"
-        ])
-        no += 1
-    
-    # Create table
-    table = Table(table_data, colWidths=[0.5*inch, 1*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-    table.setStyle(create_table_style())
-    
-    story.append(table)
-    
-    # Add footer
-    styles = getSampleStyleSheet()
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_RIGHT,
-        topPadding=20
+    """Export buku besar to PDF (buku_besar_data: iterable jurnal dengan atribut ``saldo_berjalan``)"""
+    def rows():
+        for no, jurnal in enumerate(buku_besar_data, start=1):
+            yield (
+                str(no),
+                jurnal.transaksi.tanggal.strftime('%d/%m/%Y'),
+                jurnal.transaksi.deskripsi,
+                jurnal.debit,
+                jurnal.kredit,
+                f"{jurnal.saldo_berjalan:,.2f}",
+            )
+
+    return build_chunked_table_pdf(
+        "BUKU BESAR",
+        f"Akun: {akun_name} | Per tanggal: {datetime.now().strftime('%d/%m/%Y')}",
+        ['No', 'Tanggal', 'Deskripsi', 'Debet (Rp)', 'Kredit (Rp)', 'Saldo (Rp)'],
+        [0.5*inch, 1*inch, 2.5*inch, 1.2*inch, 1.2*inch, 1.2*inch],
+        rows(),
+        amount_cols=(3, 4),
+        label_col=2,
     )
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(f"Dicetak pada: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", footer_style))
-    
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
 
 def export_neraca_saldo_pdf(neraca_data):
-    """Export neraca saldo to PDF"""
+    """Export neraca saldo to PDF (neraca_data: entri ``saldo`` dari laporan neraca_saldo)"""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
     story = []
@@ -213,13 +356,13 @@ def export_neraca_saldo_pdf(neraca_data):
     total_kredit = 0
     
     for item in neraca_data:
-        debet = item['total_debet'] if item['total_debet'] > item['total_kredit'] else 0
-        kredit = item['total_kredit'] if item['total_kredit'] > item['total_debet'] else 0
+        debet = item['debit']
+        kredit = item['kredit']
         
         table_data.append([
             str(no),
-            item['akun__kode'],
-            item['akun__nama'],
+            item['akun'].kode,
+            item['akun'].nama,
             f"{debet:,.2f}" if debet > 0 else "-",
             f"{kredit:,.2f}" if kredit > 0 else "-"
         ])
@@ -232,34 +375,23 @@ def export_neraca_saldo_pdf(neraca_data):
     
     # Create table
     table = Table(table_data, colWidths=[0.5*inch, 1*inch, 3*inch, 1.5*inch, 1.5*inch])
-    table.setStyle(create_table_style())
+    ctx = pdf_context()
+    table.setStyle(ctx.table_style)
     
     # Add total row styling
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (-2, -1), (-1, -1), colors.lightgrey),
-        ('FONTNAME', (-2, -1), (-1, -1), 'Helvetica-Bold'),
-    ]))
+    table.setStyle(ctx.total_style)
     
     story.append(table)
     
     # Add footer
-    styles = getSampleStyleSheet()
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_RIGHT,
-        topPadding=20
-    )
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(f"Dicetak pada: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", footer_style))
+    story.extend(ctx.footer())
     
     doc.build(story)
     buffer.seek(0)
     return buffer
 
 def export_laporan_keuangan_pdf(laporan_data):
-    """Export laporan keuangan lengkap: Neraca, Laba Rugi, Arus Kas, Analisis"""
+    """Export laporan keuangan lengkap: Neraca, Laba Rugi, Arus Kas, Analisis (dari laporan laporan_keuangan)"""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.5*inch)
     story = []
@@ -267,27 +399,28 @@ def export_laporan_keuangan_pdf(laporan_data):
     # Add header
     add_company_header(story, "LAPORAN KEUANGAN", f"Per tanggal: {datetime.now().strftime('%d/%m/%Y')}")
     
-    styles = getSampleStyleSheet()
+    ctx = pdf_context()
+    styles = ctx.styles
     
     # Neraca (Balance Sheet)
     story.append(Paragraph("NERACA", styles['Heading2']))
     story.append(Spacer(1, 0.1*inch))
     bs_left = [['Aktiva', 'Jumlah (Rp)']]
     for item in laporan_data.get('aktiva', []):
-        bs_left.append([item['akun__nama'], f"{item['saldo']:,.2f}"])
+        bs_left.append([item['akun'].nama, f"{item['saldo']:,.2f}"])
     bs_left.append(['Total Aktiva', f"{laporan_data.get('total_aktiva', 0):,.2f}"])
 
     bs_right = [['Kewajiban & Modal', 'Jumlah (Rp)']]
     for item in laporan_data.get('kewajiban', []):
-        bs_right.append([item['akun__nama'], f"{item['saldo']:,.2f}"])
+        bs_right.append([item['akun'].nama, f"{item['saldo']:,.2f}"])
     for item in laporan_data.get('modal', []):
-        bs_right.append([item['akun__nama'], f"{item['saldo']:,.2f}"])
+        bs_right.append([item['akun'].nama, f"{item['saldo']:,.2f}"])
     bs_right.append(['Total Kewajiban + Modal', f"{laporan_data.get('equation_right', 0):,.2f}"])
 
     t_left = Table(bs_left, colWidths=[3.5*inch, 1.5*inch])
     t_right = Table(bs_right, colWidths=[3.5*inch, 1.5*inch])
-    t_left.setStyle(create_table_style())
-    t_right.setStyle(create_table_style())
+    t_left.setStyle(ctx.table_style)
+    t_right.setStyle(ctx.table_style)
     story.append(t_left)
     story.append(Spacer(1, 0.1*inch))
     story.append(t_right)
@@ -301,13 +434,13 @@ def export_laporan_keuangan_pdf(laporan_data):
     total_pendapatan = 0
     
     for item in laporan_data['pendapatan']:
-        pendapatan_data.append([item['akun__nama'], f"{item['total']:,.2f}"])
-        total_pendapatan += item['total']
+        pendapatan_data.append([item['akun'].nama, f"{item['saldo']:,.2f}"])
+        total_pendapatan += item['saldo']
     
     pendapatan_data.append(['Total Pendapatan', f"{total_pendapatan:,.2f}"])
     
     pendapatan_table = Table(pendapatan_data, colWidths=[4*inch, 2*inch])
-    pendapatan_table.setStyle(create_table_style())
+    pendapatan_table.setStyle(ctx.table_style)
     story.append(pendapatan_table)
     story.append(Spacer(1, 0.2*inch))
     
@@ -316,13 +449,13 @@ def export_laporan_keuangan_pdf(laporan_data):
     total_beban = 0
     
     for item in laporan_data['beban']:
-        beban_data.append([item['akun__nama'], f"{item['total']:,.2f}"])
-        total_beban += item['total']
+        beban_data.append([item['akun'].nama, f"{item['saldo']:,.2f}"])
+        total_beban += item['saldo']
     
     beban_data.append(['Total Beban', f"{total_beban:,.2f}"])
     
     beban_table = Table(beban_data, colWidths=[4*inch, 2*inch])
-    beban_table.setStyle(create_table_style())
+    beban_table.setStyle(ctx.table_style)
     story.append(beban_table)
     story.append(Spacer(1, 0.2*inch))
     
@@ -330,12 +463,7 @@ def export_laporan_keuangan_pdf(laporan_data):
     laba_rugi = total_pendapatan - total_beban
     laba_rugi_data = [['Laba/Rugi Bersih', f"{laba_rugi:,.2f}"]]
     laba_rugi_table = Table(laba_rugi_data, colWidths=[4*inch, 2*inch])
-    laba_rugi_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.yellow),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    laba_rugi_table.setStyle(ctx.laba_rugi_style)
     story.append(laba_rugi_table)
     story.append(Spacer(1, 0.2*inch))
 
@@ -355,7 +483,7 @@ def export_laporan_keuangan_pdf(laporan_data):
 
     for section in (ak_operasional, ak_investasi, ak_pendanaan, ak_total):
         t = Table(section, colWidths=[4*inch, 2*inch])
-        t.setStyle(create_table_style())
+        t.setStyle(ctx.table_style)
         story.append(t)
         story.append(Spacer(1, 0.1*inch))
 
@@ -365,20 +493,33 @@ def export_laporan_keuangan_pdf(laporan_data):
     analysis = [["Profit Margin (%)", f"{laporan_data.get('profit_margin', 0):,.2f}"],
                 ["Current Ratio", f"{laporan_data.get('current_ratio', 0) if laporan_data.get('current_ratio') is not None else '-'}"]]
     t_analysis = Table(analysis, colWidths=[4*inch, 2*inch])
-    t_analysis.setStyle(create_table_style())
+    t_analysis.setStyle(ctx.table_style)
     story.append(t_analysis)
     
     # Add footer
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_RIGHT,
-        topPadding=20
-    )
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(f"Dicetak pada: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", footer_style))
+    story.extend(ctx.footer())
     
     doc.build(story)
     buffer.seek(0)
     return buffer
+
+def export_daftar_akun_pdf(akun_list):
+    """Export daftar akun ke PDF: tabel kode/nama/tipe dengan header biru dan baris berselang"""
+    ctx = pdf_context()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=36, rightMargin=36, topMargin=48, bottomMargin=36)
+    elements = [Paragraph("Daftar Akun Pengguna", ctx.styles['Title']), Spacer(1, 12)]
+
+    # Data tabel
+    data = [["Kode", "Nama", "Tipe"]]
+    for akun in akun_list:
+        data.append([str(akun.kode), akun.nama, akun.tipe])
+
+    # A4 width ~ 595 pt; margins 36+36 => usable ~523 pt. Bagi 3 kolom.
+    table = Table(data, colWidths=[100, 280, 143], hAlign='LEFT')
+    table.setStyle(ctx.daftar_akun_style)
+    elements.append(table)
+
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,130 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import LedgerVersion
+
+REPORTS = ('dashboard', 'buku_besar', 'neraca_saldo', 'laporan_keuangan')
+KEY_PREFIX = 'laporan'
+
+
+def ledger_version(user_id):
+    """Versi buku besar user saat ini (0 jika belum pernah berubah)."""
+    return LedgerVersion.objects.filter(user_id=user_id).values_list('versi', flat=True).first() or 0
+
+
+async def aledger_version(user_id):
+    return await LedgerVersion.objects.filter(user_id=user_id).values_list('versi', flat=True).afirst() or 0
+
+
+def bump_ledger_version(user_id, akun=False):
+    """Naikkan versi buku besar user sehingga semua laporan tercache menjadi usang.
+
+    ``akun`` ikut menaikkan versi daftar akun (indeks akun tercache). Dipanggil
+    oleh signal Akun/Transaksi/Jurnal; operasi massal yang tidak memicu signal
+    (bulk_create, queryset.update/delete) wajib memanggilnya sendiri.
+    """
+    if user_id is None:
+        return
+    naik = {'versi': F('versi') + 1}
+    if akun:
+        naik['versi_akun'] = F('versi_akun') + 1
+    if LedgerVersion.objects.filter(user_id=user_id).update(**naik):
+        return
+    try:
+        with transaction.atomic():
+            LedgerVersion.objects.create(user_id=user_id, versi=1, versi_akun=int(akun))
+    except IntegrityError:
+        # Dibuat bersamaan oleh request lain
+        LedgerVersion.objects.filter(user_id=user_id).update(**naik)
+
+
+def _cache_key(user_id, report, params, versi):
+    raw = json.dumps(params or {}, sort_keys=True, default=str)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{user_id}:{report}:v{versi}:{digest}"
+
+
+def _count(report, outcome):
+    key = f"{KEY_PREFIX}:stat:{report}:{outcome}"
+    # add() tidak menimpa counter yang sudah ada; incr() atomik di backend bersama
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+async def _acount(report, outcome):
+    key = f"{KEY_PREFIX}:stat:{report}:{outcome}"
+    await cache.aadd(key, 0, timeout=None)
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aset(key, 1, timeout=None)
+
+
+def cached_report(user, report, params, compute):
+    """Ambil hasil laporan dari cache atau hitung dengan ``compute()``.
+
+    Kunci cache terdiri dari (user, nama laporan, parameter filter, versi buku
+    besar), jadi setiap perubahan data user otomatis memakai kunci baru tanpa
+    perlu menghapus entri lama (entri lama kedaluwarsa sendiri).
+    """
+    key = _cache_key(user.pk, report, params, ledger_version(user.pk))
+    result = cache.get(key)
+    if result is not None:
+        _count(report, 'hit')
+        return result
+    _count(report, 'miss')
+    result = compute()
+    cache.set(key, result, timeout=getattr(settings, 'REPORT_CACHE_TIMEOUT', 3600))
+    return result
+
+
+async def acached_report(user, report, params, compute):
+    """Versi async ``cached_report``; ``compute`` adalah fungsi async tanpa argumen."""
+    key = _cache_key(user.pk, report, params, await aledger_version(user.pk))
+    result = await cache.aget(key)
+    if result is not None:
+        await _acount(report, 'hit')
+        return result
+    await _acount(report, 'miss')
+    result = await compute()
+    await cache.aset(key, result, timeout=getattr(settings, 'REPORT_CACHE_TIMEOUT', 3600))
+    return result
+
+
+def report_etag(user_id, report, params):
+    """ETag kuat untuk hasil laporan, diturunkan dari kunci cache-nya.
+
+    Berubah tepat ketika versi buku besar atau parameternya berubah, jadi bisa
+    dicek tanpa menghitung laporan (cukup satu query versi).
+    """
+    key = _cache_key(user_id, report, params, ledger_version(user_id))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+async def areport_etag(user_id, report, params):
+    key = _cache_key(user_id, report, params, await aledger_version(user_id))
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def cache_stats():
+    """Counter hit/miss per laporan beserta hit ratio."""
+    stats = {}
+    keys = [f"{KEY_PREFIX}:stat:{report}:{outcome}" for report in REPORTS for outcome in ('hit', 'miss')]
+    values = cache.get_many(keys)
+    for report in REPORTS:
+        hit = values.get(f"{KEY_PREFIX}:stat:{report}:hit", 0)
+        miss = values.get(f"{KEY_PREFIX}:stat:{report}:miss", 0)
+        stats[report] = {
+            'hit': hit,
+            'miss': miss,
+            'hit_ratio': round(hit / (hit + miss), 4) if hit + miss else None,
+        }
+    return stats
@@ -0,0 +1,35 @@
+"""Layanan laporan: satu implementasi per laporan.
+
+Setiap laporan menerima parameter filter dan mengembalikan struktur data biasa
+(dict/list) yang dipakai bersama oleh renderer HTML, PDF, Excel, CSV dan JSON.
+Renderer mengambil hasilnya lewat ``get_report`` supaya cache dan optimasi query
+hanya ada di satu tempat.
+"""
+from asgiref.sync import sync_to_async
+
+from ..report_cache import acached_report, cached_report
+from .buku_besar import buku_besar, filter_buku_besar, iter_buku_besar, saldo_awal_periode, with_mutasi_berjalan
+from .laporan_keuangan import laporan_keuangan
+from .neraca_saldo import neraca_saldo
+from .totals import ASSET_TYPES, DEBIT_NORMAL_TYPES, LIABILITY_TYPES, account_totals
+
+REPORTS = {
+    'buku_besar': buku_besar,
+    'neraca_saldo': neraca_saldo,
+    'laporan_keuangan': laporan_keuangan,
+}
+
+
+def get_report(user, nama, **params):
+    """Hasil laporan ``nama`` untuk ``user`` dengan filter ``params``, lewat cache laporan.
+
+    Renderer berbeda dengan filter yang sama (mis. halaman HTML lalu ekspor PDF)
+    memakai satu hasil tercache yang sama.
+    """
+    return cached_report(user, nama, params, lambda: REPORTS[nama](user, **params))
+
+
+
+async def aget_report(user, nama, **params):
+    """Versi async ``get_report``: cache dicek secara async, laporan dihitung di thread."""
+    return await acached_report(user, nama, params, sync_to_async(lambda: REPORTS[nama](user, **params)))
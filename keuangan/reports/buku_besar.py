@@ -0,0 +1,182 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import DecimalField, F, Sum, Window
+from django.db.models.expressions import RowRange
+
+from ..csv_export import CSV_CHUNK_SIZE
+from ..models import Akun, Jurnal
+from ..pagination import DEFAULT_PAGE_SIZE, keyset_page, keyset_q
+from ..saldo import SEN, saldo_kumulatif
+
+
+def filter_buku_besar(user, akun_id=None, sd=None, ed=None, base_qs=None):
+    """Jurnal buku besar milik user sesuai filter; mengembalikan ``(akun_filter, queryset)``.
+
+    Dipakai bersama oleh halaman HTML dan semua ekspor supaya filternya identik.
+    """
+    # Base queryset: hanya jurnal milik akun user yang login
+    if base_qs is None:
+        base_qs = Jurnal.objects.all()
+    base_qs = base_qs.filter(user=user)
+
+    # Terapkan filter akun jika dipilih
+    if akun_id:
+        try:
+            akun_filter = Akun.objects.get(id=akun_id, user=user)
+            base_qs = base_qs.filter(akun=akun_filter)
+        except (Akun.DoesNotExist, ValueError):
+            akun_filter = None
+    else:
+        akun_filter = None
+
+    if sd:
+        base_qs = base_qs.filter(tanggal__gte=sd)
+    if ed:
+        base_qs = base_qs.filter(tanggal__lte=ed)
+
+    # Urutkan secara default
+    if akun_filter:
+        qs = base_qs.order_by('tanggal', 'transaksi_id')
+    else:
+        qs = base_qs.order_by('akun__kode', 'tanggal', 'transaksi_id')
+    return akun_filter, qs
+
+
+def with_mutasi_berjalan(qs):
+    """Anotasi ``mutasi_berjalan``: jumlah (debit - kredit) kumulatif per akun.
+
+    Dihitung database dengan window function berurutan (tanggal, transaksi, id),
+    jadi hanya mencakup baris yang lolos filter ``qs``; saldo berjalan adalah
+    saldo sebelum baris pertama ditambah nilai ini. SQLite menjumlahkan desimal
+    sebagai float, jadi pemakai membulatkannya ke sen.
+    """
+    return qs.annotate(mutasi_berjalan=Window(
+        # Presisi lebih lebar dari kolom debit/kredit: jumlah kumulatif bisa melampaui 12 digit
+        Sum(F('debit') - F('kredit'), output_field=DecimalField(max_digits=20, decimal_places=2)),
+        partition_by=[F('akun_id')],
+        order_by=[F('tanggal').asc(), F('transaksi_id').asc(), F('id').asc()],
+        frame=RowRange(start=None, end=0),
+    ))
+
+
+def saldo_awal_periode(user, sd=None):
+    """Saldo (debit - kredit) per akun sebelum ``sd``; kosong jika tanpa tanggal awal."""
+    if not sd:
+        return {}
+    return {
+        akun_id: debit - kredit
+        for akun_id, (debit, kredit) in saldo_kumulatif(user, sd - timedelta(days=1)).items()
+    }
+
+
+def iter_buku_besar(user, akun_id=None, sd=None, ed=None):
+    """Semua baris buku besar untuk ekspor, masing-masing dengan ``saldo_berjalan``."""
+    _, qs = filter_buku_besar(user, akun_id, sd, ed, Jurnal.objects.select_related('transaksi', 'akun'))
+    saldo_awal = saldo_awal_periode(user, sd)
+    for j in with_mutasi_berjalan(qs).iterator(chunk_size=CSV_CHUNK_SIZE):
+        j.saldo_berjalan = saldo_awal.get(j.akun_id, 0) + j.mutasi_berjalan.quantize(SEN)
+        yield j
+
+
+def buku_besar(user, akun_id=None, sd=None, ed=None, after=None, before=None, size=DEFAULT_PAGE_SIZE):
+    """Satu halaman buku besar.
+
+    Baris jurnal dipaginasi dengan keyset pada (tanggal, transaksi, id), diawali
+    kode akun jika semua akun ditampilkan; cursor berbentuk
+    ``(akun_id, tanggal, transaksi_id, id)``. Total per akun diambil dari
+    SaldoAkun dan saldo awal tiap blok dihitung dengan agregat, jadi halaman
+    ke-N sama murahnya dengan halaman pertama.
+    """
+    # Daftar akun milik user untuk dropdown
+    akun_list = list(Akun.objects.filter(user=user).order_by('kode'))
+    akun_by_id = {akun.id: akun for akun in akun_list}
+
+    akun_filter, qs = filter_buku_besar(user, akun_id, sd, ed, Jurnal.objects.select_related('transaksi', 'akun'))
+
+    if akun_filter:
+        fields = ('tanggal', 'transaksi_id', 'id')
+    else:
+        fields = ('akun__kode', 'tanggal', 'transaksi_id', 'id')
+
+    def keyset_values(cursor):
+        # Cursor dari akun lain (atau akun yang sudah dihapus) diabaikan
+        if cursor is None or cursor[0] not in akun_by_id or (akun_filter and cursor[0] != akun_filter.id):
+            return None
+        return cursor[1:] if akun_filter else (akun_by_id[cursor[0]].kode,) + cursor[1:]
+
+    rows, has_prev, has_next = keyset_page(qs, fields, keyset_values(after), keyset_values(before), size)
+    # Window hanya atas baris halaman ini (bukan semua baris setelah cursor) supaya
+    # biayanya tetap sebanding ukuran halaman; hasilnya mutasi kumulatif sejak baris
+    # pertama tiap blok, ditambah saldo awal blok di bawah
+    mutasi_halaman = dict(
+        with_mutasi_berjalan(Jurnal.objects.filter(id__in=[j.id for j in rows])).values_list('id', 'mutasi_berjalan')
+    ) if rows else {}
+
+    # Mutasi periode per akun dan saldo sebelum periode, dari SaldoAkun/snapshot
+    sampai_akhir = saldo_kumulatif(user, ed)
+    sebelum_periode = saldo_kumulatif(user, sd - timedelta(days=1)) if sd else {}
+    nol = (Decimal('0'), Decimal('0'))
+
+    def mutasi(akun_id_):
+        debit, kredit = sampai_akhir.get(akun_id_, nol)
+        debit_awal, kredit_awal = sebelum_periode.get(akun_id_, nol)
+        return debit - debit_awal, kredit - kredit_awal
+
+    # Kelompokkan baris halaman ini per akun (baris sudah berurutan per akun)
+    data = []
+    for j in rows:
+        if not data or data[-1]['akun'].id != j.akun_id:
+            debit_awal, kredit_awal = sebelum_periode.get(j.akun_id, nol)
+            total_debit, total_kredit = mutasi(j.akun_id)
+            data.append({
+                'akun': akun_by_id[j.akun_id],
+                'jurnal': [],
+                'total_debit': total_debit,
+                'total_kredit': total_kredit,
+                'saldo_awal': debit_awal - kredit_awal,
+                'lanjutan': False,
+                'page_debit': Decimal('0'),
+                'page_kredit': Decimal('0'),
+            })
+        block = data[-1]
+        block['jurnal'].append(j)
+        block['page_debit'] += j.debit
+        block['page_kredit'] += j.kredit
+
+    if data and has_prev:
+        first = data[0]['jurnal'][0]
+        first_values = [first.akun.kode if f == 'akun__kode' else getattr(first, f) for f in fields]
+        if qs.filter(akun_id=first.akun_id).filter(keyset_q(fields, first_values, '<')).exists():
+            # Blok pertama lanjutan dari halaman sebelumnya: saldo awalnya adalah saldo
+            # kumulatif s/d kemarin + baris akun ini di hari yang sama sebelum baris pertama
+            debit, kredit = saldo_kumulatif(user, first.tanggal - timedelta(days=1)).get(first.akun_id, nol)
+            today = (
+                Jurnal.objects.filter(akun_id=first.akun_id, tanggal=first.tanggal)
+                .filter(keyset_q(('transaksi_id', 'id'), (first.transaksi_id, first.id), '<'))
+                .aggregate(d=Sum('debit'), k=Sum('kredit'))
+            )
+            data[0]['saldo_awal'] = debit - kredit + (today['d'] or 0) - (today['k'] or 0)
+            data[0]['lanjutan'] = True
+
+    for block in data:
+        block['saldo_akhir_halaman'] = block['saldo_awal'] + block['page_debit'] - block['page_kredit']
+        for j in block['jurnal']:
+            j.saldo_berjalan = block['saldo_awal'] + mutasi_halaman[j.id].quantize(SEN)
+
+    # Total keseluruhan periode (semua akun, atau akun terpilih saja)
+    akun_ids = [akun_filter.id] if akun_filter else list(akun_by_id)
+    totals = [mutasi(akun_id_) for akun_id_ in akun_ids]
+    first_key = (rows[0].akun_id, rows[0].tanggal, rows[0].transaksi_id, rows[0].id) if rows else None
+    last_key = (rows[-1].akun_id, rows[-1].tanggal, rows[-1].transaksi_id, rows[-1].id) if rows else None
+
+    return {
+        'data': data,
+        'all_akun': akun_list,
+        'total_akun': sum(1 for debit, kredit in totals if debit or kredit),
+        'grand_total_debit': sum((debit for debit, _ in totals), Decimal('0')),
+        'grand_total_kredit': sum((kredit for _, kredit in totals), Decimal('0')),
+        'per_page': size,
+        'paginated': has_prev or has_next,
+        'keys': {'first': first_key, 'last': last_key, 'has_prev': has_prev, 'has_next': has_next},
+    }
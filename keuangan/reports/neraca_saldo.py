@@ -0,0 +1,39 @@
+from ..models import Akun
+from .totals import account_totals
+
+
+def neraca_saldo(user, sd=None, ed=None, jenis=None):
+    """Neraca saldo periode ``sd``..``ed``, opsional hanya akun bertipe ``jenis``.
+
+    ``saldo`` berisi kolom tampilan per akun: selisih debit/kredit ditaruh di
+    sisi yang lebih besar. Total per kelompok diambil dari ``account_totals``
+    sehingga aturan saldo normalnya sama dengan laporan keuangan.
+    """
+    akun_qs = Akun.objects.filter(user=user).order_by('kode')
+    if jenis:
+        akun_qs = akun_qs.filter(tipe=jenis)
+    data = account_totals(user, sd, ed, akun_qs=akun_qs)
+
+    saldo = []
+    for entry in data['saldo']:
+        debit_sum = entry['debit']
+        kredit_sum = entry['kredit']
+        # Display columns: split into debet/kredit balance
+        if debit_sum >= kredit_sum:
+            saldo.append({'akun': entry['akun'], 'debit': debit_sum - kredit_sum, 'kredit': 0})
+        else:
+            saldo.append({'akun': entry['akun'], 'debit': 0, 'kredit': kredit_sum - debit_sum})
+
+    laba_rugi = data['total_pendapatan'] - data['total_beban']
+    return {
+        'saldo': saldo,
+        'total_debit': data['total_debit'],
+        'total_kredit': data['total_kredit'],
+        'total_aktiva': data['total_aktiva'],
+        'total_kewajiban': data['total_kewajiban'],
+        'total_modal': data['total_modal'],
+        'total_pendapatan': data['total_pendapatan'],
+        'total_beban': data['total_beban'],
+        'laba_rugi': laba_rugi,
+        'rhs_total': data['total_kewajiban'] + data['total_modal'] + laba_rugi,
+    }
@@ -0,0 +1,78 @@
+from ..balances import akun_with_balances
+
+# Kelompok tipe akun dan saldo normalnya
+ASSET_TYPES = ['Aset', 'Aktiva', 'Aktiva Lancar', 'Aktiva Tetap', 'Aktiva Lainnya']
+LIABILITY_TYPES = ['Kewajiban', 'Kewajiban Lancar', 'Kewajiban Jangka Panjang']
+DEBIT_NORMAL_TYPES = ASSET_TYPES + ['Beban']
+
+
+def account_totals(user, start_date=None, end_date=None, akun_qs=None):
+    """Saldo per akun dan total per kelompok tipe akun, menghormati saldo normal.
+
+    Satu-satunya tempat aturan pengelompokan saldo; neraca saldo dan laporan
+    keuangan sama-sama dibangun dari hasil fungsi ini.
+    """
+    saldo = []
+    total_debit = 0
+    total_kredit = 0
+
+    # Totals by account type
+    total_aktiva = 0
+    total_kewajiban = 0
+    total_modal = 0
+    total_pendapatan = 0
+    total_beban = 0
+
+    for akun in akun_with_balances(user, start_date, end_date, akun_qs=akun_qs):
+        debit_sum = akun.total_debit
+        kredit_sum = akun.total_kredit
+        saldo_akhir = debit_sum - kredit_sum
+
+        saldo.append({
+            'akun': akun,
+            'debit': debit_sum,
+            'kredit': kredit_sum,
+            'saldo': saldo_akhir,
+        })
+
+        total_debit += debit_sum
+        total_kredit += kredit_sum
+
+        # Route balances to correct totals respecting normal balance
+        if akun.tipe in DEBIT_NORMAL_TYPES:
+            if saldo_akhir >= 0:
+                # debit balance -> goes to left side (aktiva or beban)
+                if akun.tipe == 'Beban':
+                    total_beban += saldo_akhir
+                else:
+                    total_aktiva += saldo_akhir
+            else:
+                # credit balance on a debit-normal account -> count on right side
+                if akun.tipe == 'Beban':
+                    total_pendapatan += abs(saldo_akhir)
+                else:
+                    total_kewajiban += abs(saldo_akhir)
+        else:
+            # credit-normal accounts (Kewajiban, Modal, Pendapatan, tipe lain)
+            if saldo_akhir <= 0:
+                val = abs(saldo_akhir)
+                if akun.tipe == 'Modal':
+                    total_modal += val
+                elif akun.tipe == 'Pendapatan':
+                    total_pendapatan += val
+                else:
+                    total_kewajiban += val
+            else:
+                # unexpected debit balance on credit-normal account -> treat as aktiva
+                total_aktiva += saldo_akhir
+
+    return {
+        'saldo': saldo,
+        'total_debit': total_debit,
+        'total_kredit': total_kredit,
+        'total_aktiva': total_aktiva,
+        'total_kewajiban': total_kewajiban,
+        'total_modal': total_modal,
+        'total_pendapatan': total_pendapatan,
+        'total_beban': total_beban,
+    }
@@ -0,0 +1,234 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Max, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Akun, Jurnal, SaldoAkun, SaldoPenutupan
+from .report_cache import bump_ledger_version
+
+SEN = Decimal('0.01')
+
+
+def periode_of(tanggal):
+    """Bucket bulanan untuk sebuah tanggal (tanggal 1 bulan tersebut)."""
+    return tanggal.replace(day=1)
+
+
+def awal_bulan_berikut(tanggal):
+    return (tanggal.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def akhir_bulan(tanggal):
+    return awal_bulan_berikut(tanggal) - timedelta(days=1)
+
+
+def apply_saldo_delta(user_id, akun_id, tanggal, debit, kredit):
+    """Tambahkan debit/kredit ke bucket SaldoAkun bulan ``tanggal`` dan ke
+    snapshot SaldoPenutupan yang sudah ditutup pada/sesudah ``tanggal``.
+
+    Delta negatif (penghapusan) tidak pernah membuat bucket baru: jika bucket
+    sudah tidak ada, berarti ikut terhapus oleh cascade Akun/User.
+    """
+    if not debit and not kredit:
+        return
+    periode = periode_of(tanggal)
+    updated = SaldoAkun.objects.filter(akun_id=akun_id, periode=periode).update(
+        debit=F('debit') + debit,
+        kredit=F('kredit') + kredit,
+    )
+    apply_snapshot_delta(akun_id, tanggal, debit, kredit)
+    if updated or debit < 0 or kredit < 0:
+        return
+    try:
+        with transaction.atomic():
+            SaldoAkun.objects.create(user_id=user_id, akun_id=akun_id, periode=periode, debit=debit, kredit=kredit)
+    except IntegrityError:
+        # Bucket dibuat oleh request lain di antara UPDATE dan INSERT
+        SaldoAkun.objects.filter(akun_id=akun_id, periode=periode).update(
+            debit=F('debit') + debit,
+            kredit=F('kredit') + kredit,
+        )
+
+
+def apply_snapshot_delta(akun_id, tanggal, debit, kredit):
+    """Geser snapshot SaldoPenutupan akun yang ditutup pada/sesudah ``tanggal`` (entri mundur)."""
+    SaldoPenutupan.objects.filter(akun_id=akun_id, tanggal__gte=tanggal).update(
+        debit=F('debit') + debit,
+        kredit=F('kredit') + kredit,
+    )
+
+
+def expected_saldo(user=None):
+    """Hitung ulang saldo bulanan langsung dari tabel Jurnal.
+
+    Mengembalikan dict ``{(akun_id, periode): (user_id, debit, kredit)}``.
+    """
+    qs = Jurnal.objects.all()
+    if user is not None:
+        qs = qs.filter(user=user)
+    rows = (
+        qs.annotate(periode=TruncMonth('tanggal'))
+        .values('akun_id', 'user_id', 'periode')
+        .annotate(total_debit=Sum('debit'), total_kredit=Sum('kredit'))
+        .order_by()
+    )
+    # SUM di SQLite dihitung sebagai float (mis. 9171091.23999999); bulatkan ke
+    # sen seperti nilai yang tersimpan di SaldoAkun agar perbandingan tidak meleset
+    return {
+        (r['akun_id'], r['periode']): (
+            r['user_id'],
+            (r['total_debit'] or Decimal('0')).quantize(SEN),
+            (r['total_kredit'] or Decimal('0')).quantize(SEN),
+        )
+        for r in rows
+    }
+
+
+def rebuild_saldo(user=None, dry_run=False):
+    """Bandingkan SaldoAkun dengan Jurnal dan perbaiki perbedaannya.
+
+    Mengembalikan dict jumlah bucket yang ``created``, ``updated`` dan ``deleted``
+    (atau yang akan diubah jika ``dry_run``). Bucket kosong (debit dan kredit nol)
+    ikut dibersihkan tetapi tidak dihitung.
+    """
+    expected = expected_saldo(user)
+    current_qs = SaldoAkun.objects.all()
+    if user is not None:
+        current_qs = current_qs.filter(user=user)
+    current = {(s.akun_id, s.periode): s for s in current_qs}
+
+    to_create = []
+    to_update = []
+    for key, (user_id, debit, kredit) in expected.items():
+        row = current.pop(key, None)
+        if row is None:
+            to_create.append(SaldoAkun(user_id=user_id, akun_id=key[0], periode=key[1], debit=debit, kredit=kredit))
+        elif row.debit != debit or row.kredit != kredit or row.user_id != user_id:
+            row.user_id, row.debit, row.kredit = user_id, debit, kredit
+            to_update.append(row)
+    # Bucket yang tersisa tidak punya baris jurnal lagi; yang bernilai nol hanya
+    # sisa penghapusan dan tidak dihitung sebagai selisih
+    to_delete = [row.id for row in current.values()]
+    stale = [row for row in current.values() if row.debit or row.kredit]
+
+    if not dry_run:
+        with transaction.atomic():
+            SaldoAkun.objects.bulk_create(to_create, batch_size=1000)
+            SaldoAkun.objects.bulk_update(to_update, ['user', 'debit', 'kredit'], batch_size=1000)
+            SaldoAkun.objects.filter(id__in=to_delete).delete()
+            # Laporan tercache dibangun dari saldo lama
+            for user_id in {row.user_id for row in to_create + to_update + stale}:
+                bump_ledger_version(user_id)
+
+    return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(stale)}
+
+
+
+# --- Tutup buku: snapshot saldo kumulatif ---
+def _tambah_rentang(totals, user, setelah, sampai):
+    """Tambahkan mutasi dengan ``setelah < tanggal <= sampai`` ke ``totals``.
+
+    Bulan yang tercakup penuh dibaca dari SaldoAkun; hanya bulan tepi yang
+    terpotong (paling banyak dua) dibaca dari Jurnal.
+    """
+    if setelah is not None and sampai is not None and setelah >= sampai:
+        return
+    full_start = None
+    if setelah is not None:
+        full_start = setelah + timedelta(days=1)
+        if full_start.day != 1:
+            full_start = awal_bulan_berikut(setelah)
+    full_end = None
+    if sampai is not None:
+        full_end = sampai + timedelta(days=1)
+        if full_end.day != 1:
+            full_end = sampai.replace(day=1)
+
+    tepi = Q()
+    if full_start is not None and full_end is not None and full_start >= full_end:
+        # Rentang berada di dalam satu bulan
+        tepi = Q(tanggal__gt=setelah, tanggal__lte=sampai)
+    else:
+        bulan = SaldoAkun.objects.filter(user=user)
+        if full_start is not None:
+            bulan = bulan.filter(periode__gte=full_start)
+            if setelah + timedelta(days=1) < full_start:
+                tepi |= Q(tanggal__gt=setelah, tanggal__lt=full_start)
+        if full_end is not None:
+            bulan = bulan.filter(periode__lt=full_end)
+            if full_end <= sampai:
+                tepi |= Q(tanggal__gte=full_end, tanggal__lte=sampai)
+        for r in bulan.values('akun_id').annotate(d=Sum('debit'), k=Sum('kredit')).order_by():
+            totals[r['akun_id']][0] += r['d'] or 0
+            totals[r['akun_id']][1] += r['k'] or 0
+
+    if tepi:
+        rows = (
+            Jurnal.objects.filter(tepi, user=user)
+            .values('akun_id').annotate(d=Sum('debit'), k=Sum('kredit')).order_by()
+        )
+        for r in rows:
+            totals[r['akun_id']][0] += r['d'] or 0
+            totals[r['akun_id']][1] += r['k'] or 0
+
+
+def saldo_kumulatif(user, sampai=None):
+    """Total debit/kredit per akun s/d ``sampai`` (inklusif; None = tanpa batas).
+
+    Dihitung sebagai snapshot tutup buku terdekat + mutasi sesudahnya, sehingga
+    biayanya tidak bertambah seiring umur pembukuan. Mengembalikan
+    ``{akun_id: [debit, kredit]}``.
+    """
+    totals = defaultdict(lambda: [Decimal('0'), Decimal('0')])
+    snapshots = SaldoPenutupan.objects.filter(user=user)
+    if sampai is not None:
+        snapshots = snapshots.filter(tanggal__lte=sampai)
+    tanggal_snapshot = snapshots.aggregate(terakhir=Max('tanggal'))['terakhir']
+    if tanggal_snapshot is not None:
+        for akun_id, debit, kredit in SaldoPenutupan.objects.filter(user=user, tanggal=tanggal_snapshot).values_list('akun_id', 'debit', 'kredit'):
+            totals[akun_id] = [debit, kredit]
+    _tambah_rentang(totals, user, tanggal_snapshot, sampai)
+    return totals
+
+
+def saldo_periode(user, start_date=None, end_date=None):
+    """Mutasi debit/kredit per akun dalam rentang [start_date, end_date]."""
+    totals = saldo_kumulatif(user, end_date)
+    if start_date:
+        for akun_id, (debit, kredit) in saldo_kumulatif(user, start_date - timedelta(days=1)).items():
+            totals[akun_id][0] -= debit
+            totals[akun_id][1] -= kredit
+    return totals
+
+
+@transaction.atomic
+def tutup_periode(user, tanggal):
+    """Tulis (atau tulis ulang) snapshot saldo kumulatif semua akun ``user`` per ``tanggal``."""
+    SaldoPenutupan.objects.filter(user=user, tanggal=tanggal).delete()
+    totals = saldo_kumulatif(user, tanggal)
+    rows = [
+        SaldoPenutupan(user=user, akun_id=akun_id, tanggal=tanggal, debit=totals[akun_id][0], kredit=totals[akun_id][1])
+        for akun_id in Akun.objects.filter(user=user).values_list('id', flat=True)
+    ]
+    SaldoPenutupan.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def sinkronkan_setelah_bulk(user, mulai=None):
+    """Selaraskan SaldoAkun, snapshot tutup buku dan versi buku besar setelah
+    penulisan massal (bulk_create / queryset.update) yang tidak memicu signal.
+
+    ``mulai`` adalah tanggal jurnal terlama yang ditulis; snapshot pada/sesudah
+    tanggal itu ditulis ulang berurutan dari yang paling awal.
+    """
+    rebuild_saldo(user)
+    snapshots = SaldoPenutupan.objects.filter(user=user)
+    if mulai is not None:
+        snapshots = snapshots.filter(tanggal__gte=mulai)
+    for tanggal in snapshots.order_by('tanggal').values_list('tanggal', flat=True).distinct():
+        tutup_periode(user, tanggal)
+    bump_ledger_version(user.pk)
+
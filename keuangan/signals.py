@@ -0,0 +1,87 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Akun, Jurnal, Transaksi, SaldoPenutupan
+from .saldo import apply_saldo_delta, apply_snapshot_delta, periode_of
+from .report_cache import bump_ledger_version
+
+
+# --- Pemeliharaan SaldoAkun ---
+@receiver(pre_save, sender=Jurnal)
+def jurnal_pre_save(sender, instance, raw=False, **kwargs):
+    instance._saldo_lama = None
+    if raw or instance.pk is None:
+        return
+    lama = (
+        Jurnal.objects.filter(pk=instance.pk)
+        .values_list('akun_id', 'user_id', 'tanggal', 'debit', 'kredit')
+        .first()
+    )
+    instance._saldo_lama = lama
+
+
+@receiver(post_save, sender=Jurnal)
+def jurnal_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    lama = getattr(instance, '_saldo_lama', None)
+    if lama:
+        akun_id, user_id, tanggal, debit, kredit = lama
+        apply_saldo_delta(user_id, akun_id, tanggal, -debit, -kredit)
+    apply_saldo_delta(instance.user_id, instance.akun_id, instance.tanggal, instance.debit, instance.kredit)
+
+
+@receiver(post_delete, sender=Jurnal)
+def jurnal_post_delete(sender, instance, **kwargs):
+    apply_saldo_delta(instance.user_id, instance.akun_id, instance.tanggal, -instance.debit, -instance.kredit)
+
+
+@receiver(pre_save, sender=Transaksi)
+def transaksi_pre_save(sender, instance, raw=False, **kwargs):
+    instance._tanggal_lama = None
+    if raw or instance.pk is None:
+        return
+    instance._tanggal_lama = Transaksi.objects.filter(pk=instance.pk).values_list('tanggal', flat=True).first()
+
+
+@receiver(post_save, sender=Transaksi)
+def transaksi_post_save(sender, instance, created, raw=False, **kwargs):
+    lama = getattr(instance, '_tanggal_lama', None)
+    if raw or lama is None or lama == instance.tanggal:
+        return
+    pindah_bulan = periode_of(lama) != periode_of(instance.tanggal)
+    for akun_id, user_id, debit, kredit in Jurnal.objects.filter(transaksi=instance).values_list('akun_id', 'user_id', 'debit', 'kredit'):
+        if pindah_bulan:
+            # Pindahkan saldo semua baris jurnal transaksi ini ke bucket bulan baru
+            apply_saldo_delta(user_id, akun_id, lama, -debit, -kredit)
+            apply_saldo_delta(user_id, akun_id, instance.tanggal, debit, kredit)
+        else:
+            # Bucket bulanan tetap, tetapi snapshot tutup buku di antara kedua
+            # tanggal (tutup buku tengah bulan) tetap harus bergeser
+            apply_snapshot_delta(akun_id, lama, -debit, -kredit)
+            apply_snapshot_delta(akun_id, instance.tanggal, debit, kredit)
+
+
+@receiver(post_save, sender=Akun)
+def akun_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    # Akun baru ikut tercatat (saldo nol) pada snapshot tutup buku yang sudah ada,
+    # supaya entri mundur ke akun ini tetap menggeser snapshot tersebut
+    tanggal_list = SaldoPenutupan.objects.filter(user_id=instance.user_id).values_list('tanggal', flat=True).distinct()
+    SaldoPenutupan.objects.bulk_create([
+        SaldoPenutupan(user_id=instance.user_id, akun=instance, tanggal=tanggal) for tanggal in tanggal_list
+    ])
+
+
+# --- Versi buku besar untuk cache laporan (dan versi daftar akun untuk indeks akun) ---
+@receiver(post_save, sender=Akun)
+@receiver(post_delete, sender=Akun)
+@receiver(post_save, sender=Transaksi)
+@receiver(post_delete, sender=Transaksi)
+@receiver(post_save, sender=Jurnal)
+@receiver(post_delete, sender=Jurnal)
+def ledger_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bump_ledger_version(instance.user_id, akun=sender is Akun)
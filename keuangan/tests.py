@@ -0,0 +1,223 @@
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import views, views_async
+from .dashboard import get_dashboard_data
+from .generator import generate_ledger, hapus_ledger
+from .instrumentation import assert_query_budget
+from .management.commands.cek_indeks import periksa_indeks
+from .models import Akun, Jurnal, SaldoAkun, SaldoPenutupan, Transaksi
+from .pagination import encode_cursor
+from .saldo import tutup_periode
+
+
+class DashboardQueryTest(TestCase):
+    """Jumlah query dashboard tidak boleh bertambah seiring banyaknya data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kecil = User.objects.create_user('kecil')
+        cls.besar = User.objects.create_user('besar')
+        generate_ledger(cls.kecil, 3, seed=1)
+        generate_ledger(cls.besar, 400, seed=2)
+
+    def test_jumlah_query_tetap(self):
+        for user, jumlah in ((self.kecil, 3), (self.besar, 400)):
+            with self.subTest(user=user.username):
+                with self.assertNumQueries(5):
+                    data = get_dashboard_data(user, today=date(2020, 1, 1))
+                self.assertEqual(data['total_transaksi'], jumlah)
+                self.assertEqual(len(data['recent_transactions']), min(jumlah, 5))
+                self.assertTrue(data['is_balanced'])
+
+
+class IndeksTest(TestCase):
+    """Query utama memakai indeks komposit menurut EXPLAIN (SQLite & PostgreSQL)."""
+
+    def test_plan_memakai_indeks(self):
+        for label, dipakai, indeks, plan in periksa_indeks():
+            with self.subTest(label):
+                self.assertIsNotNone(dipakai, f"{indeks} tidak dipakai:\n{plan}")
+
+
+class QueryBudgetTest(TestCase):
+    """Laporan tetap dalam QUERY_BUDGETS setelah tutup buku dan dengan filter tanggal."""
+
+    URL_LAPORAN = [
+        'jurnal_umum', 'jurnal_umum_pdf', 'jurnal_umum_excel',
+        'buku_besar', 'buku_besar_pdf', 'buku_besar_excel',
+        'neraca_saldo', 'neraca_saldo_pdf', 'neraca_saldo_excel',
+        'laporan_keuangan', 'laporan_keuangan_pdf', 'laporan_keuangan_excel',
+        'api_neraca_saldo', 'api_laba_rugi', 'api_neraca',
+    ]
+    FILTER_TANGGAL = [
+        {},
+        {'start_date': '2020-03-10'},
+        {'end_date': '2020-06-15'},
+        {'start_date': '2020-03-10', 'end_date': '2021-02-15'},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('budget')
+        generate_ledger(cls.user, 300, seed=3, tahun=2)
+        for tanggal in (date(2020, 1, 31), date(2020, 6, 30), date(2020, 12, 31)):
+            tutup_periode(cls.user, tanggal)
+        cls.akun_id = Akun.objects.filter(user=cls.user).order_by('kode').values_list('id', flat=True).first()
+
+    def setUp(self):
+        # Artefak PDF/Excel ditulis ke MEDIA_ROOT sementara, bukan media/ milik project
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        setting = override_settings(MEDIA_ROOT=media)
+        setting.enable()
+        self.addCleanup(setting.disable)
+        self.client.force_login(self.user)
+
+    def test_laporan_dalam_budget(self):
+        for nama in self.URL_LAPORAN:
+            for filter_tanggal in self.FILTER_TANGGAL:
+                for data in (filter_tanggal, {**filter_tanggal, 'akun_id': self.akun_id}):
+                    with self.subTest(nama, **data):
+                        cache.clear()
+                        response = assert_query_budget(self.client, nama, data=data)
+                        self.assertEqual(response.status_code, 200)
+
+    def test_halaman_lanjutan_dalam_budget(self):
+        # Cursor di beberapa titik buku besar: blok pertama halaman berikutnya adalah
+        # lanjutan akun dari halaman sebelumnya
+        jurnal = Jurnal.objects.filter(user=self.user)
+        kursor = {
+            'buku_besar': jurnal.order_by('akun__kode', 'tanggal', 'transaksi_id', 'id')
+                                .values_list('akun_id', 'tanggal', 'transaksi_id', 'id'),
+            'jurnal_umum': jurnal.order_by('-tanggal', '-transaksi_id').values_list('tanggal', 'transaksi_id').distinct(),
+        }
+        for nama, queryset in kursor.items():
+            for key in list(queryset)[25::120]:
+                for filter_tanggal in self.FILTER_TANGGAL:
+                    for arah in ('after', 'before'):
+                        data = {**filter_tanggal, arah: encode_cursor(key)}
+                        with self.subTest(nama, **data):
+                            cache.clear()
+                            response = assert_query_budget(self.client, nama, data=data)
+                            self.assertEqual(response.status_code, 200)
+
+    def test_kunjungan_pertama_profil(self):
+        # UserProfile dibuat saat halaman profil pertama kali dibuka
+        self.client.force_login(User.objects.create_user('profil'))
+        for _ in range(2):
+            response = assert_query_budget(self.client, 'profile')
+            self.assertEqual(response.status_code, 200)
+
+
+class PdfLaporanTest(TestCase):
+    """PDF jurnal dan buku besar tetap terbentuk untuk deskripsi multi-baris (textarea)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('pdf')
+        generate_ledger(cls.user, 120, seed=7)
+        transaksi = list(Transaksi.objects.filter(user=cls.user).order_by('id')[:3])
+        Transaksi.objects.filter(pk=transaksi[0].pk).update(deskripsi='Pembelian\nbarang\ndagang')
+        Transaksi.objects.filter(pk=transaksi[1].pk).update(deskripsi='\n'.join(['baris'] * 60))
+        Transaksi.objects.filter(pk=transaksi[2].pk).update(deskripsi='x\n' * 127)
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        setting = override_settings(MEDIA_ROOT=media)
+        setting.enable()
+        self.addCleanup(setting.disable)
+        self.client.force_login(self.user)
+
+    def test_deskripsi_multi_baris(self):
+        for nama in ('jurnal_umum_pdf', 'buku_besar_pdf'):
+            with self.subTest(nama):
+                response = self.client.get(reverse(nama))
+                self.assertEqual(response.status_code, 200)
+                isi = b''.join(response.streaming_content) if response.streaming else response.content
+                self.assertTrue(isi.startswith(b'%PDF'))
+
+
+class TransaksiCsvTest(TestCase):
+    """CSV transaksi di view async di-stream lewat iterator async dengan isi yang sama."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('csv')
+        generate_ledger(cls.user, 1200, seed=4)
+
+    async def test_csv_async_sama_dengan_sync(self):
+        request = RequestFactory().get('/transaksi/api/list/', {'format': 'csv'})
+        request.user = self.user
+        response = await sync_to_async(views.transaksi_api_list)(request)
+        harapan = await sync_to_async(b''.join)(response.streaming_content)
+
+        async def auser():
+            return self.user
+
+        request = AsyncRequestFactory().get('/transaksi/api/list/', {'format': 'csv'})
+        request.user, request.auser = self.user, auser
+        response = await views_async.transaksi_api_list(request)
+        self.assertTrue(response.is_async)
+        isi = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(isi, harapan)
+        self.assertEqual(isi.count(b'\n'), 1201)
+
+
+class TransaksiApiTest(TestCase):
+    """Validasi payload API transaksi menghasilkan 400, bukan error database."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('api')
+        generate_ledger(cls.user, 1, seed=5)
+
+    def test_deskripsi_terlalu_panjang_ditolak(self):
+        self.client.force_login(self.user)
+        for panjang, status in ((256, 400), (255, 201)):
+            with self.subTest(panjang=panjang):
+                payload = {'tanggal': '2020-02-01', 'deskripsi': 'x' * panjang,
+                           'akun_debet': '1101', 'akun_kredit': '4101', 'jumlah': '1000'}
+                response = self.client.post('/transaksi/api/create/', json.dumps(payload),
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, status, response.content)
+        self.assertEqual(Transaksi.objects.filter(user=self.user).count(), 2)
+
+
+class GenerateLedgerTest(TestCase):
+    """generate_ledger --ganti menghapus data lama dengan DELETE massal."""
+
+    def test_hapus_ledger_tanpa_query_per_baris(self):
+        jumlah_query = []
+        for nama, entri in (('kecil', 3), ('besar', 400)):
+            user = User.objects.create_user(nama)
+            generate_ledger(user, entri, seed=6)
+            tutup_periode(user, date(2020, 6, 30))
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(hapus_ledger(user), entri)
+            jumlah_query.append(len(queries))
+            for model in (Akun, Transaksi, Jurnal, SaldoAkun, SaldoPenutupan):
+                self.assertFalse(model.objects.filter(user=user).exists(), model.__name__)
+        self.assertEqual(jumlah_query[0], jumlah_query[1])
+
+    def test_ganti_dan_ringkasan_di_baris_baru(self):
+        for argumen in ([], ['--ganti']):
+            out = StringIO()
+            call_command('generate_ledger', '--entri', '20', '--batch', '7', *argumen, stdout=out)
+            progress, ringkasan = out.getvalue().rstrip('\n').split('\n')
+            self.assertTrue(progress.endswith('\r'))
+            self.assertTrue(ringkasan.startswith('ledger1: 20 entri'), ringkasan)
+        self.assertEqual(Transaksi.objects.filter(user__username='ledger1').count(), 20)
@@ -1,9 +1,19 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from . import views_laporan
+from . import views_export
+from . import views_api
+from . import views_async
+
+# Dashboard dan API baca-saja memakai varian async bila ASYNC_VIEWS aktif (ASGI)
+if settings.ASYNC_VIEWS:
+    dashboard_view, transaksi_list_view, api = views_async.dashboard, views_async.transaksi_api_list, views_async
+else:
+    dashboard_view, transaksi_list_view, api = views.dashboard, views.transaksi_api_list, views_api
 
 urlpatterns = [
-    path('', views.dashboard, name='dashboard'),
+    path('', dashboard_view, name='dashboard'),
     path('login/', views.CustomLoginView.as_view(), name='login'),
     path('register/', views.register_view, name='register'),
     path('logout/', views.logout_view, name='logout'),
@@ -20,6 +30,12 @@ urlpatterns = [
     path('laporan-keuangan/', views_laporan.laporan_keuangan, name='laporan_keuangan'),
     path('laporan-keuangan/pdf/', views_laporan.laporan_keuangan_pdf, name='laporan_keuangan_pdf'),
     path('laporan-keuangan/excel/', views_laporan.laporan_keuangan_excel, name='laporan_keuangan_excel'),
+    path('laporan/cache-stats/', views_laporan.report_cache_stats, name='report_cache_stats'),
+
+    # API JSON laporan (ETag dari versi buku besar; If-None-Match dijawab 304)
+    path('api/laporan/neraca-saldo/', api.api_neraca_saldo, name='api_neraca_saldo'),
+    path('api/laporan/laba-rugi/', api.api_laba_rugi, name='api_laba_rugi'),
+    path('api/laporan/neraca/', api.api_neraca, name='api_neraca'),
     
     # URL untuk manajemen akun
     path('akun/', views.daftar_akun, name='daftar_akun'),
@@ -30,11 +46,17 @@ urlpatterns = [
     path('akun/edit/<int:id>/', views.edit_akun, name='edit_akun'),
     path('akun/hapus/<int:id>/', views.hapus_akun, name='hapus_akun'),
     # API endpoints for ajax CRUD on transaksi
-    path('transaksi/api/list/', views.transaksi_api_list, name='transaksi_api_list'),
+    path('transaksi/api/list/', transaksi_list_view, name='transaksi_api_list'),
     path('transaksi/api/create/', views.transaksi_api_create, name='transaksi_api_create'),
+    path('transaksi/api/import/', views.transaksi_api_import, name='transaksi_api_import'),
     path('transaksi/api/<int:id>/update/', views.transaksi_api_update, name='transaksi_api_update'),
     path('transaksi/api/<int:id>/delete/', views.transaksi_api_delete, name='transaksi_api_delete'),
     
+    # Antrian ekspor PDF/Excel (dikerjakan oleh `manage.py proses_export`)
+    path('export/<str:jenis>/', views_export.export_submit, name='export_submit'),
+    path('export/job/<int:id>/', views_export.export_status, name='export_status'),
+    path('export/job/<int:id>/download/', views_export.export_download, name='export_download'),
+
     # URL untuk profil pengguna
     path('profile/', views.profile_view, name='profile'),
 ]
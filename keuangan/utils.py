@@ -0,0 +1,42 @@
+from datetime import date, datetime
+
+from django.utils.dateparse import parse_date as django_parse_date
+
+
+def parse_date_flexible(val):
+    if not val:
+        return None
+    if isinstance(val, date):
+        return val
+    if isinstance(val, datetime):
+        return val.date()
+    s = str(val).strip()
+    try:
+        return date.fromisoformat(s)
+    except Exception:
+        pass
+    for fmt in ('%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(s, fmt).date()
+        except Exception:
+            continue
+    try:
+        pd = django_parse_date(s)
+        if pd:
+            return pd
+    except Exception:
+        pass
+    return None
+
+
+def parse_date_any(s):
+    """Tanggal filter laporan: ISO (dari <input type="date">) atau MM/DD/YYYY."""
+    if not s:
+        return None
+    d = django_parse_date(s)
+    if d:
+        return d
+    try:
+        return datetime.strptime(s, '%m/%d/%Y').date()
+    except ValueError:
+        return None
@@ -3,7 +3,7 @@ from django.contrib.auth.decorators import login_required
 @login_required
 def detail_akun(request, id):
     akun = get_object_or_404(Akun, id=id, user=request.user)
-    jurnal_list = Jurnal.objects.filter(akun=akun).select_related('transaksi').order_by('-transaksi__tanggal')
+    jurnal_list = Jurnal.objects.filter(akun=akun).select_related('transaksi').order_by('-tanggal')
     context = {
         'akun': akun,
         'jurnal_list': jurnal_list,
@@ -18,23 +18,28 @@ from django.contrib.auth.views import LoginView
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
 from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest
-from django.db.models import Sum, Q, Value, DecimalField
+from django.db.models import Count, Sum, Q, Value, DecimalField
 from django.db.models.functions import Coalesce
-from .views_laporan import compute_account_totals_for_user
+from .dashboard import get_dashboard_data
+from .report_cache import cached_report
+from .csv_export import CSV_CHUNK_SIZE, streaming_csv_response, wants_csv
 from django.db import transaction
-from datetime import datetime, date
-from django.utils.dateparse import parse_date as django_parse_date
+from datetime import date
+from decimal import Decimal
 import json
 from .models import Jurnal, Akun, Transaksi, UserProfile
-from .forms import TransaksiForm, AkunForm, CustomUserCreationForm, UserProfileForm, UserUpdateForm
+from .utils import parse_date_flexible
+from .pagination import decode_cursor, keyset_page, page_links, page_size
+from .saldo import saldo_periode
+from .importer import FORMATS as IMPORT_FORMATS, detect_format, import_transaksi
+from .akun_index import akun_index
+from .entries import lines_from_payload, ringkas_baris, simpan_entri, validate_lines
+from .forms import TransaksiForm, BarisJurnalFormSet, data_baris_dari_pasangan, AkunForm, CustomUserCreationForm, UserProfileForm, UserUpdateForm
 from .pdf_utils import (
     export_jurnal_pdf, 
-    export_buku_besar_pdf, 
-    export_neraca_saldo_pdf, 
-    export_laporan_keuangan_pdf,
+    export_daftar_akun_pdf,
     create_pdf_response
 )
-from reportlab.lib.pagesizes import A4 # Import ini diperlukan untuk fungsi daftar_akun_pdf
 
 # --- Custom Login View ---
 @method_decorator(never_cache, name='dispatch')
@@ -50,92 +55,20 @@ class CustomLoginView(LoginView):
     def get_success_url(self):
         return '/'
 
-# --- Helper Function ---
-def parse_date_flexible(val):
-    if not val:
-        return None
-    if isinstance(val, date):
-        return val
-    if isinstance(val, datetime):
-        return val.date()
-    s = str(val).strip()
-    try:
-        return date.fromisoformat(s)
-    except Exception:
-        pass
-    for fmt in ('%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d'):
-        try:
-            return datetime.strptime(s, fmt).date()
-        except Exception:
-            continue
-    try:
-        pd = django_parse_date(s)
-        if pd:
-            return pd
-    except Exception:
-        pass
-    return None
-
 # --- Dashboard View ---
 @login_required
 def dashboard(request):
-    user_akun = Akun.objects.filter(user=request.user)
-    # Filter Transaksi yang terkait dengan akun milik user (lebih efisien)
-    user_transaksi_ids = Transaksi.objects.filter(jurnal__akun__user=request.user).values_list('id', flat=True).distinct()
-    user_transaksi = Transaksi.objects.filter(id__in=user_transaksi_ids)
-    
-    # Kinerja: Hitung agregasi langsung di database
-    jurnal_total = Jurnal.objects.filter(akun__user=request.user).aggregate(
-        total_debet=Coalesce(Sum('debit'), Value(0), output_field=DecimalField()),
-        total_kredit=Coalesce(Sum('kredit'), Value(0), output_field=DecimalField()),
-    )
-    
-    total_debet = jurnal_total.get('total_debet', 0)
-    total_kredit = jurnal_total.get('total_kredit', 0)
-    
-    total_transaksi = user_transaksi.count()
-    total_akun = user_akun.count()
-
+    # Semua counter dan transaksi terbaru diambil dengan jumlah query tetap,
+    # lalu disimpan di cache sampai data user berubah (atau hari berganti)
     today = date.today()
-    transaksi_hari_ini = user_transaksi.filter(tanggal=today).count()
-
-    # Recent transactions: perbaikan efisiensi query
-    recent_transactions = []
-    latest_transaksi = user_transaksi.order_by('-tanggal', '-id')[:5]
-    for transaksi in latest_transaksi:
-        jurnal_entries = Jurnal.objects.select_related('akun').filter(transaksi=transaksi)
-        debet_entry = jurnal_entries.filter(debit__gt=0).first()
-        kredit_entry = jurnal_entries.filter(kredit__gt=0).first()
-        
-        jumlah = debet_entry.debit if debet_entry else (kredit_entry.kredit if kredit_entry else 0)
-
-        recent_transactions.append({
-            'tanggal': transaksi.tanggal,
-            'deskripsi': transaksi.deskripsi,
-            'akun_debet': debet_entry.akun if debet_entry else None,
-            'akun_kredit': kredit_entry.akun if kredit_entry else None,
-            'jumlah': jumlah
-        })
-
-    selisih = total_debet - total_kredit
+    context = dict(cached_report(request.user, 'dashboard', {'today': today}, lambda: get_dashboard_data(request.user, today)))
 
     try:
         user_profile = request.user.userprofile
     except UserProfile.DoesNotExist:
         user_profile = UserProfile.objects.create(user=request.user)
 
-    context = {
-        'total_transaksi': total_transaksi,
-        'total_debet': total_debet,
-        'total_kredit': total_kredit,
-        'total_akun': total_akun,
-        'transaksi_hari_ini': transaksi_hari_ini,
-        'recent_transactions': recent_transactions,
-        'selisih': selisih,
-        'is_balanced': total_debet == total_kredit,
-        'user_profile': user_profile,
-    }
-
+    context['user_profile'] = user_profile
     return render(request, 'dashboard.html', context)
 
 # --- Input Transaksi View ---
@@ -143,52 +76,39 @@ def dashboard(request):
 @transaction.atomic # Tambahkan transaction.atomic untuk integritas data
 def input_transaksi(request):
     if request.method == 'POST':
-        form = TransaksiForm(request.POST, user=request.user)
-        if form.is_valid():
-            akun_debet = form.cleaned_data['akun_debet']
-            akun_kredit = form.cleaned_data['akun_kredit']
-            jumlah = form.cleaned_data['jumlah']
-            
-            if akun_debet == akun_kredit:
-                messages.error(request, 'Akun debet dan kredit tidak boleh sama!')
-                return render(request, 'input_transaksi.html', {'form': form})
-            
-            # --- Simpan Transaksi dan Jurnal dalam blok atomic ---
-            transaksi = Transaksi.objects.create(
-                tanggal=form.cleaned_data['tanggal'], 
-                deskripsi=form.cleaned_data['deskripsi'], 
-                user=request.user # Pastikan user tersimpan di Transaksi
+        form = TransaksiForm(request.POST)
+        data = request.POST
+        if 'baris-TOTAL_FORMS' not in data and 'akun_debet' in data:
+            # Form lama yang masih mengirim satu pasangan debet/kredit
+            data = data_baris_dari_pasangan(data)
+        formset = BarisJurnalFormSet(data, prefix='baris', form_kwargs={'user': request.user})
+        if form.is_valid() and formset.is_valid():
+            # --- Simpan Transaksi dan semua baris Jurnal dalam blok atomic ---
+            simpan_entri(
+                request.user,
+                form.cleaned_data['tanggal'],
+                form.cleaned_data['deskripsi'],
+                formset.entri,
             )
-            
-            Jurnal.objects.create(
-                transaksi=transaksi,
-                akun=akun_debet,
-                debit=jumlah,
-                kredit=0
-            )
-            
-            Jurnal.objects.create(
-                transaksi=transaksi,
-                akun=akun_kredit,
-                debit=0,
-                kredit=jumlah
-            )
-            
             messages.success(request, 'Transaksi berhasil disimpan!')
             return redirect('jurnal_umum')
         else:
             messages.error(request, 'Form tidak valid. Mohon periksa kembali input Anda.')
     else:
-        form = TransaksiForm(user=request.user)
-    return render(request, 'input_transaksi.html', {'form': form})
+        form = TransaksiForm()
+        formset = BarisJurnalFormSet(prefix='baris', form_kwargs={'user': request.user})
+    return render(request, 'input_transaksi.html', {'form': form, 'formset': formset})
 
 # --- Jurnal Umum View ---
-@login_required
-def jurnal_umum(request):
-    # Base queryset: hanya milik user
-    jurnal = Jurnal.objects.select_related('transaksi', 'akun').filter(akun__user=request.user)
+def filter_jurnal_umum(request, jurnal=None):
+    """Jurnal milik user dengan filter start_date, end_date dan search dari query string.
+
+    Dipakai bersama oleh tampilan HTML, PDF, Excel dan CSV supaya hasilnya selalu sama.
+    """
+    if jurnal is None:
+        jurnal = Jurnal.objects.all()
+    jurnal = jurnal.filter(user=request.user)
 
-    # Apply filters from query params
     start_date = request.GET.get('start_date')
     end_date = request.GET.get('end_date')
     search = request.GET.get('search')
@@ -196,60 +116,77 @@ def jurnal_umum(request):
     if start_date:
         sd = parse_date_flexible(start_date)
         if sd:
-            jurnal = jurnal.filter(transaksi__tanggal__gte=sd)
+            jurnal = jurnal.filter(tanggal__gte=sd)
     if end_date:
         ed = parse_date_flexible(end_date)
         if ed:
-            jurnal = jurnal.filter(transaksi__tanggal__lte=ed)
+            jurnal = jurnal.filter(tanggal__lte=ed)
     if search:
         jurnal = jurnal.filter(transaksi__deskripsi__icontains=search)
 
-    jurnal = jurnal.order_by('transaksi__tanggal', 'transaksi__id')
-    
-    # Agregasi untuk total (lebih efisien)
-    totals = jurnal.aggregate(
-        total_debet=Coalesce(Sum('debit'), Value(0), output_field=DecimalField()),
-        total_kredit=Coalesce(Sum('kredit'), Value(0), output_field=DecimalField())
+    return jurnal.order_by('tanggal', 'transaksi_id')
+
+@login_required
+def jurnal_umum(request):
+    """Jurnal umum per halaman transaksi dengan cursor keyset ``?after=``/``?before=<tanggal>,<id>``."""
+    if wants_csv(request):
+        return jurnal_umum_csv(request)
+
+    jurnal = filter_jurnal_umum(request)
+    size = page_size(request)
+    after = decode_cursor(request.GET.get('after'), (date, int))
+    before = decode_cursor(request.GET.get('before'), (date, int))
+
+    # Query 1: satu halaman pasangan (tanggal, transaksi) unik di sekitar cursor
+    keys, has_prev, has_next = keyset_page(
+        jurnal.values_list('tanggal', 'transaksi_id').distinct(), ('tanggal', 'transaksi_id'), after, before, size
     )
-    
-    total_debet = totals.get('total_debet', 0)
-    total_kredit = totals.get('total_kredit', 0)
-    
+    # Query 2: semua baris jurnal transaksi di halaman ini
+    page_jurnal = list(
+        Jurnal.objects.select_related('transaksi', 'akun')
+        .filter(user=request.user, transaksi_id__in=[tid for _, tid in keys])
+        .order_by('tanggal', 'transaksi_id', 'id')
+    )
+
+    if request.GET.get('search'):
+        totals = jurnal.aggregate(
+            total_debet=Coalesce(Sum('debit'), Value(0), output_field=DecimalField()),
+            total_kredit=Coalesce(Sum('kredit'), Value(0), output_field=DecimalField())
+        )
+        total_debet, total_kredit = totals['total_debet'], totals['total_kredit']
+    else:
+        # Tanpa pencarian, total periode dibaca dari SaldoAkun (biaya tetap, tidak memindai Jurnal)
+        mutasi = saldo_periode(
+            request.user,
+            parse_date_flexible(request.GET.get('start_date')),
+            parse_date_flexible(request.GET.get('end_date')),
+        ).values()
+        total_debet = sum((debit for debit, _ in mutasi), Decimal('0'))
+        total_kredit = sum((kredit for _, kredit in mutasi), Decimal('0'))
+
     # Hitung total transaksi unik
     total_transaksi = jurnal.values('transaksi').distinct().count()
-    
+
     context = {
-        'jurnal': jurnal,
+        'jurnal': page_jurnal,
         'total_debet': total_debet,
         'total_kredit': total_kredit,
         'total_transaksi': total_transaksi,
+        'page_debet': sum((j.debit for j in page_jurnal), Decimal('0')),
+        'page_kredit': sum((j.kredit for j in page_jurnal), Decimal('0')),
+        'per_page': size,
+        **page_links(request, keys[0] if keys else None, keys[-1] if keys else None, has_prev, has_next),
     }
-    
+
     return render(request, 'jurnal_umum.html', context)
 
 @login_required
 def jurnal_umum_pdf(request):
     """Export Jurnal Umum to PDF - Only user's data"""
-    # Base queryset: hanya milik user
-    jurnal = Jurnal.objects.select_related('transaksi', 'akun').filter(akun__user=request.user)
-    # Apply same filters as HTML
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    search = request.GET.get('search')
-    if start_date:
-        sd = parse_date_flexible(start_date)
-        if sd:
-            jurnal = jurnal.filter(transaksi__tanggal__gte=sd)
-    if end_date:
-        ed = parse_date_flexible(end_date)
-        if ed:
-            jurnal = jurnal.filter(transaksi__tanggal__lte=ed)
-    if search:
-        jurnal = jurnal.filter(transaksi__deskripsi__icontains=search)
-
-    jurnal = jurnal.order_by('transaksi__tanggal', 'transaksi__id')
+    # Filter sama dengan tampilan HTML
+    jurnal = filter_jurnal_umum(request, Jurnal.objects.select_related('transaksi', 'akun'))
     
-    buffer = export_jurnal_pdf(jurnal)
+    buffer = export_jurnal_pdf(jurnal.iterator(chunk_size=2000))
     response = create_pdf_response('jurnal_umum.pdf')
     response.write(buffer.getvalue())
     
@@ -257,312 +194,67 @@ def jurnal_umum_pdf(request):
 
 @login_required
 def jurnal_umum_excel(request):
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-    from openpyxl.utils import get_column_letter
-    from io import BytesIO
+    from .excel_utils import ExcelExport
 
-    jurnal_qs = Jurnal.objects.select_related('transaksi', 'akun').filter(akun__user=request.user)
     # Apply same filters
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    search = request.GET.get('search')
-    if start_date:
-        sd = parse_date_flexible(start_date)
-        if sd:
-            jurnal_qs = jurnal_qs.filter(transaksi__tanggal__gte=sd)
-    if end_date:
-        ed = parse_date_flexible(end_date)
-        if ed:
-            jurnal_qs = jurnal_qs.filter(transaksi__tanggal__lte=ed)
-    if search:
-        jurnal_qs = jurnal_qs.filter(transaksi__deskripsi__icontains=search)
-
-    jurnal_qs = jurnal_qs.order_by('transaksi__tanggal', 'transaksi__id')
-    transaksi_ids = jurnal_qs.values_list('transaksi__id', flat=True).distinct()
-    transaksi_qs = Transaksi.objects.filter(id__in=transaksi_ids).order_by('-tanggal', '-id')
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Jurnal Umum"
-
-    headers = ["Tanggal", "No. Ref", "Deskripsi", "Akun", "Debet (Rp)", "Kredit (Rp)"]
-    ws.append(headers)
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="2563eb")
-    center = Alignment(horizontal="center", vertical="center")
-    thin = Side(style="thin", color="D9D9D9")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-    for col_idx in range(1, len(headers) + 1):
-        cell = ws.cell(row=1, column=col_idx)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = center
-        cell.border = border
+    jurnal_qs = filter_jurnal_umum(request)
+
+    # Satu query berurutan (transaksi terbaru dulu) yang dibaca bertahap
+    rows = jurnal_qs.order_by('-tanggal', '-transaksi_id', 'id').values_list(
+        'tanggal', 'transaksi_id', 'transaksi__deskripsi', 'akun__kode', 'akun__nama', 'debit', 'kredit'
+    ).iterator(chunk_size=2000)
+
+    export = ExcelExport()
+    ws = export.sheet("Jurnal Umum", [
+        ("Tanggal", 13, 'center'),
+        ("No. Ref", 12, 'center'),
+        ("Deskripsi", 32, 'left'),
+        ("Akun", 28, 'left'),
+        ("Debet (Rp)", 15, 'angka'),
+        ("Kredit (Rp)", 15, 'angka'),
+    ])
 
     total_debet = 0
     total_kredit = 0
-    row_num = 2
-    for t in transaksi_qs:
-        jurnal_entries = jurnal_qs.filter(transaksi=t)
-        first = True
-        for j in jurnal_entries:
-            ws.append([
-                t.tanggal.strftime('%d/%m/%Y') if first else '',
-                f"AUTO-{t.id}" if first else '',
-                t.deskripsi if first else '',
-                f"{j.akun.kode} - {j.akun.nama}",
-                j.debit if j.debit > 0 else '',
-                j.kredit if j.kredit > 0 else '',
-            ])
-            for col_idx in range(1, len(headers) + 1):
-                cell = ws.cell(row=row_num, column=col_idx)
-                cell.alignment = Alignment(horizontal="left" if col_idx in [3,4] else "center", vertical="center")
-                cell.border = border
-                if col_idx in [5,6]:
-                    cell.number_format = '#,##0'
-            row_num += 1
-            first = False
-            total_debet += j.debit
-            total_kredit += j.kredit
-        ws.append([''] * len(headers))
-        row_num += 1
-
-    ws.append(['', '', '', 'TOTAL:', total_debet, total_kredit])
-    for col_idx in range(1, len(headers) + 1):
-        cell = ws.cell(row=row_num, column=col_idx)
-        cell.font = Font(bold=True)
-        cell.alignment = center if col_idx < 5 else Alignment(horizontal="right", vertical="center")
-        cell.border = border
-        if col_idx in [5,6]:
-            cell.number_format = '#,##0'
-
-    col_widths = [13, 12, 32, 28, 15, 15]
-    for i, width in enumerate(col_widths, start=1):
-        ws.column_dimensions[get_column_letter(i)].width = width
-
-    ws.freeze_panes = "A2"
-
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(
-        buffer.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    current_id = None
+    for tanggal, transaksi_id, deskripsi, kode, nama, debit, kredit in rows:
+        first = transaksi_id != current_id
+        if first and current_id is not None:
+            ws.blank()
+        current_id = transaksi_id
+        ws.row([
+            tanggal.strftime('%d/%m/%Y') if first else '',
+            f"AUTO-{transaksi_id}" if first else '',
+            deskripsi if first else '',
+            f"{kode} - {nama}",
+            debit if debit > 0 else '',
+            kredit if kredit > 0 else '',
+        ])
+        total_debet += debit
+        total_kredit += kredit
+    if current_id is not None:
+        ws.blank()
+
+    ws.total(['', '', '', 'TOTAL:', total_debet, total_kredit])
+    return export.response('jurnal_umum.xlsx')
+
+def jurnal_umum_csv(request):
+    """Ekspor Jurnal Umum ke CSV secara streaming (dipanggil dari jurnal_umum dengan ?format=csv)."""
+    rows = filter_jurnal_umum(request).values_list(
+        'tanggal', 'transaksi_id', 'transaksi__deskripsi', 'akun__kode', 'akun__nama', 'debit', 'kredit'
+    ).iterator(chunk_size=CSV_CHUNK_SIZE)
+    return streaming_csv_response(
+        'jurnal_umum.csv',
+        ['Tanggal', 'No. Ref', 'Deskripsi', 'Kode Akun', 'Akun', 'Debet', 'Kredit'],
+        ((tanggal.isoformat(), f"AUTO-{transaksi_id}", deskripsi, kode, nama, debit, kredit)
+         for tanggal, transaksi_id, deskripsi, kode, nama, debit, kredit in rows),
     )
-    response['Content-Disposition'] = 'attachment; filename="jurnal_umum.xlsx"'
-    return response
-
-# --- Buku Besar View ---
-@login_required
-def buku_besar(request):
-    akun_id = request.GET.get('akun_id')
-    akun_list = Akun.objects.filter(user=request.user).order_by('kode')
-    
-    # Filter Jurnal harus sesuai user
-    user_jurnal_base = Jurnal.objects.select_related('transaksi', 'akun').filter(akun__user=request.user)
-
-    if akun_id:
-        try:
-            # Bug Fix: Pastikan akun milik user!
-            akun_filter = Akun.objects.get(id=akun_id, user=request.user) 
-            jurnal = user_jurnal_base.filter(akun=akun_filter).order_by('transaksi__tanggal')
-        except Akun.DoesNotExist:
-            messages.error(request, "Akun tidak ditemukan atau Anda tidak memiliki akses.")
-            akun_filter = None
-            jurnal = user_jurnal_base.none() 
-    else:
-        # Jika tidak ada filter akun, tampilkan semua jurnal user
-        akun_filter = None
-        jurnal = user_jurnal_base.order_by('akun__kode', 'transaksi__tanggal')
-    
-    context = {
-        'jurnal': jurnal,
-        'akun_list': akun_list,
-        'akun_filter': akun_filter,
-    }
-    
-    return render(request, 'buku_besar.html', context)
-
-@login_required
-def buku_besar_pdf(request):
-    """Export Buku Besar to PDF"""
-    akun_id = request.GET.get('akun_id')
-    akun_name = "Semua Akun"
-    
-    # Filter Jurnal harus sesuai user
-    user_jurnal_base = Jurnal.objects.select_related('transaksi', 'akun').filter(akun__user=request.user)
-
-    if akun_id:
-        try:
-            # Bug Fix: Pastikan akun milik user!
-            akun_filter = Akun.objects.get(id=akun_id, user=request.user)
-            jurnal = user_jurnal_base.filter(akun=akun_filter).order_by('transaksi__tanggal')
-            akun_name = f"{akun_filter.kode} - {akun_filter.nama}"
-        except Akun.DoesNotExist:
-            # Jika akun tidak ditemukan/bukan milik user, kembalikan response error
-            return HttpResponseBadRequest("Akun tidak valid untuk PDF.")
-    else:
-        jurnal = user_jurnal_base.order_by('akun__kode', 'transaksi__tanggal')
-    
-    buffer = export_buku_besar_pdf(jurnal, akun_name)
-    response = create_pdf_response('buku_besar.pdf')
-    response.write(buffer.getvalue())
-    
-    return response
-
-# --- Neraca Saldo View ---
-# (Tidak diubah, karena compute_account_totals_for_user sudah memfilter per user)
-@login_required
-def neraca_saldo(request):
-    data = compute_account_totals_for_user(request.user)
-
-    neraca_data = []
-    total_debet = 0
-    total_kredit = 0
-
-    for entry in data['saldo']:
-        akun = entry['akun']
-        debit = entry.get('debit', 0) or 0
-        kredit = entry.get('kredit', 0) or 0
-        
-        # Display net amounts: if debit >= kredit show debit-net, else show credit-net
-        if debit >= kredit:
-            disp_debet = debit - kredit
-            disp_kredit = 0
-        else:
-            disp_debet = 0
-            disp_kredit = kredit - debit
-
-        neraca_data.append({
-            'akun__kode': akun.kode,
-            'akun__nama': akun.nama,
-            'total_debet': disp_debet,
-            'total_kredit': disp_kredit,
-        })
-
-        total_debet += disp_debet
-        total_kredit += disp_kredit
-
-    context = {
-        'neraca_data': neraca_data,
-        'total_debet': total_debet,
-        'total_kredit': total_kredit,
-    }
-
-    return render(request, 'neraca_saldo.html', context)
-
-@login_required
-def neraca_saldo_pdf(request):
-    """Export Neraca Saldo to PDF"""
-    data = compute_account_totals_for_user(request.user)
-    neraca_data = []
-    for entry in data['saldo']:
-        akun = entry['akun']
-        debit = entry.get('debit', 0) or 0
-        kredit = entry.get('kredit', 0) or 0
-        if debit >= kredit:
-            disp_debet = debit - kredit
-            disp_kredit = 0
-        else:
-            disp_debet = 0
-            disp_kredit = kredit - debit
-        neraca_data.append({
-            'akun__kode': akun.kode,
-            'akun__nama': akun.nama,
-            'total_debet': disp_debet,
-            'total_kredit': disp_kredit,
-        })
-
-    buffer = export_neraca_saldo_pdf(neraca_data)
-    response = create_pdf_response('neraca_saldo.pdf')
-    response.write(buffer.getvalue())
-    
-    return response
-
-# --- Laporan Keuangan View ---
-# (Tidak diubah, karena logic utama sudah benar)
-@login_required
-def laporan_keuangan(request):
-    data = compute_account_totals_for_user(request.user)
-
-    laporan = []
-    aktiva = []
-    kewajiban = []
-    modal = []
-    pendapatan = []
-    beban = []
-
-    for s in data['saldo']:
-        akun = s['akun']
-        saldo_akhir = s['saldo']
-        laporan.append({'akun': akun, 'saldo': saldo_akhir})
-
-        if akun.tipe in ['Aset', 'Aktiva', 'Aktiva Lancar', 'Aktiva Tetap']:
-            aktiva.append({'akun': akun, 'saldo': abs(saldo_akhir) if saldo_akhir > 0 else 0})
-        elif akun.tipe in ['Kewajiban', 'Kewajiban Lancar', 'Kewajiban Jangka Panjang']:
-            kewajiban.append({'akun': akun, 'saldo': abs(saldo_akhir) if saldo_akhir < 0 else 0})
-        elif akun.tipe == 'Modal':
-            modal.append({'akun': akun, 'saldo': abs(saldo_akhir) if saldo_akhir < 0 else 0})
-        elif akun.tipe == 'Pendapatan':
-            pendapatan.append({'akun': akun, 'saldo': abs(saldo_akhir) if saldo_akhir < 0 else 0})
-        elif akun.tipe == 'Beban':
-            beban.append({'akun': akun, 'saldo': abs(saldo_akhir) if saldo_akhir > 0 else 0})
-
-    total_aktiva = data['total_aktiva']
-    total_kewajiban = data['total_kewajiban']
-    total_modal = data['total_modal']
-    total_pendapatan = data['total_pendapatan']
-    total_beban = data['total_beban']
-
-    laba_rugi = total_pendapatan - total_beban
-
-    context = {
-        'pendapatan': pendapatan,
-        'beban': beban,
-        'aktiva': aktiva,
-        'pasiva': kewajiban,
-        'modal': modal,
-        'total_pendapatan': total_pendapatan,
-        'total_beban': total_beban,
-        'total_aktiva': total_aktiva,
-        'total_pasiva': total_kewajiban,
-        'total_modal': total_modal,
-        'laba_rugi': laba_rugi,
-    }
-
-    return render(request, 'laporan_keuangan.html', context)
-
-@login_required
-def laporan_keuangan_pdf(request):
-    """Export Laporan Keuangan to PDF"""
-    data = compute_account_totals_for_user(request.user)
-
-    pendapatan = []
-    beban = []
-    for entry in data['saldo']:
-        akun = entry['akun']
-        saldo_akhir = entry['saldo']
-        if akun.tipe == 'Pendapatan':
-            total = abs(saldo_akhir) if saldo_akhir < 0 else 0
-            pendapatan.append({'akun__nama': akun.nama, 'total': total})
-        elif akun.tipe == 'Beban':
-            total = abs(saldo_akhir) if saldo_akhir > 0 else 0
-            beban.append({'akun__nama': akun.nama, 'total': total})
-
-    laporan_data = {'pendapatan': pendapatan, 'beban': beban}
-
-    buffer = export_laporan_keuangan_pdf(laporan_data)
-    response = create_pdf_response('laporan_keuangan.pdf')
-    response.write(buffer.getvalue())
-    
-    return response
 
 @login_required
 def daftar_akun(request):
     """Menampilkan daftar semua akun"""
-    akun_list = Akun.objects.filter(user=request.user).order_by('kode')
+    # Jumlah jurnal dihitung dalam satu query, bukan akun.jurnal_set.count per baris
+    akun_list = Akun.objects.filter(user=request.user).annotate(jurnal_count=Count('jurnal')).order_by('kode')
     context = {
         'akun_list': akun_list,
     }
@@ -571,52 +263,10 @@ def daftar_akun(request):
 # Ekspor PDF Daftar Akun
 @login_required
 def daftar_akun_pdf(request):
-    # Gunakan Platypus Table untuk tampilan seperti Excel: header, border, alignment, spacing
-    from io import BytesIO
-    from reportlab.lib.pagesizes import A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet
-
     akun_list = Akun.objects.filter(user=request.user).order_by('kode')
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=36, rightMargin=36, topMargin=48, bottomMargin=36)
-
-    styles = getSampleStyleSheet()
-    title = Paragraph("Daftar Akun Pengguna", styles['Title'])
-    elements = [title, Spacer(1, 12)]
-
-    # Data tabel
-    data = [["Kode", "Nama", "Tipe"]]
-    for akun in akun_list:
-        data.append([str(akun.kode), akun.nama, akun.tipe])
-
-    # Tentukan lebar kolom agar proporsional
-    # A4 width ~ 595 pt; margins 36+36 => usable ~523 pt. Bagi 3 kolom.
-    col_widths = [100, 280, 143]
-
-    table = Table(data, colWidths=col_widths, hAlign='LEFT')
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4F81BD')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#F7F7F7'), colors.white]),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#D9D9D9')),
-        ('LEFTPADDING', (0, 1), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 1), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-
-    elements.append(table)
-    doc.build(elements)
-
-    buffer.seek(0)
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="daftar_akun.pdf"'
+    buffer = export_daftar_akun_pdf(akun_list)
+    response = create_pdf_response('daftar_akun.pdf')
+    response.write(buffer.getvalue())
     return response
 
 # Ekspor Excel Daftar Akun
@@ -773,14 +423,13 @@ def hapus_akun(request, id):
     return render(request, 'konfirmasi_hapus_akun_clean.html', context)
 
 
-@login_required
-def transaksi_api_list(request):
-    """Return JSON list of transaksi (only for current user)."""
-    if request.method != 'GET':
-        return HttpResponseBadRequest('Method not allowed')
+TRANSAKSI_API_PAGE_SIZE = 100
+TRANSAKSI_API_MAX_PAGE_SIZE = 500
+
 
-    # Base queryset: Jurnal milik user
-    jurnal_qs = Jurnal.objects.select_related('transaksi', 'akun').filter(akun__user=request.user)
+def transaksi_api_queryset(request, user):
+    """Jurnal milik ``user`` yang lolos filter q/start_date/end_date/akun dari query string."""
+    jurnal_qs = Jurnal.objects.filter(user=user)
 
     # Optional filters
     q = (request.GET.get('q') or request.GET.get('search') or '').strip()
@@ -793,126 +442,267 @@ def transaksi_api_list(request):
     if start_date:
         sd = parse_date_flexible(start_date)
         if sd:
-            jurnal_qs = jurnal_qs.filter(transaksi__tanggal__gte=sd)
+            jurnal_qs = jurnal_qs.filter(tanggal__gte=sd)
     if end_date:
         ed = parse_date_flexible(end_date)
         if ed:
-            jurnal_qs = jurnal_qs.filter(transaksi__tanggal__lte=ed)
+            jurnal_qs = jurnal_qs.filter(tanggal__lte=ed)
     if akun_id:
         try:
             jurnal_qs = jurnal_qs.filter(akun_id=int(akun_id))
         except Exception:
             pass
+    return jurnal_qs
+
+
+def transaksi_api_page_query(request, jurnal_qs):
+    """Query halaman (tanggal, transaksi_id) unik, satu lebih dari ``limit`` untuk tahu ada halaman berikutnya.
+
+    Mengembalikan ``(query, limit)``; raise ValueError berisi pesan untuk respons 400
+    bila ``limit`` atau ``after`` tidak valid.
+    """
+    try:
+        limit = min(int(request.GET.get('limit') or TRANSAKSI_API_PAGE_SIZE), TRANSAKSI_API_MAX_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        raise ValueError('Parameter limit tidak valid')
+
+    after = request.GET.get('after')
+    if after:
+        after_tanggal, _, after_id = after.partition(',')
+        after_tanggal = parse_date_flexible(after_tanggal)
+        try:
+            after_id = int(after_id)
+        except ValueError:
+            after_tanggal = None
+        if not after_tanggal:
+            raise ValueError('Parameter after harus berformat <tanggal>,<id>')
+        jurnal_qs = jurnal_qs.filter(Q(tanggal__lt=after_tanggal) | Q(tanggal=after_tanggal, transaksi_id__lt=after_id))
+
+    query = jurnal_qs.values_list('tanggal', 'transaksi_id').distinct().order_by('-tanggal', '-transaksi_id')[:limit + 1]
+    return query, limit
+
+
+def transaksi_api_lines(user, page):
+    """Semua baris jurnal untuk transaksi di halaman ``page``."""
+    return (
+        Jurnal.objects.select_related('transaksi', 'akun')
+        .filter(user=user, transaksi_id__in=[tid for _, tid in page])
+        .order_by('id')
+    )
 
-    jurnal_qs = jurnal_qs.order_by('-transaksi__tanggal', '-transaksi__id')
-    
-    # Ambil ID transaksi unik
-    transaksi_ids = jurnal_qs.values_list('transaksi__id', flat=True).distinct()
-    transaksi_qs = Transaksi.objects.filter(id__in=transaksi_ids).order_by('tanggal', 'id')
+
+def transaksi_api_response(page, limit, lines):
+    """JsonResponse hasil + cursor berikutnya; ``lines`` dikelompokkan per transaksi di memori."""
+    has_next = len(page) > limit
+    page = page[:limit]
+
+    grouped = {}
+    for j in lines:
+        grouped.setdefault(j.transaksi_id, []).append(j)
 
     data = []
-    for t in transaksi_qs:
-        jurnal_entries = jurnal_qs.filter(transaksi=t)
-        debet = jurnal_entries.filter(debit__gt=0).first()
-        kredit = jurnal_entries.filter(kredit__gt=0).first()
-        
-        # Perlu cek None sebelum mengakses debet.akun
-        debet_data = {'id': debet.akun.id, 'nama': str(debet.akun)} if debet and debet.akun else None
-        kredit_data = {'id': kredit.akun.id, 'nama': str(kredit.akun)} if kredit and kredit.akun else None
-        
-        jumlah = float(debet.debit) if debet else (float(kredit.kredit) if kredit else 0)
+    for _, tid in page:
+        if tid not in grouped:
+            continue
+        t = grouped[tid][0].transaksi
+        ringkasan = ringkas_baris(grouped[tid])
+        debet, kredit = ringkasan['akun_debet'], ringkasan['akun_kredit']
 
         data.append({
             'id': t.id,
             'tanggal': t.tanggal.isoformat(),
             'deskripsi': t.deskripsi,
-            'akun_debet': debet_data,
-            'akun_kredit': kredit_data,
-            'jumlah': jumlah
+            # Akun pertama tiap sisi, untuk klien lama yang hanya mengenal pasangan debet/kredit
+            'akun_debet': {'id': debet.id, 'nama': str(debet)} if debet else None,
+            'akun_kredit': {'id': kredit.id, 'nama': str(kredit)} if kredit else None,
+            'jumlah': float(ringkasan['jumlah']),
+            'lines': [
+                {'akun': {'id': j.akun.id, 'nama': str(j.akun)}, 'debit': float(j.debit), 'kredit': float(j.kredit)}
+                for j in grouped[tid]
+            ],
         })
 
-    return JsonResponse({'results': data})
+    next_cursor = f"{page[-1][0].isoformat()},{page[-1][1]}" if has_next else None
+    return JsonResponse({'results': data, 'next': next_cursor})
 
 
 @login_required
-@transaction.atomic # Tambahkan atomic untuk CREATE via API
-def transaksi_api_create(request):
-    """Create transaksi + jurnal entries via AJAX (expects JSON body or form-encoded POST)."""
-    if request.method != 'POST':
+def transaksi_api_list(request):
+    """Return JSON list of transaksi (only for current user), newest first.
+
+    Paginated with a keyset cursor: pass the ``next`` value of the previous
+    response as ``?after=<tanggal>,<id>`` and optionally ``?limit=``.
+    """
+    if request.method != 'GET':
         return HttpResponseBadRequest('Method not allowed')
 
-    try:
-        ct = (request.content_type or '')
-        if ct.startswith('application/json'):
-            payload = json.loads(request.body.decode('utf-8'))
-        else:
-            payload = request.POST
+    jurnal_qs = transaksi_api_queryset(request, request.user)
+    if wants_csv(request):
+        return transaksi_csv(request.user, jurnal_qs)
 
-        tanggal = payload.get('tanggal')
-        deskripsi = payload.get('deskripsi')
-        akun_debet_val = payload.get('akun_debet')
-        akun_kredit_val = payload.get('akun_kredit')
-        jumlah = payload.get('jumlah')
-        
-        # Validasi angka dan tanggal
-        jumlah = float(jumlah) if jumlah else 0
-        parsed_tanggal = parse_date_flexible(tanggal)
-    except Exception as e:
-        return JsonResponse({'error': 'Invalid input or JSON format', 'detail': str(e)}, status=400)
+    try:
+        query, limit = transaksi_api_page_query(request, jurnal_qs)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    # Query 1: satu halaman (tanggal, transaksi) unik; query 2: semua baris jurnalnya
+    page = list(query)
+    return transaksi_api_response(page, limit, transaksi_api_lines(request.user, page[:limit]))
+
+
+def transaksi_csv(user, jurnal_qs, asynchronous=False):
+    """Semua transaksi yang lolos filter sebagai CSV streaming (tanpa paginasi), terbaru dulu."""
+    lines = (
+        Jurnal.objects.filter(user=user, transaksi_id__in=jurnal_qs.values('transaksi_id'))
+        .order_by('-tanggal', '-transaksi_id', 'id')
+        .values_list('transaksi_id', 'tanggal', 'transaksi__deskripsi', 'akun__kode', 'akun__nama', 'debit', 'kredit')
+        .iterator(chunk_size=CSV_CHUNK_SIZE)
+    )
 
-    if not (parsed_tanggal and deskripsi and akun_debet_val and akun_kredit_val and jumlah > 0):
-        return JsonResponse({'error': 'Missing or invalid fields (tanggal, deskripsi, akun, jumlah)'}, status=400)
+    def rows():
+        # Baris satu transaksi berurutan; akun tiap sisi digabung dengan '; ' dan
+        # jumlah adalah total debit, jadi entri majemuk tetap satu baris CSV
+        current = None
+        for tid, tanggal, deskripsi, kode, nama, debit, kredit in lines:
+            if current is None or current[0] != tid:
+                if current is not None:
+                    yield current[:3] + ['; '.join(current[3]), '; '.join(current[4]), current[5]]
+                current = [tid, tanggal.isoformat(), deskripsi, [], [], 0]
+            if debit > 0:
+                current[3].append(f"{kode} - {nama}")
+                current[5] += debit
+            if kredit > 0:
+                current[4].append(f"{kode} - {nama}")
+        if current is not None:
+            yield current[:3] + ['; '.join(current[3]), '; '.join(current[4]), current[5]]
+
+    return streaming_csv_response(
+        'transaksi.csv',
+        ['ID', 'Tanggal', 'Deskripsi', 'Akun Debet', 'Akun Kredit', 'Jumlah'],
+        rows(),
+        asynchronous=asynchronous,
+    )
 
-    # Resolve akun ids: try int id first, fallback to lookup by kode or exact string
-    def resolve_akun_local(val): 
-        try:
-            # Cari berdasarkan ID dan PASTIKAN milik user yang login
-            akid = int(val)
-            return get_object_or_404(Akun, id=akid, user=request.user)
-        except Exception:
-            # Coba cari berdasarkan kode atau nama
-            ak = Akun.objects.filter(user=request.user).filter(Q(kode__iexact=val) | Q(nama__iexact=val)).first()
-            if ak:
-                return ak
-            # Coba cari format '001 - Nama Akun'
-            if ' - ' in str(val):
-                parts = str(val).split(' - ')
-                maybe_kode = parts[0].strip()
-                ak = Akun.objects.filter(user=request.user, kode=maybe_kode).first()
-                if ak:
-                    return ak
-        return None
-
-    akun_debet = resolve_akun_local(akun_debet_val)
-    akun_kredit = resolve_akun_local(akun_kredit_val)
-
-    if not akun_debet or not akun_kredit:
-        return JsonResponse({'error': 'Akun tidak ditemukan atau tidak dimiliki oleh pengguna'}, status=400)
-
-    if akun_debet.id == akun_kredit.id:
-        return JsonResponse({'error': 'Akun debet dan kredit tidak boleh sama'}, status=400)
 
-    # --- Jurnal creation within atomic block ---
-    transaksi = Transaksi.objects.create(tanggal=parsed_tanggal, deskripsi=deskripsi, user=request.user)
-    Jurnal.objects.create(transaksi=transaksi, akun=akun_debet, debit=jumlah, kredit=0)
-    Jurnal.objects.create(transaksi=transaksi, akun=akun_kredit, debit=0, kredit=jumlah)
+def parse_entri_payload(request):
+    """Ambil (tanggal, deskripsi, baris) dari body JSON atau form-encoded POST.
 
-    data = {
+    Baris diambil dari ``lines`` (entri majemuk) atau pasangan lama
+    ``akun_debet``/``akun_kredit``/``jumlah``; raise ValueError jika tidak valid.
+    """
+    ct = (request.content_type or '')
+    if ct.startswith('application/json'):
+        payload = json.loads(request.body.decode('utf-8'))
+        if not isinstance(payload, dict):
+            raise ValueError('Body JSON harus berupa objek')
+    else:
+        payload = request.POST.dict()
+        if isinstance(payload.get('lines'), str):
+            payload['lines'] = json.loads(payload['lines'])
+
+    tanggal = parse_date_flexible(payload.get('tanggal'))
+    deskripsi = str(payload.get('deskripsi') or '').strip()
+    if not (tanggal and deskripsi):
+        raise ValueError('Missing or invalid fields (tanggal, deskripsi)')
+    if len(deskripsi) > 255:
+        raise ValueError("Deskripsi maksimal 255 karakter")
+    # Akun diresolusi dari indeks per user di cache, tanpa query per baris
+    lines = validate_lines(lines_from_payload(payload), akun_index(request.user).resolve)
+    return tanggal, deskripsi, lines
+
+
+def entri_data(transaksi, lines):
+    """Representasi JSON transaksi yang baru disimpan beserta semua barisnya."""
+    debet = [(akun, debit) for akun, debit, _ in lines if debit > 0]
+    kredit = [akun for akun, _, kredit in lines if kredit > 0]
+    return {
         'id': transaksi.id,
         'tanggal': transaksi.tanggal.isoformat(),
         'deskripsi': transaksi.deskripsi,
-        'akun_debet': {'id': akun_debet.id, 'nama': str(akun_debet)},
-        'akun_kredit': {'id': akun_kredit.id, 'nama': str(akun_kredit)},
-        'jumlah': float(jumlah)
+        'akun_debet': {'id': debet[0][0].id, 'nama': str(debet[0][0])},
+        'akun_kredit': {'id': kredit[0].id, 'nama': str(kredit[0])},
+        'jumlah': float(sum(debit for _, debit in debet)),
+        'lines': [
+            {'akun': {'id': akun.id, 'nama': str(akun)}, 'debit': float(debit), 'kredit': float(kredit)}
+            for akun, debit, kredit in lines
+        ],
     }
 
-    return JsonResponse({'created': data}, status=201)
+
+@login_required
+@transaction.atomic # Tambahkan atomic untuk CREATE via API
+def transaksi_api_create(request):
+    """Create transaksi + jurnal entries via AJAX (expects JSON body or form-encoded POST).
+
+    Kirim ``lines`` berisi ``[{akun, debit, kredit}, ...]`` untuk entri majemuk;
+    total debit harus sama dengan total kredit.
+    """
+    if request.method != 'POST':
+        return HttpResponseBadRequest('Method not allowed')
+
+    try:
+        tanggal, deskripsi, lines = parse_entri_payload(request)
+    except ValueError as e:
+        # json.JSONDecodeError juga turunan ValueError
+        return JsonResponse({'error': str(e)}, status=400)
+
+    # --- Jurnal creation within atomic block ---
+    transaksi = simpan_entri(request.user, tanggal, deskripsi, lines)
+    return JsonResponse({'created': entri_data(transaksi, lines)}, status=201)
+
+# --- Transaksi API Bulk Import View ---
+@login_required
+def transaksi_api_import(request):
+    """Impor massal transaksi dari JSON Lines atau CSV.
+
+    Kirim file sebagai multipart ``file`` atau langsung sebagai body request
+    (``application/x-ndjson`` / ``text/csv``). ``?format=jsonl|csv`` mengganti
+    deteksi otomatis, ``?dry_run=1`` hanya memvalidasi dan ``?skip_errors=1``
+    tetap mengimpor baris valid meskipun ada baris yang salah.
+    """
+    if request.method != 'POST':
+        return HttpResponseBadRequest('Method not allowed')
+
+    if (request.content_type or '').startswith('multipart/form-data'):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return JsonResponse({'error': 'File tidak ditemukan (field "file")'}, status=400)
+        fmt = request.GET.get('format') or detect_format(upload.name, upload.content_type)
+        raw_lines = upload
+    else:
+        fmt = request.GET.get('format') or detect_format(content_type=request.content_type)
+        # Baca body bertahap per baris, tidak lewat request.body yang dibatasi ukurannya
+        raw_lines = request
+    if fmt not in IMPORT_FORMATS:
+        return JsonResponse({'error': f'Format harus salah satu dari: {", ".join(IMPORT_FORMATS)}'}, status=400)
+
+    flag = lambda name: request.GET.get(name) in ('1', 'true', 'yes')
+    try:
+        result = import_transaksi(
+            request.user,
+            (line.decode('utf-8-sig') for line in raw_lines),
+            fmt,
+            dry_run=flag('dry_run'),
+            skip_errors=flag('skip_errors'),
+        )
+    except UnicodeDecodeError:
+        return JsonResponse({'error': 'File harus berenkode UTF-8'}, status=400)
+
+    if result['jumlah_error'] and not result['dibuat'] and not result['dry_run']:
+        status = 400
+    elif result['dibuat'] and not result['dry_run']:
+        status = 201
+    else:
+        status = 200
+    return JsonResponse(result, status=status)
 
 # --- Transaksi API Update View ---
 @login_required
 @transaction.atomic # Tambahkan atomic untuk UPDATE via API
 def transaksi_api_update(request, id):
-    """Update transaksi and its jurnal entries."""
+    """Update transaksi and replace all of its jurnal entries."""
     if request.method != 'POST':
         return HttpResponseBadRequest('Method not allowed')
 
@@ -920,62 +710,12 @@ def transaksi_api_update(request, id):
     transaksi = get_object_or_404(Transaksi, id=id, user=request.user)
 
     try:
-        ct = (request.content_type or '')
-        if ct.startswith('application/json'):
-            payload = json.loads(request.body.decode('utf-8'))
-        else:
-            payload = request.POST
-
-        tanggal = payload.get('tanggal')
-        deskripsi = payload.get('deskripsi')
-        akun_debet_val = payload.get('akun_debet')
-        akun_kredit_val = payload.get('akun_kredit')
-        jumlah = payload.get('jumlah')
-        
-        jumlah = float(jumlah) if jumlah else 0
-        parsed_tanggal = parse_date_flexible(tanggal)
-    except Exception as e:
-        return JsonResponse({'error': 'Invalid input or JSON format', 'detail': str(e)}, status=400)
-
-    if not (parsed_tanggal and deskripsi and akun_debet_val and akun_kredit_val and jumlah > 0):
-        return JsonResponse({'error': 'Missing or invalid fields'}, status=400)
-
-    # Resolve akun values (id/kode/display)
-    def resolve_akun_local(val):
-        try:
-            akid = int(val)
-            return get_object_or_404(Akun, id=akid, user=request.user)
-        except Exception:
-            ak = Akun.objects.filter(user=request.user).filter(Q(kode__iexact=val) | Q(nama__iexact=val)).first()
-            if ak:
-                return ak
-            if ' - ' in str(val):
-                parts = str(val).split(' - ')
-                maybe_kode = parts[0].strip()
-                ak = Akun.objects.filter(user=request.user, kode=maybe_kode).first()
-                if ak:
-                    return ak
-        return None
-
-    akun_debet = resolve_akun_local(akun_debet_val)
-    akun_kredit = resolve_akun_local(akun_kredit_val)
-
-    if not akun_debet or not akun_kredit:
-        return JsonResponse({'error': 'Akun not found or not owned by user'}, status=400)
-
-    if akun_debet.id == akun_kredit.id:
-        return JsonResponse({'error': 'Akun debet dan kredit tidak boleh sama'}, status=400)
-
-    # --- Update Jurnal entries within atomic block ---
-    Jurnal.objects.filter(transaksi=transaksi).delete() # Hapus entri lama
-    
-    transaksi.tanggal = parsed_tanggal
-    transaksi.deskripsi = deskripsi
-    transaksi.save()
-
-    Jurnal.objects.create(transaksi=transaksi, akun=akun_debet, debit=jumlah, kredit=0)
-    Jurnal.objects.create(transaksi=transaksi, akun=akun_kredit, debit=0, kredit=jumlah)
+        tanggal, deskripsi, lines = parse_entri_payload(request)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
+    # --- Ganti semua baris Jurnal within atomic block ---
+    simpan_entri(request.user, tanggal, deskripsi, lines, transaksi=transaksi)
     return JsonResponse({'updated': {'id': transaksi.id}})
 
 
@@ -0,0 +1,148 @@
+from functools import wraps
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_GET
+
+from .report_cache import report_etag
+from .reports import get_report
+from .utils import parse_date_any
+
+
+class ParameterTidakValid(ValueError):
+    pass
+
+
+def api_params(request, dengan_jenis=False):
+    """Filter laporan dari query string; raise ParameterTidakValid jika tanggal salah format."""
+    params = {}
+    for key, nama in (('sd', 'start_date'), ('ed', 'end_date')):
+        raw = request.GET.get(nama)
+        try:
+            params[key] = parse_date_any(raw)
+        except ValueError:
+            params[key] = None
+        if raw and params[key] is None:
+            raise ParameterTidakValid(f"Format {nama} tidak valid, gunakan YYYY-MM-DD")
+    if dengan_jenis:
+        params['jenis'] = request.GET.get('jenis') or None
+    return params
+
+
+def etag_laporan(endpoint, dengan_jenis=False):
+    def etag(request):
+        # Tanpa ETag untuk parameter salah (view menjawab 400) atau user anonim
+        if not request.user.is_authenticated:
+            return None
+        try:
+            params = api_params(request, dengan_jenis)
+        except ParameterTidakValid:
+            return None
+        return report_etag(request.user.pk, endpoint, params)
+    return etag
+
+
+def periode_data(params):
+    return {
+        'start_date': params['sd'].isoformat() if params['sd'] else None,
+        'end_date': params['ed'].isoformat() if params['ed'] else None,
+    }
+
+
+def akun_data(akun):
+    # Akun sintetis (mis. Laba Tahun Berjalan) tidak punya id/kode
+    return {'id': akun.id, 'kode': akun.kode or None, 'nama': akun.nama, 'tipe': akun.tipe}
+
+
+def saldo_list(entries):
+    return [{**akun_data(entry['akun']), 'saldo': float(entry['saldo'])} for entry in entries]
+
+
+def laporan_json(view):
+    """Bungkus view API laporan: 400 untuk parameter salah, header Cache-Control untuk revalidasi."""
+    @wraps(view)
+    def wrapper(request):
+        try:
+            response = view(request)
+        except ParameterTidakValid as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        # Klien boleh menyimpan respons tetapi wajib revalidasi dengan If-None-Match
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+    return wrapper
+
+
+def neraca_saldo_data(params, report):
+    return {
+        'periode': periode_data(params),
+        'jenis': params['jenis'],
+        'akun': [
+            {**akun_data(entry['akun']), 'debit': float(entry['debit']), 'kredit': float(entry['kredit'])}
+            for entry in report['saldo']
+        ],
+        'total_debit': float(report['total_debit']),
+        'total_kredit': float(report['total_kredit']),
+        'total_aktiva': float(report['total_aktiva']),
+        'total_kewajiban': float(report['total_kewajiban']),
+        'total_modal': float(report['total_modal']),
+        'total_pendapatan': float(report['total_pendapatan']),
+        'total_beban': float(report['total_beban']),
+        'laba_rugi': float(report['laba_rugi']),
+    }
+
+
+def laba_rugi_data(params, report):
+    return {
+        'periode': periode_data(params),
+        'pendapatan': saldo_list(report['pendapatan']),
+        'beban': saldo_list(report['beban']),
+        'total_pendapatan': float(report['total_pendapatan']),
+        'total_beban': float(report['total_beban']),
+        'laba_rugi': float(report['net_income']),
+        'profit_margin': float(report['profit_margin']),
+    }
+
+
+def neraca_data(params, report):
+    return {
+        'periode': periode_data(params),
+        'aktiva': saldo_list(report['aktiva']),
+        'kewajiban': saldo_list(report['kewajiban']),
+        'modal': saldo_list(report['modal']),
+        'total_aktiva': float(report['total_aktiva']),
+        'total_kewajiban': float(report['total_kewajiban']),
+        'total_modal': float(report['total_modal_display']),
+        'total_kewajiban_modal': float(report['equation_right']),
+        'seimbang': report['total_aktiva'] == report['equation_right'],
+        'current_ratio': float(report['current_ratio']) if report['current_ratio'] is not None else None,
+    }
+
+
+@login_required
+@require_GET
+@laporan_json
+@condition(etag_func=etag_laporan('neraca_saldo', dengan_jenis=True))
+def api_neraca_saldo(request):
+    """Neraca saldo per akun (kolom debit/kredit seperti halaman HTML) beserta totalnya."""
+    params = api_params(request, dengan_jenis=True)
+    return JsonResponse(neraca_saldo_data(params, get_report(request.user, 'neraca_saldo', **params)))
+
+
+@login_required
+@require_GET
+@laporan_json
+@condition(etag_func=etag_laporan('laba_rugi'))
+def api_laba_rugi(request):
+    """Laporan laba rugi: pendapatan dan beban per akun serta laba/rugi bersih."""
+    params = api_params(request)
+    return JsonResponse(laba_rugi_data(params, get_report(request.user, 'laporan_keuangan', **params)))
+
+
+@login_required
+@require_GET
+@laporan_json
+@condition(etag_func=etag_laporan('neraca'))
+def api_neraca(request):
+    """Neraca: aktiva, kewajiban dan modal (termasuk laba tahun berjalan)."""
+    params = api_params(request)
+    return JsonResponse(neraca_data(params, get_report(request.user, 'laporan_keuangan', **params)))
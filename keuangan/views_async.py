@@ -0,0 +1,100 @@
+"""Varian async dari view baca-saja, dipakai urls.py saat ASYNC_VIEWS aktif (ASGI).
+
+Query independen dijalankan lewat ``asyncio.gather`` dengan ORM async Django.
+Perhitungan laporan berat dan render template tetap kode sync yang dijalankan
+di thread lewat ``sync_to_async``.
+"""
+import asyncio
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+
+from .csv_export import wants_csv
+from .dashboard import aget_dashboard_data
+from .models import UserProfile
+from .report_cache import acached_report, areport_etag
+from .reports import aget_report
+from .views import (
+    transaksi_api_lines, transaksi_api_page_query, transaksi_api_queryset, transaksi_api_response, transaksi_csv,
+)
+from .views_api import ParameterTidakValid, api_params, laba_rugi_data, neraca_data, neraca_saldo_data
+
+
+@login_required
+async def dashboard(request):
+    user = await request.auser()
+    today = date.today()
+    data, (user_profile, _) = await asyncio.gather(
+        acached_report(user, 'dashboard', {'today': today}, lambda: aget_dashboard_data(user, today)),
+        UserProfile.objects.aget_or_create(user=user),
+    )
+    context = dict(data)
+    context['user_profile'] = user_profile
+    # Template dan context processor membaca request.user secara sync: pakai user yang sudah dimuat
+    request.user = user
+    user.userprofile = user_profile
+    return await sync_to_async(render)(request, 'dashboard.html', context)
+
+
+@login_required
+async def transaksi_api_list(request):
+    """Varian async ``views.transaksi_api_list`` (respons identik)."""
+    if request.method != 'GET':
+        return HttpResponseBadRequest('Method not allowed')
+
+    user = await request.auser()
+    jurnal_qs = transaksi_api_queryset(request, user)
+    if wants_csv(request):
+        return transaksi_csv(user, jurnal_qs, asynchronous=True)
+
+    try:
+        query, limit = transaksi_api_page_query(request, jurnal_qs)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    # Baris jurnal bergantung pada halaman, jadi kedua query tetap berurutan
+    page = [row async for row in query]
+    lines = [j async for j in transaksi_api_lines(user, page[:limit])]
+    return transaksi_api_response(page, limit, lines)
+
+
+async def _laporan_json(request, endpoint, nama, build, dengan_jenis=False):
+    # Padanan laporan_json + condition() di views_api: 400 untuk parameter salah,
+    # 304 bila If-None-Match cocok dengan ETag versi buku besar
+    try:
+        params = api_params(request, dengan_jenis)
+    except ParameterTidakValid as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    user = await request.auser()
+    etag = quote_etag(await areport_etag(user.pk, endpoint, params))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(build(params, await aget_report(user, nama, **params)))
+    response.headers.setdefault('ETag', etag)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@login_required
+@require_GET
+async def api_neraca_saldo(request):
+    return await _laporan_json(request, 'neraca_saldo', 'neraca_saldo', neraca_saldo_data, dengan_jenis=True)
+
+
+@login_required
+@require_GET
+async def api_laba_rugi(request):
+    return await _laporan_json(request, 'laba_rugi', 'laporan_keuangan', laba_rugi_data)
+
+
+@login_required
+@require_GET
+async def api_neraca(request):
+    return await _laporan_json(request, 'neraca', 'laporan_keuangan', neraca_data)
@@ -0,0 +1,55 @@
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+
+from .exports import EXPORT_VIEWS, submit_export
+from .models import ExportJob
+
+
+def job_data(job):
+    data = {
+        'id': job.id,
+        'jenis': job.jenis,
+        'params': job.params,
+        'status': job.status,
+        'dibuat': job.dibuat.isoformat(),
+        'selesai': job.selesai.isoformat() if job.selesai else None,
+        'kedaluwarsa': job.kedaluwarsa.isoformat() if job.kedaluwarsa else None,
+        'status_url': reverse('export_status', args=[job.id]),
+        'download_url': None,
+        'error': None,
+    }
+    if job.status == ExportJob.STATUS_SELESAI:
+        data['download_url'] = reverse('export_download', args=[job.id])
+    elif job.status == ExportJob.STATUS_GAGAL:
+        # Traceback lengkap hanya disimpan di database
+        data['error'] = job.error.strip().splitlines()[-1] if job.error else 'Ekspor gagal'
+    return data
+
+
+@login_required
+@require_POST
+def export_submit(request, jenis):
+    """Antrikan ekspor berat; filter diambil dari query string yang sama dengan ekspor langsung."""
+    if jenis not in EXPORT_VIEWS:
+        return JsonResponse({'error': f'Jenis ekspor tidak dikenal: {jenis}'}, status=404)
+    job, dibuat = submit_export(request.user, jenis, request.GET.dict())
+    return JsonResponse(job_data(job), status=202 if dibuat else 200)
+
+
+@login_required
+@require_GET
+def export_status(request, id):
+    job = get_object_or_404(ExportJob, id=id, user=request.user)
+    return JsonResponse(job_data(job))
+
+
+@login_required
+@require_GET
+def export_download(request, id):
+    job = get_object_or_404(ExportJob, id=id, user=request.user, status=ExportJob.STATUS_SELESAI)
+    if not job.file or not job.file.storage.exists(job.file.name):
+        return JsonResponse({'error': 'File ekspor sudah tidak tersedia'}, status=410)
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.nama_file)